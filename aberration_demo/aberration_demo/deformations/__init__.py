@@ -378,7 +378,7 @@ def _analysis_run_job(job):
 
     config = read_config(work_dir=job["work_dir"])
     prng = np.random.Generator(np.random.PCG64(job["seed"]))
-    light_field_geometry = plenopy.LightFieldGeometry(
+    light_field_geometry = plenoirf.geometry_cache.read_light_field_geometry(
         path=os.path.join(
             job["work_dir"], "geometries", job["pkey"], "light_field_geometry",
         ),
@@ -136,8 +136,9 @@ def LightFieldGeometry(path, off_axis_angle_deg):
     off_axis_angle_deg : float
         The off-axis-angle of the light.
     """
-    lfg = plenopy.LightFieldGeometry(path=path)
-    lfg.cx_mean += np.deg2rad(off_axis_angle_deg)
+    lfg = plenoirf.geometry_cache.read_light_field_geometry(path=path)
+    # The cached arrays are read-only.
+    lfg.cx_mean = lfg.cx_mean + np.deg2rad(off_axis_angle_deg)
     return lfg
 
 
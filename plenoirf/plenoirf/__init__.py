@@ -12,6 +12,12 @@ from . import production
 from . import other_instruments
 from . import unique
 from . import outer_telescope_array
+from . import runtime
+from . import geometry_cache
+from . import trigger_responses
+from . import bunch_statistics
+from . import scheduling
+from . import join
 
 import os
 import numpy as np
@@ -26,6 +32,7 @@ import tempfile
 import pandas as pd
 import tarfile
 import io
+import time
 
 import json_numpy
 import binning_utils
@@ -374,6 +381,22 @@ def _estimate_trigger_geometry_of_plenoscope(
         )
 
 
+def _cache_geometries_of_plenoscope(run_dir, logger):
+    """
+    Writes the caches of the light-field-geometry and the trigger-geometry
+    once, so that the workers of run_job share them read-only.
+    """
+    logger.info("Caching light-field-geometry and trigger-geometry.")
+    geometry_cache.read_light_field_geometry(
+        path=opj(run_dir, "light_field_geometry"), write_if_invalid=True,
+    )
+    geometry_cache.read_trigger_geometry(
+        path=opj(run_dir, "trigger_geometry"),
+        scenery_path=opj(run_dir, "input", "scenery", "scenery.json"),
+        write_if_invalid=True,
+    )
+
+
 def _populate_table_of_thrown_air_showers(
     config,
     run_dir,
@@ -384,6 +407,9 @@ def _populate_table_of_thrown_air_showers(
     KEEP_TMP,
     LAZY_REDUCTION,
     logger,
+    STREAM_CHERENKOV_POOLS=False,
+    NUM_JOB_BUNDLES=None,
+    RUNTIME_REFERENCE_DIRS=None,
 ):
     logger.info("Estimating instrument-response.")
     table_absdir = opj(run_dir, "event_table")
@@ -436,26 +462,77 @@ def _populate_table_of_thrown_air_showers(
                     tmp_dir=tmp_absdir,
                     keep_tmp_dir=KEEP_TMP,
                     date_dict=date_dict,
+                    stream_cherenkov_pools=STREAM_CHERENKOV_POOLS,
                 )
 
                 run_id += 1
                 irf_jobs.append(irf_job)
 
-    random.shuffle(irf_jobs)
-    _ = map_and_reduce_pool.map(instrument_response.run_job, irf_jobs)
+    if NUM_JOB_BUNDLES is None or len(irf_jobs) == 0:
+        random.shuffle(irf_jobs)
+        _ = map_and_reduce_pool.map(instrument_response.run_job, irf_jobs)
+    else:
+        if RUNTIME_REFERENCE_DIRS is None:
+            RUNTIME_REFERENCE_DIRS = [table_absdir]
+        cost_model = scheduling.init_cost_model(
+            jobs=irf_jobs,
+            runtime_csv_paths=scheduling.find_runtime_csv_paths(
+                production_dirs=RUNTIME_REFERENCE_DIRS
+            ),
+        )
+        logger.info("Cost-model: {:s}".format(str(cost_model)))
+        costs = [
+            scheduling.estimate_cost(cost_model=cost_model, job=irf_job)
+            for irf_job in irf_jobs
+        ]
+        bundles, predicted_loads = scheduling.bundle_jobs(
+            jobs=irf_jobs, costs=costs, num_bundles=NUM_JOB_BUNDLES
+        )
+        logger.info(
+            "Bundle {:d} jobs into {:d} bundles.".format(
+                len(irf_jobs), len(bundles)
+            )
+        )
+        map_start = time.time()
+        _ = map_and_reduce_pool.map(
+            instrument_response.run_jobs_in_bundles, bundles
+        )
+        map_wall_time_s = time.time() - map_start
 
     logger.info("Reduce instrument-response.")
 
-    for site_key in config["sites"]:
-        for particle_key in config["particles"]:
-            instrument_response.reduce(
-                run_dir=run_dir,
-                production_key="event_table",
-                site_key=site_key,
-                particle_key=particle_key,
-                logger=logger,
-                LAZY=LAZY_REDUCTION,
+    reduce_jobs = instrument_response.make_reduce_jobs(
+        run_dir=run_dir,
+        production_key="event_table",
+        site_keys=list(config["sites"].keys()),
+        particle_keys=list(config["particles"].keys()),
+        LAZY=LAZY_REDUCTION,
+    )
+    _ = map_and_reduce_pool.map(
+        instrument_response.run_reduce_job, reduce_jobs
+    )
+
+    if NUM_JOB_BUNDLES is not None and len(irf_jobs) > 0:
+        report = scheduling.make_report(
+            bundles=bundles,
+            predicted_loads=predicted_loads,
+            actual_seconds=scheduling.read_actual_seconds(
+                runtime_csv_paths=scheduling.find_runtime_csv_paths(
+                    production_dirs=[table_absdir]
+                )
+            ),
+        )
+        report["map_wall_time_s"] = map_wall_time_s
+        logger.info(
+            "Makespan predicted {:.1f}s, actual {:.1f}s, wall {:.1f}s".format(
+                report["predicted_makespan_s"],
+                report["actual_makespan_s"],
+                report["map_wall_time_s"],
             )
+        )
+        json_numpy.write(
+            path=opj(table_absdir, "scheduling.json"), out_dict=report,
+        )
 
 
 def run(
@@ -465,6 +542,9 @@ def run(
     TMP_DIR_ON_WORKERNODE=True,
     KEEP_TMP=False,
     LAZY_REDUCTION=False,
+    STREAM_CHERENKOV_POOLS=False,
+    NUM_JOB_BUNDLES=None,
+    RUNTIME_REFERENCE_DIRS=None,
     logger=jlogging.LoggerStdout(),
 ):
     map_and_reduce_pool = jlogging.MapAndReducePoolWithLogger(
@@ -508,6 +588,8 @@ def run(
         config=config, run_dir=run_dir, logger=logger,
     )
 
+    _cache_geometries_of_plenoscope(run_dir=run_dir, logger=logger)
+
     _populate_table_of_thrown_air_showers(
         config=config,
         run_dir=run_dir,
@@ -517,6 +599,9 @@ def run(
         KEEP_TMP=KEEP_TMP,
         date_dict=date_dict,
         LAZY_REDUCTION=LAZY_REDUCTION,
+        STREAM_CHERENKOV_POOLS=STREAM_CHERENKOV_POOLS,
+        NUM_JOB_BUNDLES=NUM_JOB_BUNDLES,
+        RUNTIME_REFERENCE_DIRS=RUNTIME_REFERENCE_DIRS,
         logger=logger,
     )
 
@@ -1,6 +1,7 @@
 import numpy as np
 import sparse_numeric_table as spt
 from .. import utils
+from .. import unique
 
 
 def effective_quantity_for_grid(
@@ -116,3 +117,65 @@ def effective_quantity_for_grid(
     )
 
     return effective_quantity, effective_quantity_absolute_uncertainty
+
+
+def make_mask_detected_for_reused_showers(
+    shower_indices, num_reuses, detected_indices, detected_weights=None,
+):
+    """
+    Returns the mask_detected for effective_quantity_for_grid() when the
+    airshowers were reused multiple times in the grid.
+    It is the (weighted) fraction of an airshower's reuses which were
+    detected. When each airshower is reused only once, this is the same as
+    spt.make_mask_of_right_in_left(shower_indices, detected_indices).
+
+    Parameters
+    ----------
+    shower_indices                  Array(num. thrown airshower)
+                                    The UIDs of the airshowers, i.e. the
+                                    primary-table's spt.IDX.
+
+    num_reuses                      Array(num. thrown airshower)
+                                    The number of reuses drawn for each
+                                    airshower, i.e. the grid-table's
+                                    num_reuses.
+
+    detected_indices                Array(num. detected reuses)
+                                    The UIDs of the detected reuses.
+
+    detected_weights                Array(num. detected reuses)
+                                    Optional weight of each detection.
+                                    Default is one.
+    """
+    shower_indices = np.asarray(shower_indices)
+    num_reuses = np.asarray(num_reuses)
+    detected_indices = np.asarray(detected_indices, dtype=np.int64)
+    assert shower_indices.shape == num_reuses.shape
+    if detected_weights is None:
+        detected_weights = np.ones(detected_indices.shape[0])
+    detected_weights = np.asarray(detected_weights, dtype=np.float64)
+    assert detected_weights.shape == detected_indices.shape
+
+    # The reuse with reuse-ID = 0 has the same UID as its airshower.
+    detected_shower_indices = np.where(
+        np.isin(detected_indices, shower_indices),
+        detected_indices,
+        unique.shower_uid(detected_indices),
+    )
+
+    order = np.argsort(shower_indices)
+    sorted_shower_indices = shower_indices[order]
+    pos = np.searchsorted(sorted_shower_indices, detected_shower_indices)
+    pos = np.clip(pos, 0, max(len(sorted_shower_indices) - 1, 0))
+    known = np.zeros(detected_shower_indices.shape[0], dtype=np.bool_)
+    if len(sorted_shower_indices) > 0:
+        known = sorted_shower_indices[pos] == detected_shower_indices
+
+    num_detected = np.zeros(shower_indices.shape[0])
+    np.add.at(num_detected, order[pos[known]], detected_weights[known])
+
+    return utils._divide_silent(
+        numerator=num_detected,
+        denominator=num_reuses.astype(np.float64),
+        default=0.0,
+    )
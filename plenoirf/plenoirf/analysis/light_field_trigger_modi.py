@@ -1,6 +1,8 @@
 import numpy as np
 import sparse_numeric_table as spt
 
+KEY = "focus_{:02d}_response_pe"
+
 
 def make_mask(
     trigger_table, threshold, modus,
@@ -12,8 +14,6 @@ def make_mask(
     object-distances.
     Based on this response, different modi for the final trigger are possible.
     """
-    KEY = "focus_{:02d}_response_pe"
-
     assert threshold >= 0
     assert modus["accepting_focus"] >= 0
     assert modus["rejecting_focus"] >= 0
@@ -47,6 +47,16 @@ def make_indices(
     return trigger_table[spt.IDX][mask]
 
 
+def make_column_keys(modus):
+    """
+    Returns the columns of the trigger-table which make_mask() reads.
+    """
+    return [
+        KEY.format(modus["accepting_focus"]),
+        KEY.format(modus["rejecting_focus"]),
+    ]
+
+
 def make_trigger_modus_str(analysis_trigger, production_trigger):
     pro = production_trigger
     ana = analysis_trigger
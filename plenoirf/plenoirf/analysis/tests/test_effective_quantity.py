@@ -0,0 +1,59 @@
+import plenoirf
+import numpy as np
+
+
+def test_mask_detected_single_reuse_same_as_mask():
+    shower_indices = np.array([1000001, 1000002, 1000003, 1000004])
+    num_reuses = np.array([1, 1, 0, 1])
+    detected_indices = np.array([1000002, 1000004])
+
+    mask = plenoirf.analysis.effective_quantity.make_mask_detected_for_reused_showers(
+        shower_indices=shower_indices,
+        num_reuses=num_reuses,
+        detected_indices=detected_indices,
+    )
+    np.testing.assert_array_equal(mask, [0.0, 1.0, 0.0, 1.0])
+
+
+def test_mask_detected_multiple_reuses():
+    uid = plenoirf.unique.make_reuse_uid
+    shower_indices = np.array(
+        [uid(1, 1, 0), uid(1, 2, 0), uid(1, 3, 0), uid(2, 1, 0)]
+    )
+    num_reuses = np.array([4, 2, 0, 4])
+    detected_indices = np.array(
+        [
+            uid(1, 1, 0),
+            uid(1, 1, 3),
+            uid(1, 2, 1),
+            uid(2, 1, 0),
+            uid(2, 1, 1),
+            uid(2, 1, 2),
+            uid(2, 1, 3),
+            uid(9, 9, 9),
+        ]
+    )
+
+    mask = plenoirf.analysis.effective_quantity.make_mask_detected_for_reused_showers(
+        shower_indices=shower_indices,
+        num_reuses=num_reuses,
+        detected_indices=detected_indices,
+    )
+    np.testing.assert_array_almost_equal(mask, [0.5, 0.5, 0.0, 1.0])
+
+
+def test_reuse_uid_of_first_reuse_is_shower_uid():
+    for run_id in [1, 23, 999999]:
+        for event_id in [1, 42, 9999]:
+            uid = plenoirf.unique.make_uid(run_id=run_id, event_id=event_id)
+            for reuse_id in [0, 1, 99]:
+                ruid = plenoirf.unique.make_reuse_uid(
+                    run_id=run_id, event_id=event_id, reuse_id=reuse_id
+                )
+                assert (ruid == uid) == (reuse_id == 0)
+                assert plenoirf.unique.shower_uid(ruid) == uid
+                assert plenoirf.unique.split_reuse_uid(ruid) == (
+                    run_id,
+                    event_id,
+                    reuse_id,
+                )
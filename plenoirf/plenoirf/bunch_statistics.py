@@ -0,0 +1,101 @@
+"""
+Statistics of the Cherenkov-bunches of an air-shower in one pass.
+
+The columns of the bunches which have a median are gathered once into a
+contiguous block, and the medians of all columns are found with one
+in-place np.partition of the block. For very large pools the medians can
+be approximated with a subsample of the bunches.
+"""
+import numpy as np
+import corsika_primary as cpw
+
+MEDIAN_COLUMNS = {
+    "ZEM": cpw.I.BUNCH.ZEM,
+    "WVL": cpw.I.BUNCH.WVL,
+    "CX": cpw.I.BUNCH.CX,
+    "CY": cpw.I.BUNCH.CY,
+    "X": cpw.I.BUNCH.X,
+    "Y": cpw.I.BUNCH.Y,
+    "BSIZE": cpw.I.BUNCH.BSIZE,
+}
+
+APPROXIMATE_NUM_SAMPLES = 2 ** 20
+
+
+def medians(cherenkov_bunches, approximate=False, num_samples=None):
+    """
+    Returns a dict of the medians of the columns in MEDIAN_COLUMNS.
+    The exact medians are equal to np.median of each column.
+
+    Parameters
+    ----------
+    approximate : bool
+        If True, and there are more than num_samples bunches, the medians
+        are the ones of every n-th bunch so that at least num_samples
+        bunches remain. This is deterministic.
+    """
+    cb = cherenkov_bunches
+    assert cb.shape[0] > 0
+    if approximate:
+        if num_samples is None:
+            num_samples = APPROXIMATE_NUM_SAMPLES
+        assert num_samples > 0
+        stride = max([1, cb.shape[0] // num_samples])
+        cb = cb[::stride]
+    keys = list(MEDIAN_COLUMNS.keys())
+    block = np.empty(shape=(len(keys), cb.shape[0]), dtype=cb.dtype)
+    for i, key in enumerate(keys):
+        block[i] = cb[:, MEDIAN_COLUMNS[key]]
+    values = _exact_medians(block=block)
+    return {key: values[i] for i, key in enumerate(keys)}
+
+
+def _exact_medians(block):
+    """
+    Partitions the block in place.
+    """
+    n = block.shape[1]
+    k = n // 2
+    block.partition(k, axis=1)
+    upper = block[:, k]
+    if n % 2:
+        values = upper.copy()
+    else:
+        lower = np.max(block[:, 0:k], axis=1)
+        values = np.mean(np.c_[lower, upper], axis=1)
+    # Like np.median, a column with nan has a median of nan. A nan is
+    # partitioned behind all numbers.
+    values[np.isnan(np.max(block[:, k:], axis=1))] = np.nan
+    return values
+
+
+def statistics(cherenkov_bunches, approximate=False, num_samples=None):
+    """
+    Returns one record with the size and the medians of the
+    Cherenkov-bunches, in the columns of the event-table's levels
+    cherenkovsize and cherenkovpool.
+    """
+    cb = cherenkov_bunches
+    rec = size(cherenkov_bunches=cb)
+    if cb.shape[0] > 0:
+        med = medians(
+            cherenkov_bunches=cb,
+            approximate=approximate,
+            num_samples=num_samples,
+        )
+        rec["maximum_asl_m"] = cpw.CM2M * med["ZEM"]
+        rec["wavelength_median_nm"] = np.abs(med["WVL"])
+        rec["cx_median_rad"] = med["CX"]
+        rec["cy_median_rad"] = med["CY"]
+        rec["x_median_m"] = cpw.CM2M * med["X"]
+        rec["y_median_m"] = cpw.CM2M * med["Y"]
+        rec["bunch_size_median"] = med["BSIZE"]
+    return rec
+
+
+def size(cherenkov_bunches):
+    cb = cherenkov_bunches
+    return {
+        "num_bunches": cb.shape[0],
+        "num_photons": np.sum(cb[:, cpw.I.BUNCH.BSIZE]),
+    }
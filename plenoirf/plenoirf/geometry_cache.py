@@ -0,0 +1,314 @@
+"""
+A cache of the light-field-geometry and the trigger-geometry which
+workers read with np.memmap. All workers on a node share the same pages of
+the cache in the page-cache of the OS instead of each parsing and holding
+its own copy of the large per-lixel arrays.
+
+A cache is a directory with:
+
+    arrays.bin      The large arrays, each starts at a page-boundary.
+    skeleton.pkl    The geometry (pickle) with the large arrays replaced by
+                    references into arrays.bin.
+    manifest.json   The sha256 of the scenery, and a fingerprint of the
+                    geometry's source-files the cache was made from.
+
+A cache is only used when its manifest matches the current scenery and
+source-files. Else the geometry is read from its source.
+"""
+import os
+from os import path as op
+import copy
+import hashlib
+import json
+import mmap
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import plenopy as pl
+
+CACHE_EXT = ".cache"
+FORMAT_VERSION = 1
+MIN_NUM_BYTES_TO_MEMMAP = 4096
+TRAVERSE_MODULE_PREFIXES = ("plenopy",)
+
+
+class _ArrayReference:
+    def __init__(self, offset, dtype, shape):
+        self.offset = offset
+        self.dtype = dtype
+        self.shape = shape
+
+
+def default_cache_path(path):
+    return op.normpath(path) + CACHE_EXT
+
+
+def sha256_of_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def fingerprint_of_source(path):
+    """
+    Returns a sha256 of the relative paths, sizes, and modification-times
+    of all files in path. It changes when the source is written again.
+    """
+    h = hashlib.sha256()
+    if op.isfile(path):
+        paths = [path]
+        root = op.dirname(path)
+    else:
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                paths.append(op.join(dirpath, filename))
+        root = path
+    for p in paths:
+        st = os.stat(p)
+        h.update(op.relpath(p, root).encode())
+        h.update(str(st.st_size).encode())
+        h.update(str(st.st_mtime_ns).encode())
+    return h.hexdigest()
+
+
+def _is_traversed(obj, module_prefixes):
+    if not hasattr(obj, "__dict__") or isinstance(obj, type):
+        return False
+    module = type(obj).__module__
+    return any([module.startswith(prefix) for prefix in module_prefixes])
+
+
+def _replace_arrays(obj, arrays, module_prefixes):
+    """
+    Returns a copy of obj with its large arrays replaced by
+    _ArrayReferences. The arrays are appended to the list arrays.
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject or obj.nbytes < MIN_NUM_BYTES_TO_MEMMAP:
+            return obj
+        arrays.append(np.ascontiguousarray(obj))
+        return _ArrayReference(
+            offset=len(arrays) - 1, dtype=obj.dtype.str, shape=obj.shape
+        )
+    if isinstance(obj, dict):
+        return {
+            k: _replace_arrays(v, arrays, module_prefixes)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple)) and type(obj) in (list, tuple):
+        return type(obj)(
+            [_replace_arrays(v, arrays, module_prefixes) for v in obj]
+        )
+    if _is_traversed(obj, module_prefixes):
+        out = copy.copy(obj)
+        out.__dict__ = _replace_arrays(obj.__dict__, arrays, module_prefixes)
+        return out
+    return obj
+
+
+def _restore_arrays(obj, arrays_path, module_prefixes):
+    if isinstance(obj, _ArrayReference):
+        return np.memmap(
+            arrays_path,
+            dtype=np.dtype(obj.dtype),
+            mode="r",
+            offset=obj.offset,
+            shape=obj.shape,
+        )
+    if isinstance(obj, dict):
+        return {
+            k: _restore_arrays(v, arrays_path, module_prefixes)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple)) and type(obj) in (list, tuple):
+        return type(obj)(
+            [_restore_arrays(v, arrays_path, module_prefixes) for v in obj]
+        )
+    if _is_traversed(obj, module_prefixes):
+        obj.__dict__ = _restore_arrays(
+            obj.__dict__, arrays_path, module_prefixes
+        )
+    return obj
+
+
+def _make_manifest(scenery_path, source_path):
+    return {
+        "format_version": FORMAT_VERSION,
+        "scenery_sha256": sha256_of_file(scenery_path),
+        "source_fingerprint": fingerprint_of_source(source_path),
+    }
+
+
+def write(
+    geometry,
+    cache_path,
+    scenery_path,
+    source_path,
+    module_prefixes=TRAVERSE_MODULE_PREFIXES,
+):
+    """
+    Writes the cache of geometry into cache_path. The cache is made in a
+    temporary directory next to cache_path and moved in place, so workers
+    never see an incomplete cache. A valid cache, e.g. one which an other
+    worker has just moved in place, is kept. An invalid cache is renamed
+    aside before it is removed.
+    """
+    manifest = _make_manifest(
+        scenery_path=scenery_path, source_path=source_path
+    )
+    arrays = []
+    skeleton = _replace_arrays(geometry, arrays, module_prefixes)
+
+    parent_dir = op.dirname(op.abspath(cache_path))
+    tmp_path = tempfile.mkdtemp(prefix=".geometry_cache_", dir=parent_dir)
+    offsets = []
+    with open(op.join(tmp_path, "arrays.bin"), "wb") as f:
+        for array in arrays:
+            pad = (-f.tell()) % mmap.ALLOCATIONGRANULARITY
+            f.write(bytes(pad))
+            offsets.append(f.tell())
+            f.write(array.tobytes(order="C"))
+
+    _set_offsets(skeleton, offsets, module_prefixes)
+    with open(op.join(tmp_path, "skeleton.pkl"), "wb") as f:
+        f.write(pickle.dumps(skeleton, protocol=pickle.HIGHEST_PROTOCOL))
+    with open(op.join(tmp_path, "manifest.json"), "wt") as f:
+        f.write(json.dumps(manifest, indent=4))
+
+    if is_valid(
+        cache_path=cache_path,
+        scenery_path=scenery_path,
+        source_path=source_path,
+    ):
+        shutil.rmtree(tmp_path)
+        return
+
+    if op.exists(cache_path):
+        old_path = tempfile.mkdtemp(prefix=".geometry_cache_", dir=parent_dir)
+        try:
+            os.rename(cache_path, op.join(old_path, "cache"))
+        except OSError:
+            # an other worker moved it aside first.
+            pass
+        shutil.rmtree(old_path)
+    try:
+        os.rename(tmp_path, cache_path)
+    except OSError:
+        # an other worker moved its cache in place first.
+        shutil.rmtree(tmp_path)
+
+
+def _set_offsets(obj, offsets, module_prefixes):
+    if isinstance(obj, _ArrayReference):
+        obj.offset = offsets[obj.offset]
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            _set_offsets(v, offsets, module_prefixes)
+    elif isinstance(obj, (list, tuple)) and type(obj) in (list, tuple):
+        for v in obj:
+            _set_offsets(v, offsets, module_prefixes)
+    elif _is_traversed(obj, module_prefixes):
+        for v in obj.__dict__.values():
+            _set_offsets(v, offsets, module_prefixes)
+
+
+def is_valid(cache_path, scenery_path, source_path):
+    manifest_path = op.join(cache_path, "manifest.json")
+    try:
+        with open(manifest_path, "rt") as f:
+            manifest = json.loads(f.read())
+    except FileNotFoundError:
+        return False
+    expected = _make_manifest(
+        scenery_path=scenery_path, source_path=source_path
+    )
+    return manifest == expected
+
+
+def read(cache_path, module_prefixes=TRAVERSE_MODULE_PREFIXES):
+    """
+    Returns the geometry in the cache. Its large arrays are read-only
+    np.memmaps.
+    """
+    with open(op.join(cache_path, "skeleton.pkl"), "rb") as f:
+        skeleton = pickle.loads(f.read())
+    return _restore_arrays(
+        skeleton, op.join(cache_path, "arrays.bin"), module_prefixes
+    )
+
+
+def read_or_load(
+    source_path,
+    scenery_path,
+    load,
+    cache_path=None,
+    write_if_invalid=True,
+    module_prefixes=TRAVERSE_MODULE_PREFIXES,
+):
+    """
+    Returns the geometry from the cache when the cache is valid. Else the
+    geometry is loaded from source_path using load(source_path), and the
+    cache is written when write_if_invalid. When an other worker replaces
+    the cache while it is read, the geometry is loaded, too.
+    Without a scenery in scenery_path, there is no cache.
+    """
+    if cache_path is None:
+        cache_path = default_cache_path(source_path)
+
+    if not op.exists(scenery_path):
+        return load(source_path)
+
+    if is_valid(
+        cache_path=cache_path,
+        scenery_path=scenery_path,
+        source_path=source_path,
+    ):
+        try:
+            return read(
+                cache_path=cache_path, module_prefixes=module_prefixes
+            )
+        except FileNotFoundError:
+            pass
+
+    geometry = load(source_path)
+    if write_if_invalid:
+        write(
+            geometry=geometry,
+            cache_path=cache_path,
+            scenery_path=scenery_path,
+            source_path=source_path,
+            module_prefixes=module_prefixes,
+        )
+    return geometry
+
+
+def read_light_field_geometry(path, cache_path=None, write_if_invalid=True):
+    """
+    Returns the plenopy.LightFieldGeometry in path, read from its cache.
+    The cache is validated against the scenery in path/input/scenery.
+    """
+    return read_or_load(
+        source_path=path,
+        scenery_path=op.join(path, "input", "scenery", "scenery.json"),
+        load=lambda p: pl.LightFieldGeometry(path=p),
+        cache_path=cache_path,
+        write_if_invalid=write_if_invalid,
+    )
+
+
+def read_trigger_geometry(
+    path, scenery_path, cache_path=None, write_if_invalid=True
+):
+    """
+    Returns the trigger-geometry in path, read from its cache.
+    The cache is validated against the scenery.json in scenery_path.
+    """
+    return read_or_load(
+        source_path=path,
+        scenery_path=scenery_path,
+        load=lambda p: pl.trigger.geometry.read(path=p),
+        cache_path=cache_path,
+        write_if_invalid=write_if_invalid,
+    )
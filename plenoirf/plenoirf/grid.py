@@ -97,21 +97,59 @@ def _make_angle_between(directions, direction):
     return np.arccos(np.dot(directions, direction))
 
 
-def cut_cherenkov_bunches_in_field_of_view(
-    cherenkov_bunches, field_of_view_radius_deg, pointing_direction,
+def _mask_inside_field_of_view_by_angle(
+    cx, cy, field_of_view_radius_deg, pointing_direction
 ):
-    bunch_directions = _make_bunch_direction(
-        cx=cherenkov_bunches[:, cpw.I.BUNCH.CX],
-        cy=cherenkov_bunches[:, cpw.I.BUNCH.CY],
-    )
+    bunch_directions = _make_bunch_direction(cx=cx, cy=cy)
     bunch_incidents = -1.0 * bunch_directions
     angle_bunch_pointing = _make_angle_between(
         directions=bunch_incidents, direction=pointing_direction
     )
-    mask_inside_field_of_view = angle_bunch_pointing < np.deg2rad(
-        field_of_view_radius_deg
+    return angle_bunch_pointing < np.deg2rad(field_of_view_radius_deg)
+
+
+def mask_inside_field_of_view(
+    cx, cy, field_of_view_radius_deg, pointing_direction
+):
+    """
+    Returns a mask for the bunches with incident-directions (-cx, -cy)
+    within field_of_view_radius_deg around pointing_direction.
+    Same as comparing the angle between the incident-direction and the
+    pointing to the radius, but without arccos and without an N x 3 matrix.
+    """
+    fov = np.deg2rad(field_of_view_radius_deg)
+    assert 0.0 < fov < 0.5 * np.pi
+    pointing = np.asarray(pointing_direction, dtype=np.float64)
+    pointing = pointing / np.linalg.norm(pointing)
+
+    # r2 = cx^2 + cy^2
+    r2 = np.multiply(cx, cx, dtype=np.float64)
+    r2 += np.multiply(cy, cy, dtype=np.float64)
+
+    if pointing[0] == 0.0 and pointing[1] == 0.0 and pointing[2] > 0.0:
+        # zenith: cos(angle) = sqrt(1 - r2) > cos(fov) <=> r2 < sin(fov)^2
+        return r2 < np.sin(fov) ** 2
+
+    # cos(angle) = incident . pointing, with incident = (-cx, -cy, cz)
+    with np.errstate(invalid="ignore"):
+        np.subtract(1.0, r2, out=r2)
+        np.sqrt(r2, out=r2)
+    r2 *= pointing[2]
+    r2 -= pointing[0] * cx
+    r2 -= pointing[1] * cy
+    return r2 > np.cos(fov)
+
+
+def cut_cherenkov_bunches_in_field_of_view(
+    cherenkov_bunches, field_of_view_radius_deg, pointing_direction,
+):
+    mask = mask_inside_field_of_view(
+        cx=cherenkov_bunches[:, cpw.I.BUNCH.CX],
+        cy=cherenkov_bunches[:, cpw.I.BUNCH.CY],
+        field_of_view_radius_deg=field_of_view_radius_deg,
+        pointing_direction=pointing_direction,
     )
-    return cherenkov_bunches[mask_inside_field_of_view, :]
+    return cherenkov_bunches[mask, :]
 
 
 def histogram2d_overflow_and_bin_idxs(x, y, weights, xy_bin_edges):
@@ -140,6 +178,170 @@ def histogram2d_overflow_and_bin_idxs(x, y, weights, xy_bin_edges):
     return grid_histogram, overflow, x_bin_idxs, y_bin_idxs
 
 
+def _uniform_bin_width(xy_bin_edges, rel_tolerance=1e-9):
+    num_bins = len(xy_bin_edges) - 1
+    assert num_bins > 0
+    bin_width = (xy_bin_edges[-1] - xy_bin_edges[0]) / num_bins
+    assert bin_width > 0.0
+    widths = np.diff(xy_bin_edges)
+    assert np.all(np.abs(widths - bin_width) <= rel_tolerance * bin_width)
+    return bin_width
+
+
+def histogram2d_overflow_and_bin_idxs_uniform(x, y, weights, xy_bin_edges):
+    """
+    Same as histogram2d_overflow_and_bin_idxs() but only for uniform
+    xy_bin_edges. The bin-idxs are computed once using arithmetic and the
+    histogram is filled using a single np.bincount().
+
+    Returns
+    -------
+    (grid_histogram, overflow, x_bin_idxs, y_bin_idxs)
+        The bin-idxs follow np.digitize(), i.e. the inner bins are 1 to
+        num_bins, underflow is 0, and overflow is num_bins + 1.
+    """
+    xy_bin_edges = np.asarray(xy_bin_edges)
+    num_bins = len(xy_bin_edges) - 1
+    bin_width = _uniform_bin_width(xy_bin_edges=xy_bin_edges)
+    x0 = xy_bin_edges[0]
+
+    x_idxs = np.floor((x - x0) / bin_width).astype(np.int64)
+    y_idxs = np.floor((y - x0) / bin_width).astype(np.int64)
+    np.clip(x_idxs, -1, num_bins, out=x_idxs)
+    np.clip(y_idxs, -1, num_bins, out=y_idxs)
+
+    x_inside = np.logical_and(x_idxs >= 0, x_idxs < num_bins)
+    y_inside = np.logical_and(y_idxs >= 0, y_idxs < num_bins)
+    inside = np.logical_and(x_inside, y_inside)
+
+    flat_idxs = x_idxs[inside] * num_bins + y_idxs[inside]
+    grid_histogram = np.bincount(
+        flat_idxs, weights=weights[inside], minlength=num_bins * num_bins,
+    ).reshape((num_bins, num_bins))
+
+    overflow = {}
+    overflow["overflow_x"] = np.sum(weights[x_idxs == num_bins])
+    overflow["underflow_x"] = np.sum(weights[x_idxs == -1])
+    overflow["overflow_y"] = np.sum(weights[y_idxs == num_bins])
+    overflow["underflow_y"] = np.sum(weights[y_idxs == -1])
+
+    # assignment, same convention as np.digitize()
+    x_idxs += 1
+    y_idxs += 1
+
+    return grid_histogram, overflow, x_idxs, y_idxs
+
+
+def init_bin_index(x_bin_idxs, y_bin_idxs, num_bins):
+    """
+    Returns a compressed-sparse-row (CSR) index of the bunches in each
+    occupied bin of the grid. The bunch-idxs of one bin can be looked up
+    with get_bunch_idxs_in_bin() in O(num. bunches in bin).
+
+    Parameters
+    ----------
+    x_bin_idxs : array of ints
+        The bin-idxs of the bunches in x, same convention as np.digitize(),
+        i.e. the inner bins are 1 to num_bins.
+    y_bin_idxs : array of ints
+        Same as x_bin_idxs but in y.
+    num_bins : int
+        Number of bins on the edge of the grid.
+    """
+    x_bin_idxs = np.asarray(x_bin_idxs)
+    y_bin_idxs = np.asarray(y_bin_idxs)
+    assert x_bin_idxs.shape == y_bin_idxs.shape
+
+    x_inside = np.logical_and(x_bin_idxs >= 1, x_bin_idxs <= num_bins)
+    y_inside = np.logical_and(y_bin_idxs >= 1, y_bin_idxs <= num_bins)
+    bunch_idxs = np.flatnonzero(np.logical_and(x_inside, y_inside))
+
+    flat_bin_idxs = (x_bin_idxs[bunch_idxs] - 1) * num_bins + (
+        y_bin_idxs[bunch_idxs] - 1
+    )
+    # stable, so bunches in a bin keep their original order.
+    order = np.argsort(flat_bin_idxs, kind="stable")
+    flat_bin_idxs = flat_bin_idxs[order]
+
+    occupied_flat_bin_idxs, starts = np.unique(
+        flat_bin_idxs, return_index=True
+    )
+
+    bin_index = {}
+    bin_index["num_bins"] = num_bins
+    bin_index["flat_bin_idxs"] = occupied_flat_bin_idxs
+    bin_index["starts"] = np.append(starts, len(flat_bin_idxs))
+    bin_index["bunch_idxs"] = bunch_idxs[order]
+    return bin_index
+
+
+def get_bunch_idxs_in_bin(bin_index, bin_idx_x, bin_idx_y):
+    """
+    Returns the idxs of the bunches in bin (bin_idx_x, bin_idx_y).
+    Here bin_idx_x/y start at 0, same as in the grid-histogram.
+    """
+    bi = bin_index
+    flat_bin_idx = bin_idx_x * bi["num_bins"] + bin_idx_y
+    pos = np.searchsorted(bi["flat_bin_idxs"], flat_bin_idx)
+    if (
+        pos == len(bi["flat_bin_idxs"])
+        or bi["flat_bin_idxs"][pos] != flat_bin_idx
+    ):
+        return np.zeros(0, dtype=bi["bunch_idxs"].dtype)
+    start = bi["starts"][pos]
+    stop = bi["starts"][pos + 1]
+    return bi["bunch_idxs"][start:stop]
+
+
+def _make_choice(
+    bunches_in_fov,
+    bin_index,
+    grid_histogram,
+    grid_geometry,
+    bin_idx_x,
+    bin_idx_y,
+    shift_x,
+    shift_y,
+):
+    pgg = grid_geometry
+    M2CM = 1e2
+    choice = {}
+    choice["bin_idx_x"] = bin_idx_x
+    choice["bin_idx_y"] = bin_idx_y
+    choice["core_x_m"] = pgg["xy_bin_centers"][bin_idx_x] - shift_x
+    choice["core_y_m"] = pgg["xy_bin_centers"][bin_idx_y] - shift_y
+
+    bunch_idxs_in_bin = get_bunch_idxs_in_bin(
+        bin_index=bin_index, bin_idx_x=bin_idx_x, bin_idx_y=bin_idx_y,
+    )
+    choice["cherenkov_bunches"] = bunches_in_fov[bunch_idxs_in_bin, :]
+
+    # Cheap consistency check as it only touches the bunches in the bin.
+    num_photons_in_bin = grid_histogram[bin_idx_x, bin_idx_y]
+    num_photons_in_recovered_bin = np.sum(
+        choice["cherenkov_bunches"][:, cpw.I.BUNCH.BSIZE]
+    )
+    abs_diff_num_photons = np.abs(
+        num_photons_in_recovered_bin - num_photons_in_bin
+    )
+    assert abs_diff_num_photons <= 1e-2 * num_photons_in_bin, "".join(
+        [
+            "num_photons_in_bin: {:E}\n".format(float(num_photons_in_bin)),
+            "num_photons_in_recovered_bin: {:E}\n".format(
+                float(num_photons_in_recovered_bin)
+            ),
+            "abs(diff): {:E}\n".format(abs_diff_num_photons),
+            "bin_idx_x: {:d}\n".format(bin_idx_x),
+            "bin_idx_y: {:d}\n".format(bin_idx_y),
+            "num. bunches in bin: {:d}\n".format(len(bunch_idxs_in_bin)),
+        ]
+    )
+
+    choice["cherenkov_bunches"][:, cpw.I.BUNCH.X] -= M2CM * choice["core_x_m"]
+    choice["cherenkov_bunches"][:, cpw.I.BUNCH.Y] -= M2CM * choice["core_y_m"]
+    return choice
+
+
 def assign(
     cherenkov_bunches,
     grid_geometry,
@@ -148,7 +350,20 @@ def assign(
     threshold_num_photons,
     prng,
     bin_idxs_limitation=None,
+    num_reuses=1,
 ):
+    """
+    Histograms the Cherenkov-bunches in the grid and draws up to num_reuses
+    distinct bins above threshold_num_photons without replacement.
+
+    Returns
+    -------
+    out : dict
+        "random_choices" is the list of the drawn bins, each with the
+        cherenkov_bunches relative to the bin's center.
+        "random_choice" is the first of these, or None.
+    """
+    assert num_reuses >= 1
     pgg = grid_geometry
 
     bunches_in_fov = cut_cherenkov_bunches_in_field_of_view(
@@ -160,7 +375,6 @@ def assign(
     # Supports
     # --------
     CM2M = 1e-2
-    M2CM = 1e2
     bunch_x_wrt_grid_m = CM2M * bunches_in_fov[:, cpw.I.BUNCH.X] + shift_x
     bunch_y_wrt_grid_m = CM2M * bunches_in_fov[:, cpw.I.BUNCH.Y] + shift_y
     bunch_weight = bunches_in_fov[:, cpw.I.BUNCH.BSIZE]
@@ -170,7 +384,7 @@ def assign(
         grid_overflow,
         bunch_x_bin_idxs,
         bunch_y_bin_idxs,
-    ) = histogram2d_overflow_and_bin_idxs(
+    ) = histogram2d_overflow_and_bin_idxs_uniform(
         x=bunch_x_wrt_grid_m,
         y=bunch_y_wrt_grid_m,
         xy_bin_edges=pgg["xy_bin_edges"],
@@ -187,53 +401,40 @@ def assign(
 
     num_bins_above_threshold = bin_idxs_above_threshold[0].shape[0]
 
-    if num_bins_above_threshold == 0:
-        choice = None
+    num_choices = min(num_reuses, num_bins_above_threshold)
+    if num_choices == 0:
+        choice_bins = []
+    elif num_choices == 1:
+        # Same draw as for a single reuse to keep the prng's sequence.
+        choice_bins = [prng.choice(np.arange(num_bins_above_threshold))]
     else:
-        _choice_bin = prng.choice(np.arange(num_bins_above_threshold))
-        bin_idx_x = bin_idxs_above_threshold[0][_choice_bin]
-        bin_idx_y = bin_idxs_above_threshold[1][_choice_bin]
-        num_photons_in_bin = grid_histogram[bin_idx_x, bin_idx_y]
-        choice = {}
-        choice["bin_idx_x"] = bin_idx_x
-        choice["bin_idx_y"] = bin_idx_y
-        choice["core_x_m"] = pgg["xy_bin_centers"][bin_idx_x] - shift_x
-        choice["core_y_m"] = pgg["xy_bin_centers"][bin_idx_y] - shift_y
-        match_bin_idx_x = bunch_x_bin_idxs - 1 == bin_idx_x
-        match_bin_idx_y = bunch_y_bin_idxs - 1 == bin_idx_y
-        match_bin = np.logical_and(match_bin_idx_x, match_bin_idx_y)
-        num_photons_in_recovered_bin = np.sum(
-            bunches_in_fov[match_bin, cpw.I.BUNCH.BSIZE]
+        choice_bins = prng.choice(
+            num_bins_above_threshold, size=num_choices, replace=False
         )
-        abs_diff_num_photons = np.abs(
-            num_photons_in_recovered_bin - num_photons_in_bin
+
+    choices = []
+    if num_choices > 0:
+        bin_index = init_bin_index(
+            x_bin_idxs=bunch_x_bin_idxs,
+            y_bin_idxs=bunch_y_bin_idxs,
+            num_bins=pgg["num_bins_diameter"],
         )
-        if abs_diff_num_photons > 1e-2 * num_photons_in_bin:
-            msg = "".join(
-                [
-                    "num_photons_in_bin: {:E}\n".format(
-                        float(num_photons_in_bin)
-                    ),
-                    "num_photons_in_recovered_bin: {:E}\n".format(
-                        float(num_photons_in_recovered_bin)
-                    ),
-                    "abs(diff): {:E}\n".format(abs_diff_num_photons),
-                    "bin_idx_x: {:d}\n".format(bin_idx_x),
-                    "bin_idx_y: {:d}\n".format(bin_idx_y),
-                    "sum(match_bin): {:d}\n".format(np.sum(match_bin)),
-                ]
+        for choice_bin in choice_bins:
+            choice = _make_choice(
+                bunches_in_fov=bunches_in_fov,
+                bin_index=bin_index,
+                grid_histogram=grid_histogram,
+                grid_geometry=pgg,
+                bin_idx_x=bin_idxs_above_threshold[0][choice_bin],
+                bin_idx_y=bin_idxs_above_threshold[1][choice_bin],
+                shift_x=shift_x,
+                shift_y=shift_y,
             )
-            assert False, msg
-        choice["cherenkov_bunches"] = bunches_in_fov[match_bin, :].copy()
-        choice["cherenkov_bunches"][:, cpw.I.BUNCH.X] -= (
-            M2CM * choice["core_x_m"]
-        )
-        choice["cherenkov_bunches"][:, cpw.I.BUNCH.Y] -= (
-            M2CM * choice["core_y_m"]
-        )
+            choices.append(choice)
 
     out = {}
-    out["random_choice"] = choice
+    out["random_choices"] = choices
+    out["random_choice"] = choices[0] if choices else None
     out["histogram"] = grid_histogram
     for overflow_key in grid_overflow:
         out[overflow_key] = grid_overflow[overflow_key]
@@ -241,7 +442,59 @@ def assign(
     return out
 
 
-def histogram_to_bytes(img):
+# histogram formats
+# -----------------
+# dense:  The gzip-compressed '<f4' image, flattened in c-order. It must be
+#         square.
+# sparse: The gzip-compressed coordinate-list (COO) of the non-zero bins.
+#         SPARSE_MAGIC, '<u4' header [num_rows, num_cols, num_non_zero],
+#         '<u4' differences of the sorted flat bin-idxs, '<f4' values.
+#         NaN-bins are non-zero and are thus kept.
+# The file-extensions in the tar-files tell the formats apart, and
+# bytes_to_histogram() detects the format from the content when fmt is None.
+
+HISTOGRAM_FILE_EXTENSIONS = {"dense": ".f4.gz", "sparse": ".coo.gz"}
+SPARSE_MAGIC = b"\x00COO"
+
+
+def histogram_format_from_file_name(file_name):
+    for fmt in HISTOGRAM_FILE_EXTENSIONS:
+        if file_name.endswith(HISTOGRAM_FILE_EXTENSIONS[fmt]):
+            return fmt
+    raise KeyError("Unknown histogram format of '{:s}'.".format(file_name))
+
+
+def histogram_file_name(idx, fmt):
+    return unique.UID_FOTMAT_STR.format(idx) + HISTOGRAM_FILE_EXTENSIONS[fmt]
+
+
+def histogram_to_bytes(img, fmt="dense"):
+    if fmt == "dense":
+        return _dense_histogram_to_bytes(img=img)
+    elif fmt == "sparse":
+        return _sparse_histogram_to_bytes(img=img)
+    else:
+        raise KeyError("Unknown histogram format '{:s}'.".format(fmt))
+
+
+def bytes_to_histogram(img_bytes_gz, fmt=None):
+    """
+    Returns the histogram. When fmt is None, the format is detected from the
+    content.
+    """
+    img_bytes = gzip.decompress(img_bytes_gz)
+    if fmt is None:
+        fmt = "sparse" if img_bytes[0:4] == SPARSE_MAGIC else "dense"
+
+    if fmt == "dense":
+        return _dense_bytes_to_histogram(img_bytes=img_bytes)
+    elif fmt == "sparse":
+        return _sparse_bytes_to_histogram(img_bytes=img_bytes)
+    else:
+        raise KeyError("Unknown histogram format '{:s}'.".format(fmt))
+
+
+def _dense_histogram_to_bytes(img):
     img_f4 = img.astype("<f4")
     img_f4_flat_c = img_f4.flatten(order="c")
     img_f4_flat_c_bytes = img_f4_flat_c.tobytes()
@@ -249,8 +502,7 @@ def histogram_to_bytes(img):
     return img_gzip_bytes
 
 
-def bytes_to_histogram(img_bytes_gz):
-    img_bytes = gzip.decompress(img_bytes_gz)
+def _dense_bytes_to_histogram(img_bytes):
     arr = np.frombuffer(img_bytes, dtype="<f4")
     num_bins = arr.shape[0]
     num_bins_edge = int(np.sqrt(num_bins))
@@ -258,6 +510,48 @@ def bytes_to_histogram(img_bytes_gz):
     return arr.reshape((num_bins_edge, num_bins_edge), order="c")
 
 
+def _sparse_histogram_to_bytes(img):
+    assert img.ndim == 2
+    img_f4_flat_c = img.astype("<f4").flatten(order="c")
+    assert img_f4_flat_c.shape[0] < 2 ** 32
+    flat_idxs = np.flatnonzero(img_f4_flat_c != 0.0)
+    header = np.array(
+        [img.shape[0], img.shape[1], flat_idxs.shape[0]], dtype="<u4"
+    )
+    # sorted idxs have small differences which compress well.
+    flat_idxs_diff = np.diff(flat_idxs, prepend=0).astype("<u4")
+    img_bytes = b"".join(
+        [
+            SPARSE_MAGIC,
+            header.tobytes(),
+            flat_idxs_diff.tobytes(),
+            img_f4_flat_c[flat_idxs].tobytes(),
+        ]
+    )
+    return gzip.compress(img_bytes)
+
+
+def _sparse_bytes_to_histogram(img_bytes):
+    assert img_bytes[0:4] == SPARSE_MAGIC
+    num_rows, num_cols, num_non_zero = np.frombuffer(
+        img_bytes, dtype="<u4", count=3, offset=4
+    )
+    offset = 4 + 3 * 4
+    flat_idxs_diff = np.frombuffer(
+        img_bytes, dtype="<u4", count=num_non_zero, offset=offset
+    )
+    offset += 4 * int(num_non_zero)
+    values = np.frombuffer(
+        img_bytes, dtype="<f4", count=num_non_zero, offset=offset
+    )
+    assert offset + 4 * int(num_non_zero) == len(img_bytes)
+
+    flat_idxs = np.cumsum(flat_idxs_diff, dtype=np.int64)
+    img_f4_flat_c = np.zeros(int(num_rows) * int(num_cols), dtype="<f4")
+    img_f4_flat_c[flat_idxs] = values
+    return img_f4_flat_c.reshape((num_rows, num_cols), order="c")
+
+
 # histograms
 # ----------
 # A dict with the unique-id (uid) as key for the airshowers, containing the
@@ -274,40 +568,234 @@ def read_all_histograms(path):
 
 
 def read_histograms(path, indices=None):
+    """
+    Returns a dict of the histograms' bytes with the uids in indices.
+    When there is an index-file next to path, the histograms are read by
+    seeking directly to them. Otherwise the tar is scanned.
+    """
     if indices is None:
         return read_all_histograms(path)
-    else:
-        indices_set = set(indices)
-        grids = {}
-        with tarfile.open(path, "r") as tarfin:
-            for tarinfo in tarfin:
-                idx = int(tarinfo.name[0 : unique.UID_NUM_DIGITS])
-                if idx in indices_set:
-                    grids[idx] = tarfin.extractfile(tarinfo).read()
-        return grids
+
+    histogram_index = read_histogram_index(path)
+    if histogram_index is not None:
+        return _read_histograms_using_index(
+            path=path, indices=indices, histogram_index=histogram_index
+        )
+
+    indices_set = set(indices)
+    grids = {}
+    with tarfile.open(path, "r") as tarfin:
+        for tarinfo in tarfin:
+            idx = int(tarinfo.name[0 : unique.UID_NUM_DIGITS])
+            if idx in indices_set:
+                grids[idx] = tarfin.extractfile(tarinfo).read()
+    return grids
+
+
+# histogram-index
+# ---------------
+# A sidecar-file next to a tar of histograms. It is '<u8' with three
+# columns. The first row is [num. histograms, size of tar, 0]. Then one
+# row [uid, offset of data in tar, size of data] per histogram sorted
+# by uid. A histogram-index which does not match the tar's size is
+# ignored.
+
+HISTOGRAM_INDEX_EXT = ".index"
+
+
+def _tar_addfile_and_index(tarfout, tarinfo, fileobj, histogram_index):
+    tarfout.addfile(tarinfo=tarinfo, fileobj=fileobj)
+    num_blocks = (tarinfo.size + tarfile.BLOCKSIZE - 1) // tarfile.BLOCKSIZE
+    offset_data = tarfout.offset - num_blocks * tarfile.BLOCKSIZE
+    idx = int(tarinfo.name[0 : unique.UID_NUM_DIGITS])
+    histogram_index.append([idx, offset_data, tarinfo.size])
+
+
+def write_histogram_index(path, histogram_index):
+    """
+    Writes the histogram-index of the tar in path. Call this after the tar
+    is closed and at its final path.
+    """
+    rows = np.array(histogram_index, dtype="<u8").reshape((-1, 3))
+    rows = rows[np.argsort(rows[:, 0], kind="stable")]
+    header = np.array([[rows.shape[0], os.stat(path).st_size, 0]], "<u8")
+    index_path = path + HISTOGRAM_INDEX_EXT
+    with open(index_path + ".tmp", "wb") as f:
+        f.write(np.concatenate([header, rows]).tobytes())
+    shutil.move(index_path + ".tmp", index_path)
+
+
+def read_histogram_index(path):
+    """
+    Returns the histogram-index of the tar in path, or None when there is
+    no valid one.
+    """
+    index_path = path + HISTOGRAM_INDEX_EXT
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, "rb") as f:
+        rows = np.frombuffer(f.read(), dtype="<u8")
+    if rows.shape[0] < 3 or rows.shape[0] % 3 != 0:
+        return None
+    rows = rows.reshape((-1, 3))
+    num, tar_size, _ = rows[0]
+    if num != rows.shape[0] - 1 or tar_size != os.stat(path).st_size:
+        return None
+    rows = rows[1:]
+    return {
+        "idx": rows[:, 0].astype(np.int64),
+        "offset": rows[:, 1].astype(np.int64),
+        "size": rows[:, 2].astype(np.int64),
+    }
+
+
+def _read_histograms_using_index(path, indices, histogram_index):
+    hi = histogram_index
+    indices = np.unique(np.asarray(indices, dtype=np.int64))
+    pos = np.searchsorted(hi["idx"], indices)
+    pos = pos[pos < len(hi["idx"])]
+    pos = pos[np.isin(hi["idx"][pos], indices)]
+
+    grids = {}
+    with open(path, "rb") as f:
+        for p in pos:
+            f.seek(hi["offset"][p])
+            grids[int(hi["idx"][p])] = f.read(hi["size"][p])
+    return grids
+
+
+def _histogram_format_from_bytes(img_bytes_gz):
+    with gzip.GzipFile(fileobj=io.BytesIO(img_bytes_gz)) as f:
+        head = f.read(len(SPARSE_MAGIC))
+    return "sparse" if head == SPARSE_MAGIC else "dense"
 
 
 def write_histograms(path, grid_histograms):
+    histogram_index = []
     with tarfile.open(path + ".tmp", "w") as tarfout:
         for idx in grid_histograms:
-            filename = unique.UID_FOTMAT_STR.format(idx) + ".f4.gz"
+            fmt = _histogram_format_from_bytes(grid_histograms[idx])
+            filename = histogram_file_name(idx=idx, fmt=fmt)
             with io.BytesIO() as buff:
                 info = tarfile.TarInfo(filename)
                 info.size = buff.write(grid_histograms[idx])
                 buff.seek(0)
-                tarfout.addfile(info, buff)
+                _tar_addfile_and_index(
+                    tarfout=tarfout,
+                    tarinfo=info,
+                    fileobj=buff,
+                    histogram_index=histogram_index,
+                )
     shutil.move(path + ".tmp", path)
+    write_histogram_index(path=path, histogram_index=histogram_index)
+
+
+class DenseHistogramBuffer:
+    """
+    Dense histograms of equal shape, and their uids, in one contiguous
+    '<f4' array which grows geometrically. The buffer is written into two
+    .npy-files which can be read back with np.load(mmap_mode="r").
+    """
+
+    def __init__(self, shape, capacity=64):
+        assert capacity > 0
+        self.shape = tuple(shape)
+        self._size = 0
+        self.idx = np.zeros(capacity, dtype="<u8")
+        self.histograms = np.zeros((capacity,) + self.shape, dtype="<f4")
+
+    def _reserve(self, size):
+        capacity = self.idx.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        idx = np.zeros(capacity, dtype="<u8")
+        idx[0 : self._size] = self.idx[0 : self._size]
+        histograms = np.zeros((capacity,) + self.shape, dtype="<f4")
+        histograms[0 : self._size] = self.histograms[0 : self._size]
+        self.idx = idx
+        self.histograms = histograms
+
+    def append(self, idx, img):
+        assert img.shape == self.shape
+        self._reserve(self._size + 1)
+        self.idx[self._size] = idx
+        self.histograms[self._size] = img
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    def write(self, path):
+        for key in ["idx", "histograms"]:
+            out_path = path + "." + key + ".npy"
+            with open(out_path + ".tmp", "wb") as f:
+                np.save(f, getattr(self, key)[0 : self._size])
+            shutil.move(out_path + ".tmp", out_path)
+
+
+def read_dense_histogram_buffer(path):
+    """
+    Returns the uids, and the histograms (read-only np.memmap) of a
+    DenseHistogramBuffer written to path.
+    """
+    idx = np.load(path + ".idx.npy")
+    histograms = np.load(path + ".histograms.npy", mmap_mode="r")
+    assert idx.shape[0] == histograms.shape[0]
+    return idx, histograms
+
+
+def _copy_bytes(fin, fout, size, chunk_size=2 ** 24):
+    while size > 0:
+        chunk = fin.read(min(size, chunk_size))
+        assert len(chunk) > 0, "Unexpected end of file."
+        fout.write(chunk)
+        size -= len(chunk)
+
+
+def _tar_members_block_range(tarinfos):
+    first = tarinfos[0]
+    last = tarinfos[-1]
+    num_blocks = (last.size + tarfile.BLOCKSIZE - 1) // tarfile.BLOCKSIZE
+    stop = last.offset_data + num_blocks * tarfile.BLOCKSIZE
+    return first.offset, stop
 
 
 def reduce(list_of_grid_paths, out_path):
-    with tarfile.open(out_path + ".tmp", "w") as tarfout:
+    """
+    Concatenates the tars of histograms in list_of_grid_paths into one tar
+    in out_path and writes its histogram-index.
+    Only the headers of the members are parsed. The blocks of the members
+    are copied as they are without extracting each member.
+    """
+    histogram_index = []
+    with open(out_path + ".tmp", "wb") as fout:
         for grid_path in list_of_grid_paths:
             with tarfile.open(grid_path, "r") as tarfin:
-                for tarinfo in tarfin:
-                    tarfout.addfile(
-                        tarinfo=tarinfo, fileobj=tarfin.extractfile(tarinfo)
-                    )
+                tarinfos = tarfin.getmembers()
+            if len(tarinfos) == 0:
+                continue
+
+            start, stop = _tar_members_block_range(tarinfos)
+            shift = fout.tell() - start
+            for tarinfo in tarinfos:
+                idx = int(tarinfo.name[0 : unique.UID_NUM_DIGITS])
+                histogram_index.append(
+                    [idx, tarinfo.offset_data + shift, tarinfo.size]
+                )
+            with open(grid_path, "rb") as fin:
+                fin.seek(start)
+                _copy_bytes(fin=fin, fout=fout, size=stop - start)
+
+        # end of archive: two zero-blocks, padded to a full record
+        fout.write(bytes(2 * tarfile.BLOCKSIZE))
+        remainder = fout.tell() % tarfile.RECORDSIZE
+        if remainder > 0:
+            fout.write(bytes(tarfile.RECORDSIZE - remainder))
+
     shutil.move(out_path + ".tmp", out_path)
+    write_histogram_index(path=out_path, histogram_index=histogram_index)
 
 
 class GridReader:
@@ -321,8 +809,9 @@ class GridReader:
             raise StopIteration
 
         idx = int(self.next_info.name[0 : unique.UID_NUM_DIGITS])
+        fmt = histogram_format_from_file_name(self.next_info.name)
         bimg = self.tar.extractfile(self.next_info).read()
-        img = bytes_to_histogram(bimg)
+        img = bytes_to_histogram(bimg, fmt=fmt)
         self.next_info = self.tar.next()
         return idx, img
 
@@ -1,12 +1,18 @@
 from . import table
+from . import table_records
 from . import unique
 from . import grid
 from . import utils
 from . import production
 from . import reconstruction
 from . import outer_telescope_array
+from . import runtime
+from . import geometry_cache
+from . import trigger_responses
+from . import bunch_statistics
 
 import sys
+import multiprocessing
 import numpy as np
 import os
 from os import path as op
@@ -153,7 +159,11 @@ def make_job_dict(
     tmp_dir,
     keep_tmp_dir,
     date_dict,
+    stream_cherenkov_pools=False,
+    prng_compatible_primary_steering=True,
+    num_trajectory_workers=1,
 ):
+    num_reuses_per_shower(grid_config=config["grid"])
     job = {
         "run_id": run_id,
         "production_key": production_key,
@@ -200,6 +210,9 @@ def make_job_dict(
             run_dir, production_key, site_key, particle_key, "features.map"
         ),
         "keep_tmp": keep_tmp_dir,
+        "stream_cherenkov_pools": stream_cherenkov_pools,
+        "prng_compatible_primary_steering": prng_compatible_primary_steering,
+        "num_trajectory_workers": num_trajectory_workers,
         "tmp_dir": tmp_dir,
         "date": date_dict,
         "artificial_core_limitation": config["artificial_core_limitation"][
@@ -209,96 +222,169 @@ def make_job_dict(
     return job
 
 
+REDUCE_ARTIFACTS = [
+    "runtime",
+    "event_table",
+    "grid",
+    "grid_roi_pasttrigger",
+    "cherenkov_phs_loph",
+]
+
+
 def reduce(run_dir, production_key, site_key, particle_key, LAZY, logger=None):
     logger = logger if logger else jlogging.LoggerStdout()
+    for artifact_key in REDUCE_ARTIFACTS:
+        run_reduce_job(
+            reduce_job=make_reduce_job(
+                run_dir=run_dir,
+                production_key=production_key,
+                site_key=site_key,
+                particle_key=particle_key,
+                artifact_key=artifact_key,
+                LAZY=LAZY,
+            ),
+            logger=logger,
+        )
+
+
+def make_reduce_job(
+    run_dir, production_key, site_key, particle_key, artifact_key, LAZY
+):
+    assert artifact_key in REDUCE_ARTIFACTS
+    return {
+        "run_dir": run_dir,
+        "production_key": production_key,
+        "site_key": site_key,
+        "particle_key": particle_key,
+        "artifact_key": artifact_key,
+        "LAZY": LAZY,
+    }
+
+
+def make_reduce_jobs(run_dir, production_key, site_keys, particle_keys, LAZY):
+    """
+    Returns one reduce_job for each site, particle, and artifact.
+    The reduce_jobs are independent of each other and can run in parallel.
+    """
+    reduce_jobs = []
+    for site_key in site_keys:
+        for particle_key in particle_keys:
+            for artifact_key in REDUCE_ARTIFACTS:
+                reduce_jobs.append(
+                    make_reduce_job(
+                        run_dir=run_dir,
+                        production_key=production_key,
+                        site_key=site_key,
+                        particle_key=particle_key,
+                        artifact_key=artifact_key,
+                        LAZY=LAZY,
+                    )
+                )
+    return reduce_jobs
+
+
+def run_reduce_job(reduce_job, logger=None):
+    logger = logger if logger else jlogging.LoggerStdout()
+    rj = reduce_job
 
-    production_dir = os.path.join(run_dir, production_key)
-    site_dir = os.path.join(production_dir, site_key)
-    site_particle_dir = os.path.join(site_dir, particle_key)
+    site_particle_dir = os.path.join(
+        rj["run_dir"], rj["production_key"], rj["site_key"], rj["particle_key"]
+    )
     log_dir = os.path.join(site_particle_dir, "log.map")
     features_dir = os.path.join(site_particle_dir, "features.map")
+    artifact_key = rj["artifact_key"]
 
     # run-time
     # ========
-    log_path = os.path.join(site_particle_dir, "runtime.csv")
-    if not op.exists(log_path) or not LAZY:
-        _lop_paths = glob.glob(os.path.join(log_dir, "*_runtime.jsonl"))
-        jlogging.reduce(list_of_log_paths=_lop_paths, out_path=log_path)
-    logger.info("Reduce {:s} {:s} run-time.".format(site_key, particle_key))
+    if artifact_key == "runtime":
+        log_path = os.path.join(site_particle_dir, "runtime.csv")
+        if not op.exists(log_path) or not rj["LAZY"]:
+            _lop_paths = glob.glob(os.path.join(log_dir, "*_runtime.jsonl"))
+            runtime.reduce(list_of_log_paths=_lop_paths, out_path=log_path)
 
     # event table
     # ===========
-    event_table_path = os.path.join(site_particle_dir, "event_table.tar")
-    if not op.exists(event_table_path) or not LAZY:
-        _features_paths = glob.glob(
-            os.path.join(features_dir, "*_event_table.tar")
-        )
-        event_table = spt.concatenate_files(
-            list_of_table_paths=_features_paths, structure=table.STRUCTURE,
-        )
-        spt.write(
-            path=event_table_path,
-            table=event_table,
-            structure=table.STRUCTURE,
-        )
-    logger.info("Reduce {:s} {:s} event_table.".format(site_key, particle_key))
+    elif artifact_key == "event_table":
+        event_table_path = os.path.join(site_particle_dir, "event_table.tar")
+        if not op.exists(event_table_path) or not rj["LAZY"]:
+            _features_paths = glob.glob(
+                os.path.join(features_dir, "*_event_table.tar")
+            )
+            event_table = spt.concatenate_files(
+                list_of_table_paths=_features_paths,
+                structure=table.STRUCTURE,
+            )
+            spt.write(
+                path=event_table_path + ".tmp",
+                table=event_table,
+                structure=table.STRUCTURE,
+            )
+            nfs.move(event_table_path + ".tmp", event_table_path)
+            table.convert_to_columnar(path=event_table_path)
 
     # grid images
     # ===========
-    for grid_key in ["grid", "grid_roi_pasttrigger"]:
-        grid_path = os.path.join(site_particle_dir, grid_key + ".tar")
-        if not op.exists(grid_path) or not LAZY:
+    elif artifact_key in ["grid", "grid_roi_pasttrigger"]:
+        grid_path = os.path.join(site_particle_dir, artifact_key + ".tar")
+        if not op.exists(grid_path) or not rj["LAZY"]:
             _grid_paths = glob.glob(
-                os.path.join(features_dir, "*_" + grid_key + ".tar")
+                os.path.join(features_dir, "*_" + artifact_key + ".tar")
             )
             grid.reduce(list_of_grid_paths=_grid_paths, out_path=grid_path)
-        logger.info(
-            "Reduce {:s} {:s} {:s}.".format(site_key, particle_key, grid_key)
-        )
 
     # cherenkov-photon-stream
     # =======================
-    loph_abspath = os.path.join(site_particle_dir, "cherenkov.phs.loph.tar")
-    tmp_loph_abspath = loph_abspath + ".tmp"
-    logger.info(
-        "Reduce {:s} {:s} cherenkov phs.".format(site_key, particle_key)
-    )
-    if not op.exists(loph_abspath) or not LAZY:
-        logger.info("compile {:s}".format(loph_abspath))
-        _cer_run_paths = glob.glob(
-            os.path.join(
-                site_particle_dir,
-                "past_trigger_reconstructed_cherenkov_dir.map",
-                "*_reconstructed_cherenkov.tar",
-            )
+    elif artifact_key == "cherenkov_phs_loph":
+        loph_abspath = os.path.join(
+            site_particle_dir, "cherenkov.phs.loph.tar"
         )
-        _cer_run_paths.sort()
-        pl.photon_stream.loph.concatenate_tars(
-            in_paths=_cer_run_paths, out_path=tmp_loph_abspath
+        tmp_loph_abspath = loph_abspath + ".tmp"
+        if not op.exists(loph_abspath) or not rj["LAZY"]:
+            logger.info("compile {:s}".format(loph_abspath))
+            _cer_run_paths = glob.glob(
+                os.path.join(
+                    site_particle_dir,
+                    "past_trigger_reconstructed_cherenkov_dir.map",
+                    "*_reconstructed_cherenkov.tar",
+                )
+            )
+            _cer_run_paths.sort()
+            pl.photon_stream.loph.concatenate_tars(
+                in_paths=_cer_run_paths, out_path=tmp_loph_abspath
+            )
+            nfs.move(tmp_loph_abspath, loph_abspath)
+
+    logger.info(
+        "Reduce {:s} {:s} {:s}.".format(
+            rj["site_key"], rj["particle_key"], artifact_key
         )
-        nfs.move(tmp_loph_abspath, loph_abspath)
+    )
+    return 0
+
+
+def _set_columns(row, record, level_key):
+    for column_key in table.STRUCTURE[level_key]:
+        row[column_key] = record[column_key]
+    return row
 
 
 def _append_bunch_ssize(cherenkovsise_dict, cherenkov_bunches):
-    cb = cherenkov_bunches
-    ase = cherenkovsise_dict
-    ase["num_bunches"] = cb.shape[0]
-    ase["num_photons"] = np.sum(cb[:, cpw.I.BUNCH.BSIZE])
-    return ase
+    return _set_columns(
+        row=cherenkovsise_dict,
+        record=bunch_statistics.size(cherenkov_bunches=cherenkov_bunches),
+        level_key="cherenkovsize",
+    )
 
 
 def _append_bunch_statistics(airshower_dict, cherenkov_bunches):
-    cb = cherenkov_bunches
-    ase = airshower_dict
-    assert cb.shape[0] > 0
-    ase["maximum_asl_m"] = cpw.CM2M * np.median(cb[:, cpw.I.BUNCH.ZEM])
-    ase["wavelength_median_nm"] = np.abs(np.median(cb[:, cpw.I.BUNCH.WVL]))
-    ase["cx_median_rad"] = np.median(cb[:, cpw.I.BUNCH.CX])
-    ase["cy_median_rad"] = np.median(cb[:, cpw.I.BUNCH.CY])
-    ase["x_median_m"] = cpw.CM2M * np.median(cb[:, cpw.I.BUNCH.X])
-    ase["y_median_m"] = cpw.CM2M * np.median(cb[:, cpw.I.BUNCH.Y])
-    ase["bunch_size_median"] = np.median(cb[:, cpw.I.BUNCH.BSIZE])
-    return ase
+    assert cherenkov_bunches.shape[0] > 0
+    return _set_columns(
+        row=airshower_dict,
+        record=bunch_statistics.statistics(
+            cherenkov_bunches=cherenkov_bunches
+        ),
+        level_key="cherenkovpool",
+    )
 
 
 def plenoscope_event_dir_to_tar(event_dir, output_tar_path=None):
@@ -346,26 +432,50 @@ def _init_grid_geometry_from_job(job):
     return grid_geometry
 
 
+# The summary joins the levels of the event-table on the UIDs of the
+# airshowers. It does not join the reuses with reuse-ID > 0 to their
+# airshower yet (unique.shower_uid()), so their events would be dropped.
+MAX_NUM_REUSES_PER_SHOWER = 1
+
+
+def num_reuses_per_shower(grid_config):
+    """
+    Returns the number of reuses of each airshower in the grid. Default is
+    one, e.g. for configs written before airshowers could be reused.
+    """
+    num_reuses = int(grid_config.get("num_reuses_per_shower", 1))
+    assert num_reuses > 0
+    assert num_reuses <= MAX_NUM_REUSES_PER_SHOWER, (
+        "num_reuses_per_shower = {:d}, but the summary can not join more "
+        "than {:d} reuses per airshower yet.".format(
+            num_reuses, MAX_NUM_REUSES_PER_SHOWER
+        )
+    )
+    return num_reuses
+
+
 def _run_corsika_and_grid_and_output_to_tmp_dir(
-    job, prng, tmp_dir, corsika_primary_steering, tabrec,
+    job, prng, tmp_dir, corsika_primary_steering, tabrec, cherenkov_pools_path,
 ):
     grid_geometry = _init_grid_geometry_from_job(job=job)
     GRID_SKIP = int(job["grid"]["output_after_num_events"])
     assert GRID_SKIP > 0
+    NUM_REUSES = num_reuses_per_shower(grid_config=job["grid"])
+    if NUM_REUSES > 1:
+        assert job["num_air_showers"] < unique.SHOWER_ID_UPPER
 
     # loop over air-showers
     # ---------------------
-    cherenkov_pools_path = op.join(tmp_dir, "cherenkov_pools.tar")
     tmp_grid_histogram_path = op.join(tmp_dir, "grid.tar")
-    tmp_grid_roi_histogram_path = op.join(tmp_dir, "grid_roi.tar")
+    roi_num_bins_edge = 2 * outer_telescope_array.NUM_BINS_RADIUS + 1
+    grid_roi_buffer = grid.DenseHistogramBuffer(
+        shape=(roi_num_bins_edge, roi_num_bins_edge),
+        capacity=job["num_air_showers"],
+    )
 
     with cpw.event_tape.EventTapeWriter(
         path=cherenkov_pools_path
-    ) as evttar, tarfile.open(
-        tmp_grid_histogram_path, "w"
-    ) as imgtar, tarfile.open(
-        tmp_grid_roi_histogram_path, "w"
-    ) as imgroitar:
+    ) as evttar, tarfile.open(tmp_grid_histogram_path, "w") as imgtar:
 
         corsika_run = cpw.CorsikaPrimary(
             corsika_path=job["corsika_primary_path"],
@@ -384,15 +494,12 @@ def _run_corsika_and_grid_and_output_to_tmp_dir(
             event_id = event_idx + 1
             assert event_id == corsika_evth[cpw.I.EVTH.EVENT_NUMBER]
             uid = unique.make_uid(run_id=run_id, event_id=event_id)
-            uid_str = unique.make_uid_str(run_id=run_id, event_id=event_id)
-
-            ide = {spt.IDX: uid}
 
             primary = corsika_primary_steering["primaries"][event_idx]
 
             # export primary table
             # --------------------
-            prim = ide.copy()
+            prim = tabrec["primary"].new_row(idx=uid)
             prim["particle_id"] = primary["particle_id"]
             prim["energy_GeV"] = primary["energy_GeV"]
             prim["azimuth_rad"] = primary["azimuth_rad"]
@@ -438,13 +545,11 @@ def _run_corsika_and_grid_and_output_to_tmp_dir(
             prim["magnet_cherenkov_pool_y_m"] = primary[
                 "magnet_cherenkov_pool_y_m"
             ]
-            tabrec["primary"].append(prim)
 
             # cherenkov size
             # --------------
-            crsz = ide.copy()
+            crsz = tabrec["cherenkovsize"].new_row(idx=uid)
             crsz = _append_bunch_ssize(crsz, cherenkov_bunches)
-            tabrec["cherenkovsize"].append(crsz)
 
             # assign grid
             # -----------
@@ -454,7 +559,7 @@ def _run_corsika_and_grid_and_output_to_tmp_dir(
                 size=2,
             )
 
-            grhi = ide.copy()
+            grhi = tabrec["grid"].new_row(idx=uid)
             if job["artificial_core_limitation"]:
                 _max_core_scatter_radius = np.interp(
                     x=primary["energy_GeV"],
@@ -520,13 +625,16 @@ def _run_corsika_and_grid_and_output_to_tmp_dir(
                 threshold_num_photons=job["grid"]["threshold_num_photons"],
                 prng=prng,
                 bin_idxs_limitation=grid_bin_idxs_limitation,
+                num_reuses=NUM_REUSES,
             )
             if event_idx % GRID_SKIP == 0:
                 utils.tar_append(
                     tarout=imgtar,
-                    file_name=uid_str + ".f4.gz",
+                    file_name=grid.histogram_file_name(
+                        idx=uid, fmt="sparse"
+                    ),
                     file_bytes=grid.histogram_to_bytes(
-                        grid_result["histogram"]
+                        grid_result["histogram"], fmt="sparse"
                     ),
                 )
 
@@ -539,20 +647,36 @@ def _run_corsika_and_grid_and_output_to_tmp_dir(
             grhi["underflow_x"] = grid_result["underflow_x"]
             grhi["overflow_y"] = grid_result["overflow_y"]
             grhi["underflow_y"] = grid_result["underflow_y"]
-            tabrec["grid"].append(grhi)
+            grhi["num_reuses"] = len(grid_result["random_choices"])
 
             # cherenkov statistics
             # --------------------
             if cherenkov_bunches.shape[0] > 0:
-                fase = ide.copy()
+                fase = tabrec["cherenkovpool"].new_row(idx=uid)
                 fase = _append_bunch_statistics(
                     airshower_dict=fase, cherenkov_bunches=cherenkov_bunches
                 )
-                tabrec["cherenkovpool"].append(fase)
 
-            reuse_event = grid_result["random_choice"]
-            if reuse_event is not None:
+            grid_rois = utils.copy_square_selections_from_2D_array(
+                img=grid_result["histogram"],
+                ixs=[rc["bin_idx_x"] for rc in grid_result["random_choices"]],
+                iys=[rc["bin_idx_y"] for rc in grid_result["random_choices"]],
+                r=outer_telescope_array.NUM_BINS_RADIUS,
+                fill=np.nan,
+            )
+
+            for reuse_id, reuse_event in enumerate(
+                grid_result["random_choices"]
+            ):
+                reuse_event_id = unique.make_reuse_event_id(
+                    event_id=event_id, reuse_id=reuse_id
+                )
+                reuse_uid = unique.make_uid(
+                    run_id=run_id, event_id=reuse_event_id
+                )
+
                 reuse_evth = corsika_evth.copy()
+                reuse_evth[cpw.I.EVTH.EVENT_NUMBER] = reuse_event_id
                 reuse_evth[cpw.I.EVTH.NUM_REUSES_OF_CHERENKOV_EVENT] = 1.0
                 reuse_evth[cpw.I.EVTH.X_CORE_CM(reuse=1)] = (
                     cpw.M2CM * reuse_event["core_x_m"]
@@ -564,37 +688,29 @@ def _run_corsika_and_grid_and_output_to_tmp_dir(
                 evttar.write_evth(evth=reuse_evth)
                 evttar.write_bunches(bunches=reuse_event["cherenkov_bunches"])
 
-                crszp = ide.copy()
-                crszp = _append_bunch_ssize(
-                    crszp, reuse_event["cherenkov_bunches"]
+                assert reuse_event["cherenkov_bunches"].shape[0] > 0
+                reuse_stats = bunch_statistics.statistics(
+                    cherenkov_bunches=reuse_event["cherenkov_bunches"]
                 )
-                tabrec["cherenkovsizepart"].append(crszp)
-                rase = ide.copy()
-                rase = _append_bunch_statistics(
-                    airshower_dict=rase,
-                    cherenkov_bunches=reuse_event["cherenkov_bunches"],
+                _set_columns(
+                    row=tabrec["cherenkovsizepart"].new_row(idx=reuse_uid),
+                    record=reuse_stats,
+                    level_key="cherenkovsizepart",
                 )
-                tabrec["cherenkovpoolpart"].append(rase)
-                rcor = ide.copy()
+                _set_columns(
+                    row=tabrec["cherenkovpoolpart"].new_row(idx=reuse_uid),
+                    record=reuse_stats,
+                    level_key="cherenkovpoolpart",
+                )
+                rcor = tabrec["core"].new_row(idx=reuse_uid)
                 rcor["bin_idx_x"] = reuse_event["bin_idx_x"]
                 rcor["bin_idx_y"] = reuse_event["bin_idx_y"]
                 rcor["core_x_m"] = reuse_event["core_x_m"]
                 rcor["core_y_m"] = reuse_event["core_y_m"]
-                tabrec["core"].append(rcor)
 
-                utils.tar_append(
-                    tarout=imgroitar,
-                    file_name=uid_str + ".f4.gz",
-                    file_bytes=grid.histogram_to_bytes(
-                        utils.copy_square_selection_from_2D_array(
-                            img=grid_result["histogram"],
-                            ix=reuse_event["bin_idx_x"],
-                            iy=reuse_event["bin_idx_y"],
-                            r=outer_telescope_array.NUM_BINS_RADIUS,
-                            fill=np.nan,
-                        )
-                    ),
-                )
+                grid_roi_buffer.append(idx=reuse_uid, img=grid_rois[reuse_id])
+
+    grid_roi_buffer.write(path=op.join(tmp_dir, "grid_roi"))
 
     nfs.copy(
         op.join(tmp_dir, "corsika.stdout"),
@@ -613,6 +729,17 @@ def _run_corsika_and_grid_and_output_to_tmp_dir(
     return cherenkov_pools_path, tabrec
 
 
+def _copy_merlict_logs(job, tmp_dir):
+    nfs.copy(
+        op.join(tmp_dir, "merlict.stdout"),
+        op.join(job["log_dir"], _run_id_str(job) + "_merlict.stdout"),
+    )
+    nfs.copy(
+        op.join(tmp_dir, "merlict.stderr"),
+        op.join(job["log_dir"], _run_id_str(job) + "_merlict.stderr"),
+    )
+
+
 def _run_merlict(job, cherenkov_pools_path, tmp_dir):
     detector_responses_path = op.join(tmp_dir, "detector_responses")
     if not op.exists(detector_responses_path):
@@ -631,19 +758,58 @@ def _run_merlict(job, cherenkov_pools_path, tmp_dir):
             stdout_path=op.join(tmp_dir, "merlict.stdout"),
             stderr_path=op.join(tmp_dir, "merlict.stderr"),
         )
-        nfs.copy(
-            op.join(tmp_dir, "merlict.stdout"),
-            op.join(job["log_dir"], _run_id_str(job) + "_merlict.stdout"),
-        )
-        nfs.copy(
-            op.join(tmp_dir, "merlict.stderr"),
-            op.join(job["log_dir"], _run_id_str(job) + "_merlict.stderr"),
-        )
+        _copy_merlict_logs(job=job, tmp_dir=tmp_dir)
         assert merlict_rc == 0
 
     return detector_responses_path
 
 
+def _run_corsika_and_grid_and_merlict_streaming(
+    job, prng, tmp_dir, corsika_primary_steering, tabrec, logger,
+):
+    """
+    The grid writes the reused air-showers into a named pipe (FIFO) which
+    merlict reads from. So CORSIKA and the grid run while merlict
+    propagates the previous air-showers, and no cherenkov_pools.tar is
+    written to the disk.
+    """
+    detector_responses_path = op.join(tmp_dir, "detector_responses")
+    assert not op.exists(detector_responses_path)
+
+    with production.merlict.PlenoscopePropagatorFifo(
+        fifo_path=op.join(tmp_dir, "cherenkov_pools.fifo"),
+        output_path=detector_responses_path,
+        light_field_geometry_path=job["light_field_geometry_path"],
+        merlict_plenoscope_propagator_path=job[
+            "merlict_plenoscope_propagator_path"
+        ],
+        merlict_plenoscope_propagator_config_path=job[
+            "merlict_plenoscope_propagator_config_path"
+        ],
+        random_seed=job["run_id"],
+        photon_origins=True,
+        stdout_path=op.join(tmp_dir, "merlict.stdout"),
+        stderr_path=op.join(tmp_dir, "merlict.stderr"),
+    ) as merlict_run:
+        with runtime.Stage(logger, "corsika_and_grid") as stage:
+            _, tabrec = _run_corsika_and_grid_and_output_to_tmp_dir(
+                job=job,
+                prng=prng,
+                tmp_dir=tmp_dir,
+                corsika_primary_steering=corsika_primary_steering,
+                tabrec=tabrec,
+                cherenkov_pools_path=merlict_run.fifo_path,
+            )
+            _count_showers_and_reuses(stage=stage, tabrec=tabrec)
+        with runtime.Stage(logger, "merlict") as stage:
+            merlict_rc = merlict_run.wait()
+            stage.count("num_events", len(tabrec["core"]))
+
+    _copy_merlict_logs(job=job, tmp_dir=tmp_dir)
+    assert merlict_rc == 0
+    return detector_responses_path, tabrec
+
+
 def _run_loose_trigger(
     job,
     tabrec,
@@ -652,8 +818,13 @@ def _run_loose_trigger(
     trigger_geometry,
     tmp_dir,
 ):
-    # loop over sensor responses
-    # --------------------------
+    """
+    Estimates the loose sum-trigger of all events in the merlict-run.
+    The trigger-responses are collected in columns and written once for
+    the run into tmp_dir/trigger_responses, see trigger_responses.Reader.
+    The trigger-table and the pasttrigger-table are made from the columns
+    after all events are estimated.
+    """
     merlict_run = pl.Run(detector_responses_path)
     table_past_trigger = []
     tmp_past_trigger_dir = op.join(tmp_dir, "past_trigger")
@@ -661,18 +832,19 @@ def _run_loose_trigger(
     RAW_SKIP = int(job["raw_sensor_response"]["skip_num_events"])
     assert RAW_SKIP > 0
 
+    run_trigger = trigger_responses.RunTriggerResponses(
+        capacity=max([1, len(tabrec["core"])])
+    )
+    num_cherenkov_pe = []
+    event_paths = []
+
     for event in merlict_run:
-        # id
-        # --
         cevth = event.simulation_truth.event.corsika_event_header.raw
         run_id = int(cevth[cpw.I.EVTH.RUN_NUMBER])
         event_id = int(cevth[cpw.I.EVTH.EVENT_NUMBER])
-        ide = {spt.IDX: unique.make_uid(run_id=run_id, event_id=event_id)}
 
-        # apply loose trigger
-        # -------------------
         (
-            trigger_responses,
+            trigger_response,
             max_response_in_focus_vs_timeslices,
         ) = pl.trigger.estimate.first_stage(
             raw_sensor_response=event.raw_sensor_response,
@@ -682,233 +854,371 @@ def _run_loose_trigger(
                 job["sum_trigger"]["integration_time_slices"]
             ),
         )
-
-        trg_resp_path = op.join(event._path, "refocus_sum_trigger.json")
-        with open(trg_resp_path, "wt") as f:
-            f.write(json_numpy.dumps(trigger_responses, indent=4))
-
-        trg_maxr_path = op.join(
-            event._path, "refocus_sum_trigger.focii_x_time_slices.uint32"
+        run_trigger.append(
+            uid=unique.make_uid(run_id=run_id, event_id=event_id),
+            trigger_response=trigger_response,
+            max_response_in_focus_vs_timeslices=(
+                max_response_in_focus_vs_timeslices
+            ),
         )
-        with open(trg_maxr_path, "wb") as f:
-            f.write(max_response_in_focus_vs_timeslices.tobytes())
-
-        # export trigger-truth
-        # --------------------
-        trgtru = ide.copy()
-        trgtru["num_cherenkov_pe"] = int(
+        num_cherenkov_pe.append(
             event.simulation_truth.detector.number_air_shower_pulses()
         )
-        trgtru["response_pe"] = int(
-            np.max([focus["response_pe"] for focus in trigger_responses])
-        )
-        for o in range(len(trigger_responses)):
-            trgtru["focus_{:02d}_response_pe".format(o)] = int(
-                trigger_responses[o]["response_pe"]
-            )
-        tabrec["trigger"].append(trgtru)
-
-        # passing loose trigger
-        # ---------------------
-        if trgtru["response_pe"] >= job["sum_trigger"]["threshold_pe"]:
-            ptp = ide.copy()
-            ptp["tmp_path"] = event._path
-            ptp["unique_id_str"] = unique.UID_FOTMAT_STR.format(ptp[spt.IDX])
-            table_past_trigger.append(ptp)
-
-            ptrg = ide.copy()
-            tabrec["pasttrigger"].append(ptrg)
-
-            # export past loose trigger
-            # -------------------------
-            if ide[spt.IDX] % RAW_SKIP == 0:
-                pl.tools.acp_format.compress_event_in_place(ptp["tmp_path"])
-                final_tarname = ptp["unique_id_str"] + ".tar"
-                plenoscope_event_dir_to_tar(
-                    event_dir=ptp["tmp_path"],
-                    output_tar_path=op.join(
-                        tmp_past_trigger_dir, final_tarname
-                    ),
-                )
-                nfs.copy(
-                    src=op.join(tmp_past_trigger_dir, final_tarname),
-                    dst=op.join(job["past_trigger_dir"], final_tarname),
-                )
+        event_paths.append(event._path)
 
-    return tabrec, table_past_trigger, tmp_past_trigger_dir
+    if len(run_trigger) == 0:
+        return tabrec, table_past_trigger, tmp_past_trigger_dir
 
+    trigger_responses.write(
+        path=op.join(tmp_dir, "trigger_responses"),
+        run_trigger_responses=run_trigger,
+    )
 
-def _classify_cherenkov_photons(
-    job,
-    tabrec,
-    tmp_dir,
-    table_past_trigger,
-    light_field_geometry,
-    trigger_geometry,
-):
-    roi_cfg = job["cherenkov_classification"]["region_of_interest"]
-    dbscan_cfg = job["cherenkov_classification"]
+    # export trigger-truth
+    # --------------------
+    uids = run_trigger.idx[0 : len(run_trigger)]
+    focus_response_pe = run_trigger.response_pe()
+    trgtru = {
+        spt.IDX: uids,
+        "num_cherenkov_pe": np.array(num_cherenkov_pe, dtype=np.int64),
+        "response_pe": np.max(focus_response_pe, axis=1),
+    }
+    for o in range(focus_response_pe.shape[1]):
+        trgtru["focus_{:02d}_response_pe".format(o)] = focus_response_pe[:, o]
+    tabrec["trigger"].extend_columns(trgtru)
 
-    with pl.photon_stream.loph.LopfTarWriter(
-        path=os.path.join(tmp_dir, "reconstructed_cherenkov.tar"),
-        uid_num_digits=unique.UID_NUM_DIGITS,
-    ) as cer_phs_run:
-        for ptp in table_past_trigger:
-            event = pl.Event(
-                path=ptp["tmp_path"], light_field_geometry=light_field_geometry
-            )
-            trigger_responses = pl.trigger.io.read_trigger_response_from_path(
-                path=os.path.join(event._path, "refocus_sum_trigger.json")
-            )
-            roi = pl.trigger.region_of_interest.from_trigger_response(
-                trigger_response=trigger_responses,
-                trigger_geometry=trigger_geometry,
-                time_slice_duration=event.raw_sensor_response.time_slice_duration,
-            )
-            photons = pl.classify.RawPhotons.from_event(event)
-            (
-                cherenkov_photons,
-                roi_settings,
-            ) = pl.classify.cherenkov_photons_in_roi_in_image(
-                roi=roi,
-                photons=photons,
-                roi_time_offset_start=roi_cfg["time_offset_start_s"],
-                roi_time_offset_stop=roi_cfg["time_offset_stop_s"],
-                roi_cx_cy_radius=np.deg2rad(roi_cfg["direction_radius_deg"]),
-                roi_object_distance_offsets=roi_cfg[
-                    "object_distance_offsets_m"
-                ],
-                dbscan_epsilon_cx_cy_radius=np.deg2rad(
-                    dbscan_cfg["neighborhood_radius_deg"]
+    # passing loose trigger
+    # ---------------------
+    passed = trgtru["response_pe"] >= job["sum_trigger"]["threshold_pe"]
+    tabrec["pasttrigger"].extend_columns({spt.IDX: uids[passed]})
+
+    for i in np.flatnonzero(passed):
+        ptp = {spt.IDX: int(uids[i])}
+        ptp["tmp_path"] = event_paths[i]
+        ptp["unique_id_str"] = unique.UID_FOTMAT_STR.format(ptp[spt.IDX])
+        table_past_trigger.append(ptp)
+
+        # export past loose trigger
+        # -------------------------
+        if ptp[spt.IDX] % RAW_SKIP == 0:
+            _write_trigger_response_to_event_dir(
+                event_dir=ptp["tmp_path"],
+                trigger_response=trigger_responses.to_trigger_response(
+                    run_trigger.responses[i]
                 ),
-                dbscan_min_number_photons=dbscan_cfg["min_num_photons"],
-                dbscan_deg_over_s=dbscan_cfg[
-                    "direction_to_time_mixing_deg_per_s"
+                max_response_in_focus_vs_timeslices=run_trigger.max_response[
+                    i
                 ],
             )
-            pl.classify.write_dense_photon_ids_to_event(
-                event_path=op.abspath(event._path),
-                photon_ids=cherenkov_photons.photon_ids,
-                settings=roi_settings,
-            )
-            crcl = pl.classify.benchmark(
-                pulse_origins=event.simulation_truth.detector.pulse_origins,
-                photon_ids_cherenkov=cherenkov_photons.photon_ids,
+            pl.tools.acp_format.compress_event_in_place(ptp["tmp_path"])
+            final_tarname = ptp["unique_id_str"] + ".tar"
+            plenoscope_event_dir_to_tar(
+                event_dir=ptp["tmp_path"],
+                output_tar_path=op.join(tmp_past_trigger_dir, final_tarname),
             )
-            crcl[spt.IDX] = ptp[spt.IDX]
-            tabrec["cherenkovclassification"].append(crcl)
-
-            # export reconstructed Cherenkov photons
-            # --------------------------------------
-            cer_phs = pl.photon_stream.loph.raw_sensor_response_to_photon_stream_in_loph_repr(
-                raw_sensor_response=event.raw_sensor_response,
-                cherenkov_photon_ids=cherenkov_photons.photon_ids,
+            nfs.copy(
+                src=op.join(tmp_past_trigger_dir, final_tarname),
+                dst=op.join(job["past_trigger_dir"], final_tarname),
             )
-            cer_phs_run.add(uid=ptp[spt.IDX], phs=cer_phs)
 
-    nfs.copy(
-        src=op.join(tmp_dir, "reconstructed_cherenkov.tar"),
-        dst=op.join(
-            job["past_trigger_reconstructed_cherenkov_dir"],
-            _run_id_str(job=job) + "_reconstructed_cherenkov.tar",
-        ),
-    )
-    return tabrec
+    return tabrec, table_past_trigger, tmp_past_trigger_dir
 
 
-def _extract_features(
-    tabrec, light_field_geometry, table_past_trigger, prng,
+def _write_trigger_response_to_event_dir(
+    event_dir, trigger_response, max_response_in_focus_vs_timeslices
 ):
-    light_field_geometry_addon = pl.features.make_light_field_geometry_addon(
-        light_field_geometry=light_field_geometry
+    """
+    The exported events keep their trigger-response in the event's
+    directory.
+    """
+    with open(op.join(event_dir, "refocus_sum_trigger.json"), "wt") as f:
+        f.write(json_numpy.dumps(trigger_response, indent=4))
+    trg_maxr_path = op.join(
+        event_dir, "refocus_sum_trigger.focii_x_time_slices.uint32"
     )
+    with open(trg_maxr_path, "wb") as f:
+        f.write(max_response_in_focus_vs_timeslices.tobytes())
 
-    for pt in table_past_trigger:
-        event = pl.Event(
-            path=pt["tmp_path"], light_field_geometry=light_field_geometry
-        )
-        try:
-            lfft = pl.features.extract_features(
-                cherenkov_photons=event.cherenkov_photons,
-                light_field_geometry=light_field_geometry,
-                light_field_geometry_addon=light_field_geometry_addon,
-                prng=prng,
-            )
-            lfft[spt.IDX] = pt[spt.IDX]
-            tabrec["features"].append(lfft)
-        except Exception as excep:
-            print("idx:", pt[spt.IDX], excep)
 
-    return tabrec
+def _classify_cherenkov_photons_of_event(
+    job, event, trigger_response, trigger_geometry
+):
+    roi_cfg = job["cherenkov_classification"]["region_of_interest"]
+    dbscan_cfg = job["cherenkov_classification"]
+
+    roi = pl.trigger.region_of_interest.from_trigger_response(
+        trigger_response=trigger_response,
+        trigger_geometry=trigger_geometry,
+        time_slice_duration=event.raw_sensor_response.time_slice_duration,
+    )
+    photons = pl.classify.RawPhotons.from_event(event)
+    (
+        cherenkov_photons,
+        roi_settings,
+    ) = pl.classify.cherenkov_photons_in_roi_in_image(
+        roi=roi,
+        photons=photons,
+        roi_time_offset_start=roi_cfg["time_offset_start_s"],
+        roi_time_offset_stop=roi_cfg["time_offset_stop_s"],
+        roi_cx_cy_radius=np.deg2rad(roi_cfg["direction_radius_deg"]),
+        roi_object_distance_offsets=roi_cfg["object_distance_offsets_m"],
+        dbscan_epsilon_cx_cy_radius=np.deg2rad(
+            dbscan_cfg["neighborhood_radius_deg"]
+        ),
+        dbscan_min_number_photons=dbscan_cfg["min_num_photons"],
+        dbscan_deg_over_s=dbscan_cfg["direction_to_time_mixing_deg_per_s"],
+    )
+    pl.classify.write_dense_photon_ids_to_event(
+        event_path=op.abspath(event._path),
+        photon_ids=cherenkov_photons.photon_ids,
+        settings=roi_settings,
+    )
+    crcl = pl.classify.benchmark(
+        pulse_origins=event.simulation_truth.detector.pulse_origins,
+        photon_ids_cherenkov=cherenkov_photons.photon_ids,
+    )
+    return cherenkov_photons, crcl
+
 
+def _compile_trajectory_config(job):
+    return {
+        "fuzzy": gamrec.trajectory.v2020nov12fuzzy0.config.compile_user_config(
+            user_config=job["reconstruction"]["trajectory"]["fuzzy_method"]
+        ),
+        "model_fit": gamrec.trajectory.v2020dec04iron0b.config.compile_user_config(
+            user_config=job["reconstruction"]["trajectory"]["core_axis_fit"]
+        ),
+    }
 
-def _estimate_primary_trajectory(job, tmp_dir, light_field_geometry, tabrec):
 
-    FUZZY_CONFIG = gamrec.trajectory.v2020nov12fuzzy0.config.compile_user_config(
-        user_config=job["reconstruction"]["trajectory"]["fuzzy_method"]
+def _estimate_primary_trajectory_of_event(
+    uid,
+    loph_record,
+    light_field_geometry,
+    shower_maximum_object_distance,
+    trajectory_config,
+):
+    estimate, debug = gamrec.trajectory.v2020dec04iron0b.estimate(
+        loph_record=loph_record,
+        light_field_geometry=light_field_geometry,
+        shower_maximum_object_distance=shower_maximum_object_distance,
+        fuzzy_config=trajectory_config["fuzzy"],
+        model_fit_config=trajectory_config["model_fit"],
     )
-    MODEL_FIT_CONFIG = gamrec.trajectory.v2020dec04iron0b.config.compile_user_config(
-        user_config=job["reconstruction"]["trajectory"]["core_axis_fit"]
+
+    if not gamrec.trajectory.v2020dec04iron0b.is_valid_estimate(
+        estimate=estimate
+    ):
+        return None
+
+    rec = {}
+    rec[spt.IDX] = uid
+
+    rec["cx_rad"] = estimate["primary_particle_cx"]
+    rec["cy_rad"] = estimate["primary_particle_cy"]
+    rec["x_m"] = estimate["primary_particle_x"]
+    rec["y_m"] = estimate["primary_particle_y"]
+
+    fuzzy_result = debug["fuzzy_result"]
+    rec["fuzzy_cx_rad"] = fuzzy_result["reco_cx"]
+    rec["fuzzy_cy_rad"] = fuzzy_result["reco_cy"]
+    rec["fuzzy_main_axis_support_cx_rad"] = fuzzy_result[
+        "main_axis_support_cx"
+    ]
+    rec["fuzzy_main_axis_support_cy_rad"] = fuzzy_result[
+        "main_axis_support_cy"
+    ]
+    rec["fuzzy_main_axis_support_uncertainty_rad"] = fuzzy_result[
+        "main_axis_support_uncertainty"
+    ]
+    rec["fuzzy_main_axis_azimuth_rad"] = fuzzy_result["main_axis_azimuth"]
+    rec["fuzzy_main_axis_azimuth_uncertainty_rad"] = fuzzy_result[
+        "main_axis_azimuth_uncertainty"
+    ]
+    return rec
+
+
+TRAJECTORY_CHUNK_SIZE = 16
+_trajectory_worker = {}
+
+
+def _init_trajectory_worker(light_field_geometry, trajectory_config):
+    _trajectory_worker["light_field_geometry"] = light_field_geometry
+    _trajectory_worker["trajectory_config"] = trajectory_config
+
+
+def _run_trajectory_task(task):
+    uid, loph_record, shower_maximum_object_distance = task
+    return _estimate_primary_trajectory_of_event(
+        uid=uid,
+        loph_record=loph_record,
+        light_field_geometry=_trajectory_worker["light_field_geometry"],
+        shower_maximum_object_distance=shower_maximum_object_distance,
+        trajectory_config=_trajectory_worker["trajectory_config"],
     )
 
-    _feature_table = spt.table_of_records_to_sparse_numeric_table(
-        table_records={"features": tabrec["features"]},
-        structure={"features": table.STRUCTURE["features"]},
+
+def _estimate_primary_trajectories(
+    tasks,
+    light_field_geometry,
+    trajectory_config,
+    num_workers=1,
+    chunk_size=TRAJECTORY_CHUNK_SIZE,
+):
+    """
+    Returns the records of the valid trajectories, sorted by uid.
+
+    Parameters
+    ----------
+    tasks : list of tuples
+        (uid, loph_record, shower_maximum_object_distance) of each event.
+    num_workers : int
+        When > 1, the events are estimated in chunks by a pool of forked
+        worker-processes which share the light_field_geometry with this
+        process. A process of a multiprocessing.Pool can not have children,
+        so there the events are estimated in this process.
+    """
+    tasks = sorted(tasks, key=lambda task: task[0])
+    _init_trajectory_worker(
+        light_field_geometry=light_field_geometry,
+        trajectory_config=trajectory_config,
     )
-    shower_maximum_object_distance = spt.get_column_as_dict_by_index(
-        table=_feature_table,
-        level_key="features",
-        column_key="image_smallest_ellipse_object_distance",
+    use_pool = (
+        num_workers > 1
+        and len(tasks) > chunk_size
+        and not multiprocessing.current_process().daemon
     )
+    if use_pool:
+        ctx = multiprocessing.get_context("fork")
+        pool = ctx.Pool(processes=num_workers)
+        try:
+            recs = pool.map(_run_trajectory_task, tasks, chunksize=chunk_size)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        recs = [_run_trajectory_task(task) for task in tasks]
+    return [rec for rec in recs if rec is not None]
+
 
-    run = pl.photon_stream.loph.LopfTarReader(
-        op.join(tmp_dir, "reconstructed_cherenkov.tar")
+def _run_post_trigger(
+    job,
+    tabrec,
+    tmp_dir,
+    table_past_trigger,
+    light_field_geometry,
+    trigger_geometry,
+    prng,
+    logger,
+):
+    """
+    For each event past the loose trigger: Classify the Cherenkov-photons,
+    export them in the loph-format, extract the features, and estimate the
+    primary's trajectory. Each event is read only once from the disk, the
+    steps after the classification use the event in memory. The
+    trajectories are estimated after all events were classified, see
+    _estimate_primary_trajectories.
+
+    The time of each step is accumulated over all events and logged as
+    the stages classify_cherenkov, extract_features, and
+    estimate_primary_trajectory.
+    """
+    light_field_geometry_addon = pl.features.make_light_field_geometry_addon(
+        light_field_geometry=light_field_geometry
     )
-    for event in run:
-        uid, loph_record = event
+    trajectory_config = _compile_trajectory_config(job=job)
+    if len(table_past_trigger) > 0:
+        run_trigger = trigger_responses.Reader(
+            path=op.join(tmp_dir, "trigger_responses")
+        )
 
-        if uid in shower_maximum_object_distance:
-            estimate, debug = gamrec.trajectory.v2020dec04iron0b.estimate(
-                loph_record=loph_record,
-                light_field_geometry=light_field_geometry,
-                shower_maximum_object_distance=shower_maximum_object_distance[
-                    uid
-                ],
-                fuzzy_config=FUZZY_CONFIG,
-                model_fit_config=MODEL_FIT_CONFIG,
+    classify_stage = runtime.AccumulatedStage(logger, "classify_cherenkov")
+    features_stage = runtime.AccumulatedStage(logger, "extract_features")
+    trajectory_stage = runtime.AccumulatedStage(
+        logger, "estimate_primary_trajectory"
+    )
+    trajectory_tasks = []
+
+    with pl.photon_stream.loph.LopfTarWriter(
+        path=os.path.join(tmp_dir, "reconstructed_cherenkov.tar"),
+        uid_num_digits=unique.UID_NUM_DIGITS,
+    ) as cer_phs_run:
+        for ptp in table_past_trigger:
+            uid = ptp[spt.IDX]
+
+            with classify_stage:
+                event = pl.Event(
+                    path=ptp["tmp_path"],
+                    light_field_geometry=light_field_geometry,
+                )
+                (
+                    cherenkov_photons,
+                    crcl,
+                ) = _classify_cherenkov_photons_of_event(
+                    job=job,
+                    event=event,
+                    trigger_response=run_trigger.trigger_response(uid),
+                    trigger_geometry=trigger_geometry,
+                )
+                crcl[spt.IDX] = uid
+                tabrec["cherenkovclassification"].append(crcl)
+
+                # export reconstructed Cherenkov photons
+                # --------------------------------------
+                cer_phs = pl.photon_stream.loph.raw_sensor_response_to_photon_stream_in_loph_repr(
+                    raw_sensor_response=event.raw_sensor_response,
+                    cherenkov_photon_ids=cherenkov_photons.photon_ids,
+                )
+                cer_phs_run.add(uid=uid, phs=cer_phs)
+
+            with features_stage:
+                try:
+                    lfft = pl.features.extract_features(
+                        cherenkov_photons=cherenkov_photons,
+                        light_field_geometry=light_field_geometry,
+                        light_field_geometry_addon=light_field_geometry_addon,
+                        prng=prng,
+                    )
+                    lfft[spt.IDX] = uid
+                    tabrec["features"].append(lfft)
+                except Exception as excep:
+                    print("idx:", uid, excep)
+                    continue
+
+            trajectory_tasks.append(
+                (uid, cer_phs, lfft["image_smallest_ellipse_object_distance"])
             )
 
-            if gamrec.trajectory.v2020dec04iron0b.is_valid_estimate(
-                estimate=estimate
-            ):
-                rec = {}
-                rec[spt.IDX] = uid
-
-                rec["cx_rad"] = estimate["primary_particle_cx"]
-                rec["cy_rad"] = estimate["primary_particle_cy"]
-                rec["x_m"] = estimate["primary_particle_x"]
-                rec["y_m"] = estimate["primary_particle_y"]
-
-                rec["fuzzy_cx_rad"] = debug["fuzzy_result"]["reco_cx"]
-                rec["fuzzy_cy_rad"] = debug["fuzzy_result"]["reco_cy"]
-                rec["fuzzy_main_axis_support_cx_rad"] = debug["fuzzy_result"][
-                    "main_axis_support_cx"
-                ]
-                rec["fuzzy_main_axis_support_cy_rad"] = debug["fuzzy_result"][
-                    "main_axis_support_cy"
-                ]
-                rec["fuzzy_main_axis_support_uncertainty_rad"] = debug[
-                    "fuzzy_result"
-                ]["main_axis_support_uncertainty"]
-                rec["fuzzy_main_axis_azimuth_rad"] = debug["fuzzy_result"][
-                    "main_axis_azimuth"
-                ]
-                rec["fuzzy_main_axis_azimuth_uncertainty_rad"] = debug[
-                    "fuzzy_result"
-                ]["main_axis_azimuth_uncertainty"]
-
-                tabrec["reconstructed_trajectory"].append(rec)
+    with trajectory_stage:
+        for rec in _estimate_primary_trajectories(
+            tasks=trajectory_tasks,
+            light_field_geometry=light_field_geometry,
+            trajectory_config=trajectory_config,
+            num_workers=job["num_trajectory_workers"],
+        ):
+            tabrec["reconstructed_trajectory"].append(rec)
+
+    classify_stage.count("num_events", len(table_past_trigger))
+    classify_stage.count(
+        "num_classified", len(tabrec["cherenkovclassification"])
+    )
+    features_stage.count("num_events", len(table_past_trigger))
+    features_stage.count("num_features", len(tabrec["features"]))
+    trajectory_stage.count("num_events", len(tabrec["features"]))
+    trajectory_stage.count(
+        "num_reconstructed", len(tabrec["reconstructed_trajectory"])
+    )
+    classify_stage.log()
+    features_stage.log()
+    trajectory_stage.log()
 
+    nfs.copy(
+        src=op.join(tmp_dir, "reconstructed_cherenkov.tar"),
+        dst=op.join(
+            job["past_trigger_reconstructed_cherenkov_dir"],
+            _run_id_str(job=job) + "_reconstructed_cherenkov.tar",
+        ),
+    )
     return tabrec
 
 
@@ -929,9 +1239,7 @@ def _make_output_dirs(job):
 
 
 def _export_event_table(job, tmp_dir, tabrec):
-    event_table = spt.table_of_records_to_sparse_numeric_table(
-        table_records=tabrec, structure=table.STRUCTURE
-    )
+    event_table = table_records.to_sparse_numeric_table(tabrec)
     spt.write(
         path=op.join(tmp_dir, "event_table.tar"),
         table=event_table,
@@ -946,22 +1254,22 @@ def _export_event_table(job, tmp_dir, tabrec):
 def _export_grid_region_of_interest_if_passed_loose_trigger(
     job, tabrec, tmp_dir
 ):
-    pasttrigger_set = set(
-        [record[spt.IDX] for record in tabrec["pasttrigger"]]
+    """
+    Writes the region-of-interest of the grid of each event which passed
+    the loose trigger. The regions-of-interest of all events are in the
+    buffer written by _run_corsika_and_grid_and_output_to_tmp_dir.
+    """
+    idx, rois = grid.read_dense_histogram_buffer(
+        path=op.join(tmp_dir, "grid_roi")
     )
+    passed = np.isin(idx, tabrec["pasttrigger"].column(spt.IDX))
 
-    ipath = op.join(tmp_dir, "grid_roi.tar")
-    opath = op.join(tmp_dir, "grid_roi_pasttrigger.tar")
+    grid_histograms = {}
+    for i in np.flatnonzero(passed):
+        grid_histograms[int(idx[i])] = grid.histogram_to_bytes(rois[i])
 
-    with tarfile.open(ipath, "r") as itar, tarfile.open(opath, "w") as otar:
-        for tarinfo in itar:
-            idx = int(tarinfo.name[0 : unique.UID_NUM_DIGITS])
-            if idx in pasttrigger_set:
-                bimg = itar.extractfile(tarinfo).read()
-                filename = unique.UID_FOTMAT_STR.format(idx) + ".f4.gz"
-                utils.tar_append(
-                    tarout=otar, file_name=filename, file_bytes=bimg,
-                )
+    opath = op.join(tmp_dir, "grid_roi_pasttrigger.tar")
+    grid.write_histograms(path=opath, grid_histograms=grid_histograms)
     nfs.copy(
         src=opath,
         dst=op.join(
@@ -970,11 +1278,107 @@ def _export_grid_region_of_interest_if_passed_loose_trigger(
     )
 
 
-def _init_table_records():
-    tabrec = {}
-    for level_key in table.STRUCTURE:
-        tabrec[level_key] = []
-    return tabrec
+# checkpoints
+# -----------
+# When a stage in run_job is done, its part of tabrec, and the state of the
+# prng are written into tmp_dir/checkpoint/. A job which is run again in the
+# same tmp_dir resumes after the last completed stage with identical prng.
+# This requires a tmp_dir which survives the worker, i.e. job["tmp_dir"] is
+# not None. Checkpoints of a different job in the same tmp_dir are removed.
+
+CHECKPOINT_TABREC_LEVELS = {
+    "corsika_and_grid": [
+        "primary",
+        "cherenkovsize",
+        "grid",
+        "cherenkovpool",
+        "cherenkovsizepart",
+        "cherenkovpoolpart",
+        "core",
+    ],
+    "merlict": [],
+    "pass_loose_trigger": ["trigger", "pasttrigger"],
+    "post_trigger": [
+        "cherenkovclassification",
+        "features",
+        "reconstructed_trajectory",
+    ],
+}
+
+
+# Keys of the job which do not change the results of its stages. They
+# differ each time a production is submitted.
+CHECKPOINT_IGNORED_JOB_KEYS = ["date", "num_trajectory_workers"]
+
+
+def _init_checkpoint_dir(job, tmp_dir):
+    checkpoint_dir = op.join(tmp_dir, "checkpoint")
+    job_path = op.join(checkpoint_dir, "job.json")
+    job_str = json_numpy.dumps(
+        {k: job[k] for k in job if k not in CHECKPOINT_IGNORED_JOB_KEYS},
+        indent=4,
+    )
+    if op.exists(job_path):
+        with open(job_path, "rt") as f:
+            if f.read() != job_str:
+                shutil.rmtree(checkpoint_dir)
+    if not op.exists(job_path):
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        with open(job_path + ".tmp", "wt") as f:
+            f.write(job_str)
+        shutil.move(job_path + ".tmp", job_path)
+    return checkpoint_dir
+
+
+def _write_checkpoint(checkpoint_dir, stage_key, tabrec, prng, payload=None):
+    checkpoint = {
+        "tabrec": {},
+        "prng_state": prng.bit_generator.state,
+        "payload": payload,
+    }
+    for level_key in CHECKPOINT_TABREC_LEVELS[stage_key]:
+        checkpoint["tabrec"][level_key] = tabrec[level_key].to_columns()
+    path = op.join(checkpoint_dir, stage_key + ".json")
+    with open(path + ".tmp", "wt") as f:
+        f.write(json_numpy.dumps(checkpoint))
+    shutil.move(path + ".tmp", path)
+    with open(op.join(checkpoint_dir, stage_key + ".complete"), "wt") as f:
+        f.write("")
+
+
+def _resume_checkpoint(checkpoint_dir, stage_key, tabrec, prng, logger):
+    """
+    Returns (True, payload) when the stage is complete. Then tabrec, and
+    prng are set to the state after the stage.
+    Returns (False, None) when the stage needs to run.
+    """
+    if not op.exists(op.join(checkpoint_dir, stage_key + ".complete")):
+        return False, None
+    with open(op.join(checkpoint_dir, stage_key + ".json"), "rt") as f:
+        checkpoint = json_numpy.loads(f.read())
+    for level_key in CHECKPOINT_TABREC_LEVELS[stage_key]:
+        tabrec[level_key].clear()
+        tabrec[level_key].extend_columns(checkpoint["tabrec"][level_key])
+    prng.bit_generator.state = checkpoint["prng_state"]
+    logger.info("resume {:s} from checkpoint".format(stage_key))
+    return True, checkpoint["payload"]
+
+
+def _remove_incomplete(path):
+    if op.isdir(path):
+        shutil.rmtree(path)
+    elif op.exists(path):
+        os.remove(path)
+
+
+def _count_showers_and_reuses(stage, tabrec):
+    stage.count("num_events", len(tabrec["primary"]))
+    stage.count("num_showers", len(tabrec["primary"]))
+    stage.count("num_reuses", len(tabrec["core"]))
+
+
+def _init_table_records(capacity=table_records.INITIAL_CAPACITY):
+    return table_records.init(structure=table.STRUCTURE, capacity=capacity)
 
 
 def _export_job_to_log_dir(job):
@@ -996,15 +1400,20 @@ def run_job(job):
     logger.info("init prng")
     prng = np.random.Generator(np.random.MT19937(seed=job["run_id"]))
 
-    with jlogging.TimeDelta(logger, "draw_primary"):
-        corsika_primary_steering = production.corsika_primary.draw_corsika_primary_steering(
+    with runtime.Stage(logger, "draw_primary") as stage:
+        (
+            corsika_primary_steering,
+            _,
+        ) = production.corsika_primary.draw_corsika_primary_steering_batch(
             run_id=job["run_id"],
             site=job["site"],
             particle=job["particle"],
             site_particle_deflection=job["site_particle_deflection"],
             num_events=job["num_air_showers"],
             prng=prng,
+            prng_compatible=job["prng_compatible_primary_steering"],
         )
+        stage.count("num_events", job["num_air_showers"])
 
     if job["tmp_dir"] is None:
         tmp_dir = tempfile.mkdtemp(prefix="plenoscope_irf_")
@@ -1013,80 +1422,135 @@ def run_job(job):
         os.makedirs(tmp_dir, exist_ok=True)
     logger.info("make tmp_dir: {:s}".format(tmp_dir))
 
-    tabrec = _init_table_records()
+    tabrec = _init_table_records(capacity=job["num_air_showers"])
+    checkpoint_dir = _init_checkpoint_dir(job=job, tmp_dir=tmp_dir)
+    detector_responses_path = op.join(tmp_dir, "detector_responses")
+    cherenkov_pools_path = op.join(tmp_dir, "cherenkov_pools.tar")
 
-    with jlogging.TimeDelta(logger, "corsika_and_grid"):
-        (
-            cherenkov_pools_path,
-            tabrec,
-        ) = _run_corsika_and_grid_and_output_to_tmp_dir(
-            job=job,
-            prng=prng,
-            tmp_dir=tmp_dir,
-            corsika_primary_steering=corsika_primary_steering,
-            tabrec=tabrec,
+    if job["stream_cherenkov_pools"] and not job["keep_tmp"]:
+        done, _ = _resume_checkpoint(
+            checkpoint_dir, "merlict", tabrec, prng, logger
         )
-    with jlogging.TimeDelta(logger, "merlict"):
-        detector_responses_path = _run_merlict(
-            job=job,
-            cherenkov_pools_path=cherenkov_pools_path,
-            tmp_dir=tmp_dir,
+        if done:
+            _resume_checkpoint(
+                checkpoint_dir, "corsika_and_grid", tabrec, prng, logger
+            )
+        else:
+            logger.info("stream cherenkov-pools from grid to merlict")
+            _remove_incomplete(detector_responses_path)
+            (
+                detector_responses_path,
+                tabrec,
+            ) = _run_corsika_and_grid_and_merlict_streaming(
+                job=job,
+                prng=prng,
+                tmp_dir=tmp_dir,
+                corsika_primary_steering=corsika_primary_steering,
+                tabrec=tabrec,
+                logger=logger,
+            )
+            _write_checkpoint(checkpoint_dir, "corsika_and_grid", tabrec, prng)
+            _write_checkpoint(checkpoint_dir, "merlict", tabrec, prng)
+    else:
+        done, _ = _resume_checkpoint(
+            checkpoint_dir, "corsika_and_grid", tabrec, prng, logger
         )
+        if not done:
+            with runtime.Stage(logger, "corsika_and_grid") as stage:
+                (
+                    cherenkov_pools_path,
+                    tabrec,
+                ) = _run_corsika_and_grid_and_output_to_tmp_dir(
+                    job=job,
+                    prng=prng,
+                    tmp_dir=tmp_dir,
+                    corsika_primary_steering=corsika_primary_steering,
+                    tabrec=tabrec,
+                    cherenkov_pools_path=cherenkov_pools_path,
+                )
+                _count_showers_and_reuses(stage=stage, tabrec=tabrec)
+            _write_checkpoint(checkpoint_dir, "corsika_and_grid", tabrec, prng)
 
-    if not job["keep_tmp"]:
-        os.remove(cherenkov_pools_path)
+        done, _ = _resume_checkpoint(
+            checkpoint_dir, "merlict", tabrec, prng, logger
+        )
+        if not done:
+            _remove_incomplete(detector_responses_path)
+            with runtime.Stage(logger, "merlict") as stage:
+                detector_responses_path = _run_merlict(
+                    job=job,
+                    cherenkov_pools_path=cherenkov_pools_path,
+                    tmp_dir=tmp_dir,
+                )
+                stage.count("num_events", len(tabrec["core"]))
+            _write_checkpoint(checkpoint_dir, "merlict", tabrec, prng)
 
-    with jlogging.TimeDelta(logger, "read_geometry"):
-        light_field_geometry = pl.LightFieldGeometry(
-            path=job["light_field_geometry_path"]
+        if not job["keep_tmp"] and op.exists(cherenkov_pools_path):
+            os.remove(cherenkov_pools_path)
+
+    with runtime.Stage(logger, "read_geometry"):
+        scenery_path = op.join(job["plenoscope_scenery_path"], "scenery.json")
+        light_field_geometry = geometry_cache.read_light_field_geometry(
+            path=job["light_field_geometry_path"], write_if_invalid=False,
         )
-        trigger_geometry = pl.trigger.geometry.read(
-            path=job["trigger_geometry_path"]
+        trigger_geometry = geometry_cache.read_trigger_geometry(
+            path=job["trigger_geometry_path"],
+            scenery_path=scenery_path,
+            write_if_invalid=False,
         )
 
-    with jlogging.TimeDelta(logger, "pass_loose_trigger"):
-        tabrec, table_past_trigger, tmp_past_trigger_dir = _run_loose_trigger(
-            job=job,
-            tabrec=tabrec,
-            detector_responses_path=detector_responses_path,
-            light_field_geometry=light_field_geometry,
-            trigger_geometry=trigger_geometry,
-            tmp_dir=tmp_dir,
+    done, table_past_trigger = _resume_checkpoint(
+        checkpoint_dir, "pass_loose_trigger", tabrec, prng, logger
+    )
+    if not done:
+        with runtime.Stage(logger, "pass_loose_trigger") as stage:
+            (
+                tabrec,
+                table_past_trigger,
+                tmp_past_trigger_dir,
+            ) = _run_loose_trigger(
+                job=job,
+                tabrec=tabrec,
+                detector_responses_path=detector_responses_path,
+                light_field_geometry=light_field_geometry,
+                trigger_geometry=trigger_geometry,
+                tmp_dir=tmp_dir,
+            )
+            stage.count("num_events", len(tabrec["trigger"]))
+            stage.count("num_triggered", len(tabrec["pasttrigger"]))
+        _write_checkpoint(
+            checkpoint_dir,
+            "pass_loose_trigger",
+            tabrec,
+            prng,
+            payload=table_past_trigger,
         )
 
-    with jlogging.TimeDelta(logger, "export grid region-of-interest"):
+    with runtime.Stage(logger, "export grid region-of-interest") as stage:
         _export_grid_region_of_interest_if_passed_loose_trigger(
             job=job, tabrec=tabrec, tmp_dir=tmp_dir,
         )
+        stage.count("num_events", len(tabrec["pasttrigger"]))
 
-    with jlogging.TimeDelta(logger, "classify_cherenkov"):
-        tabrec = _classify_cherenkov_photons(
+    done, _ = _resume_checkpoint(
+        checkpoint_dir, "post_trigger", tabrec, prng, logger
+    )
+    if not done:
+        tabrec = _run_post_trigger(
             job=job,
             tabrec=tabrec,
             tmp_dir=tmp_dir,
             table_past_trigger=table_past_trigger,
             light_field_geometry=light_field_geometry,
             trigger_geometry=trigger_geometry,
-        )
-
-    with jlogging.TimeDelta(logger, "extract_features"):
-        tabrec = _extract_features(
-            tabrec=tabrec,
-            light_field_geometry=light_field_geometry,
-            table_past_trigger=table_past_trigger,
             prng=prng,
+            logger=logger,
         )
+        _write_checkpoint(checkpoint_dir, "post_trigger", tabrec, prng)
 
-    with jlogging.TimeDelta(logger, "estimate_primary_trajectory"):
-        tabrec = _estimate_primary_trajectory(
-            job=job,
-            tmp_dir=tmp_dir,
-            light_field_geometry=light_field_geometry,
-            tabrec=tabrec,
-        )
-
-    with jlogging.TimeDelta(logger, "export_event_table"):
+    with runtime.Stage(logger, "export_event_table") as stage:
         _export_event_table(job=job, tmp_dir=tmp_dir, tabrec=tabrec)
+        stage.count("num_events", len(tabrec["primary"]))
 
     if not job["keep_tmp"]:
         shutil.rmtree(tmp_dir)
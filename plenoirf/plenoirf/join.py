@@ -0,0 +1,92 @@
+"""
+Join the values of one table onto the events of an other table by their
+unique IDs (UIDs), e.g. spt.IDX. The UIDs are sorted once, and looked up
+with a binary search instead of building a dict.
+"""
+import numpy as np
+
+
+def find_positions(keys, target_keys):
+    """
+    Returns the positions of the target_keys in keys, and a mask which is
+    True where a target_key is in keys. Where it is not, the position is
+    meaningless.
+
+    Parameters
+    ----------
+    keys : array (num,)
+        The UIDs, must be unique, but need not be sorted.
+    target_keys : array (num_target,)
+        The UIDs to be looked up.
+    """
+    keys = np.asarray(keys)
+    target_keys = np.asarray(target_keys)
+    assert keys.ndim == 1
+    assert target_keys.ndim == 1
+
+    if keys.shape[0] == 0:
+        positions = np.zeros(target_keys.shape[0], dtype=np.int64)
+        return positions, np.zeros(target_keys.shape[0], dtype=np.bool_)
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    assert np.all(sorted_keys[1:] != sorted_keys[:-1]), "keys not unique."
+
+    sorted_positions = np.searchsorted(sorted_keys, target_keys)
+    np.minimum(sorted_positions, keys.shape[0] - 1, out=sorted_positions)
+    found = sorted_keys[sorted_positions] == target_keys
+    return order[sorted_positions], found
+
+
+def left(keys, values, target_keys, fill_value=np.nan, require_all=False):
+    """
+    Returns the values aligned with the target_keys. Where a target_key is
+    not in keys, the value is fill_value. With require_all, all target_keys
+    must be in keys.
+
+    Parameters
+    ----------
+    keys : array (num,)
+        The unique UIDs of the values.
+    values : array (num,)
+        The values to be joined.
+    target_keys : array (num_target,)
+        The UIDs of the events the values are joined onto.
+    fill_value : scalar
+        The value for the target_keys which are not in keys. The dtype of
+        the result can hold both the values and the fill_value, e.g. bool
+        values with fill_value 0.0 become float.
+    require_all : bool
+        If True, assert that all target_keys are in keys.
+    """
+    values = np.asarray(values)
+    assert values.shape[0] == np.asarray(keys).shape[0]
+    positions, found = find_positions(keys=keys, target_keys=target_keys)
+    if require_all:
+        num_missing = np.sum(np.logical_not(found))
+        assert num_missing == 0, "{:d} target_keys not in keys.".format(
+            num_missing
+        )
+
+    dtype = np.result_type(values, np.asarray(fill_value))
+    out = np.full(found.shape[0], fill_value, dtype=dtype)
+    out[found] = values[positions[found]]
+    return out
+
+
+def inner(keys, values, target_keys):
+    """
+    Returns the positions of the target_keys which are in keys, and the
+    values aligned with them.
+
+    Returns
+    -------
+    (target_positions, values) : tuple of arrays (num_common,)
+        The target_keys[target_positions] are in keys, in the order of the
+        target_keys.
+    """
+    values = np.asarray(values)
+    assert values.shape[0] == np.asarray(keys).shape[0]
+    positions, found = find_positions(keys=keys, target_keys=target_keys)
+    (target_positions,) = np.nonzero(found)
+    return target_positions, values[positions[found]]
@@ -30,21 +30,78 @@ def _assert_particle(particle):
     assert len(particle["energy_bin_edges_GeV"]) == 2
 
 
+# The limit of the zenith in
+# cpw.random.distributions.draw_azimuth_zenith_in_viewcone. Directions
+# beyond are rejected and drawn again.
+MAX_ZENITH_RAD = np.deg2rad(70)
+MAX_ITERATIONS = 1000 * 1000
+
+PRIMARY_DTYPE = [
+    ("particle_id", "<f8"),
+    ("energy_GeV", "<f8"),
+    ("magnet_azimuth_rad", "<f8"),
+    ("magnet_zenith_rad", "<f8"),
+    ("magnet_cherenkov_pool_x_m", "<f8"),
+    ("magnet_cherenkov_pool_y_m", "<f8"),
+    ("max_scatter_rad", "<f8"),
+    ("zenith_rad", "<f8"),
+    ("azimuth_rad", "<f8"),
+    ("depth_g_per_cm2", "<f8"),
+]
+
+
 def draw_corsika_primary_steering(
     run_id, site, particle, site_particle_deflection, num_events, prng,
 ):
+    steering, _ = draw_corsika_primary_steering_batch(
+        run_id=run_id,
+        site=site,
+        particle=particle,
+        site_particle_deflection=site_particle_deflection,
+        num_events=num_events,
+        prng=prng,
+        prng_compatible=True,
+    )
+    return steering
+
+
+def draw_corsika_primary_steering_batch(
+    run_id,
+    site,
+    particle,
+    site_particle_deflection,
+    num_events,
+    prng,
+    prng_compatible=True,
+):
+    """
+    Returns the steering for CORSIKA, and the primaries as a structured
+    array with PRIMARY_DTYPE.
+
+    Parameters
+    ----------
+    prng_compatible : bool
+        If True, the directions in the view-cone are drawn event by event
+        with cpw.random.distributions.draw_azimuth_zenith_in_viewcone.
+        The steering is bit-identical to the one of
+        draw_corsika_primary_steering for the same prng.
+        If False, all directions are drawn at once with
+        draw_azimuth_zenith_in_viewcone_batch. The distribution is the
+        same, but not the random numbers.
+    """
     assert run_id > 0
     _assert_site(site)
     _assert_particle(particle)
     _assert_deflection(site_particle_deflection)
     assert num_events > 0
+    spd = site_particle_deflection
 
     max_scatter_rad = np.deg2rad(particle["max_scatter_angle_deg"])
 
     start_energy_GeV = np.max(
         [
             np.min(particle["energy_bin_edges_GeV"]),
-            np.min(site_particle_deflection["particle_energy_GeV"]),
+            np.min(spd["particle_energy_GeV"]),
         ]
     )
     stop_energy_GeV = np.max(particle["energy_bin_edges_GeV"])
@@ -74,49 +131,141 @@ def draw_corsika_primary_steering(
         "random_seed": cpw.random.seed.make_simple_seed(run_id),
     }
 
-    primaries = []
-    for e in range(num_events):
-        prm = {}
-        prm["particle_id"] = f8(particle["particle_id"])
-        prm["energy_GeV"] = f8(energies_GeV[e])
-        prm["magnet_azimuth_rad"] = np.deg2rad(
-            np.interp(
-                x=prm["energy_GeV"],
-                xp=site_particle_deflection["particle_energy_GeV"],
-                fp=site_particle_deflection["particle_azimuth_deg"],
-            )
-        )
-        prm["magnet_zenith_rad"] = np.deg2rad(
-            np.interp(
-                x=prm["energy_GeV"],
-                xp=site_particle_deflection["particle_energy_GeV"],
-                fp=site_particle_deflection["particle_zenith_deg"],
+    prm = np.recarray(shape=num_events, dtype=PRIMARY_DTYPE)
+    prm["particle_id"] = f8(particle["particle_id"])
+    prm["energy_GeV"] = energies_GeV
+    xp = spd["particle_energy_GeV"]
+    prm["magnet_azimuth_rad"] = np.deg2rad(
+        np.interp(x=prm["energy_GeV"], xp=xp, fp=spd["particle_azimuth_deg"])
+    )
+    prm["magnet_zenith_rad"] = np.deg2rad(
+        np.interp(x=prm["energy_GeV"], xp=xp, fp=spd["particle_zenith_deg"])
+    )
+    prm["magnet_cherenkov_pool_x_m"] = np.interp(
+        x=prm["energy_GeV"], xp=xp, fp=spd["cherenkov_x_m"]
+    )
+    prm["magnet_cherenkov_pool_y_m"] = np.interp(
+        x=prm["energy_GeV"], xp=xp, fp=spd["cherenkov_y_m"]
+    )
+    prm["max_scatter_rad"] = f8(max_scatter_rad)
+
+    if prng_compatible:
+        magnet_azimuth_rad = prm["magnet_azimuth_rad"]
+        magnet_zenith_rad = prm["magnet_zenith_rad"]
+        azimuth_rad = np.zeros(num_events)
+        zenith_rad = np.zeros(num_events)
+        for e in range(num_events):
+            az, zd = cpw.random.distributions.draw_azimuth_zenith_in_viewcone(
+                prng=prng,
+                azimuth_rad=magnet_azimuth_rad[e],
+                zenith_rad=magnet_zenith_rad[e],
+                min_scatter_opening_angle_rad=0.0,
+                max_scatter_opening_angle_rad=max_scatter_rad,
             )
-        )
-        prm["magnet_cherenkov_pool_x_m"] = np.interp(
-            x=prm["energy_GeV"],
-            xp=site_particle_deflection["particle_energy_GeV"],
-            fp=site_particle_deflection["cherenkov_x_m"],
-        )
-        prm["magnet_cherenkov_pool_y_m"] = np.interp(
-            x=prm["energy_GeV"],
-            xp=site_particle_deflection["particle_energy_GeV"],
-            fp=site_particle_deflection["cherenkov_y_m"],
-        )
-        az, zd = cpw.random.distributions.draw_azimuth_zenith_in_viewcone(
+            azimuth_rad[e] = az
+            zenith_rad[e] = zd
+        prm["azimuth_rad"] = azimuth_rad
+        prm["zenith_rad"] = zenith_rad
+    else:
+        az, zd = draw_azimuth_zenith_in_viewcone_batch(
             prng=prng,
             azimuth_rad=prm["magnet_azimuth_rad"],
             zenith_rad=prm["magnet_zenith_rad"],
             min_scatter_opening_angle_rad=0.0,
             max_scatter_opening_angle_rad=max_scatter_rad,
         )
-        prm["max_scatter_rad"] = f8(max_scatter_rad)
-        prm["zenith_rad"] = f8(zd)
-        prm["azimuth_rad"] = f8(az)
-        prm["depth_g_per_cm2"] = f8(0.0)
-        primaries.append(prm)
-
-    return {
-        "run": run,
-        "primaries": primaries,
-    }
+        prm["azimuth_rad"] = az
+        prm["zenith_rad"] = zd
+    prm["depth_g_per_cm2"] = f8(0.0)
+
+    return {"run": run, "primaries": primaries_to_steering(prm)}, prm
+
+
+def primaries_to_steering(primaries):
+    """
+    Returns the list of dicts of the primaries which CORSIKA is steered
+    with.
+    """
+    f8 = np.float64
+    keys = primaries.dtype.names
+    columns = [primaries[key].tolist() for key in keys]
+    return [
+        {key: f8(value) for key, value in zip(keys, values)}
+        for values in zip(*columns)
+    ]
+
+
+def draw_azimuth_zenith_in_viewcone_batch(
+    prng,
+    azimuth_rad,
+    zenith_rad,
+    min_scatter_opening_angle_rad,
+    max_scatter_opening_angle_rad,
+    max_zenith_rad=MAX_ZENITH_RAD,
+    max_iterations=MAX_ITERATIONS,
+):
+    """
+    Returns the azimuths and zeniths of directions drawn uniformly in the
+    solid angle of the view-cones around the directions azimuth_rad and
+    zenith_rad. One direction is drawn for each view-cone. Like
+    cpw.random.distributions.draw_azimuth_zenith_in_viewcone, directions
+    with a zenith beyond max_zenith_rad are rejected and drawn again.
+    """
+    azimuth_rad = np.asarray(azimuth_rad, dtype=np.float64)
+    zenith_rad = np.asarray(zenith_rad, dtype=np.float64)
+    assert azimuth_rad.shape == zenith_rad.shape
+    assert min_scatter_opening_angle_rad >= 0.0
+    assert max_scatter_opening_angle_rad >= min_scatter_opening_angle_rad
+    assert max_zenith_rad >= 0.0
+
+    out_azimuth_rad = np.zeros(azimuth_rad.shape[0])
+    out_zenith_rad = np.zeros(azimuth_rad.shape[0])
+    todo = np.arange(azimuth_rad.shape[0])
+    iteration = 0
+    while todo.shape[0] > 0:
+        iteration += 1
+        assert iteration <= max_iterations, "Rejection-sampling failed."
+        az, zd = _draw_azimuth_zenith_in_viewcone(
+            prng=prng,
+            azimuth_rad=azimuth_rad[todo],
+            zenith_rad=zenith_rad[todo],
+            min_scatter_opening_angle_rad=min_scatter_opening_angle_rad,
+            max_scatter_opening_angle_rad=max_scatter_opening_angle_rad,
+        )
+        accepted = zd <= max_zenith_rad
+        out_azimuth_rad[todo[accepted]] = az[accepted]
+        out_zenith_rad[todo[accepted]] = zd[accepted]
+        todo = todo[np.logical_not(accepted)]
+    return out_azimuth_rad, out_zenith_rad
+
+
+def _draw_azimuth_zenith_in_viewcone(
+    prng,
+    azimuth_rad,
+    zenith_rad,
+    min_scatter_opening_angle_rad,
+    max_scatter_opening_angle_rad,
+):
+    num = azimuth_rad.shape[0]
+
+    # uniform in solid angle within the view-cone around the z-axis
+    cos_min = np.cos(min_scatter_opening_angle_rad)
+    cos_max = np.cos(max_scatter_opening_angle_rad)
+    cos_theta = prng.uniform(low=cos_max, high=cos_min, size=num)
+    sin_theta = np.sqrt(1.0 - cos_theta ** 2)
+    phi = prng.uniform(low=0.0, high=2.0 * np.pi, size=num)
+    x = sin_theta * np.cos(phi)
+    y = sin_theta * np.sin(phi)
+    z = cos_theta
+
+    # rotate by zenith around the y-axis
+    cz, sz = np.cos(zenith_rad), np.sin(zenith_rad)
+    x, z = cz * x + sz * z, -sz * x + cz * z
+
+    # rotate by azimuth around the z-axis
+    ca, sa = np.cos(azimuth_rad), np.sin(azimuth_rad)
+    x, y = ca * x - sa * y, sa * x + ca * y
+
+    out_zenith_rad = np.arccos(np.clip(z, -1.0, 1.0))
+    out_azimuth_rad = np.arctan2(y, x)
+    return out_azimuth_rad, out_zenith_rad
@@ -57,6 +57,7 @@ EXAMPLE_GRID = {
     "field_of_view_overhead": 1.1,
     "bin_width_overhead": 1.1,
     "output_after_num_events": 25,
+    "num_reuses_per_shower": 1,
 }
 
 EXAMPLE_SUM_TRIGGER = {
@@ -1,7 +1,36 @@
 import subprocess
+import threading
+import os
 import json_numpy
 
 
+def _make_plenoscope_propagator_call(
+    corsika_run_path,
+    output_path,
+    light_field_geometry_path,
+    merlict_plenoscope_propagator_path,
+    merlict_plenoscope_propagator_config_path,
+    random_seed,
+    photon_origins,
+):
+    call = [
+        merlict_plenoscope_propagator_path,
+        "-l",
+        light_field_geometry_path,
+        "-c",
+        merlict_plenoscope_propagator_config_path,
+        "-i",
+        corsika_run_path,
+        "-o",
+        output_path,
+        "-r",
+        "{:d}".format(random_seed),
+    ]
+    if photon_origins:
+        call.append("--all_truth")
+    return call
+
+
 def plenoscope_propagator(
     corsika_run_path,
     output_path,
@@ -18,25 +47,106 @@ def plenoscope_propagator(
     and saves the stdout and stderr
     """
     with open(stdout_path, "w") as out, open(stderr_path, "w") as err:
-        call = [
-            merlict_plenoscope_propagator_path,
-            "-l",
-            light_field_geometry_path,
-            "-c",
-            merlict_plenoscope_propagator_config_path,
-            "-i",
-            corsika_run_path,
-            "-o",
-            output_path,
-            "-r",
-            "{:d}".format(random_seed),
-        ]
-        if photon_origins:
-            call.append("--all_truth")
+        call = _make_plenoscope_propagator_call(
+            corsika_run_path=corsika_run_path,
+            output_path=output_path,
+            light_field_geometry_path=light_field_geometry_path,
+            merlict_plenoscope_propagator_path=merlict_plenoscope_propagator_path,
+            merlict_plenoscope_propagator_config_path=merlict_plenoscope_propagator_config_path,
+            random_seed=random_seed,
+            photon_origins=photon_origins,
+        )
         mct_rc = subprocess.call(call, stdout=out, stderr=err)
     return mct_rc
 
 
+class PlenoscopePropagatorFifo:
+    """
+    Runs the merlict Cherenkov-plenoscope propagation in the background
+    while it reads the CORSIKA-run from a named pipe (FIFO).
+    Write the EventTape to fifo_path while this is open.
+    When merlict exits early, the FIFO is opened and closed for reading
+    until wait() so that a writer blocked in open() does not wait forever,
+    but fails with a BrokenPipeError. A FIFO left behind by a killed job is
+    replaced.
+
+    with PlenoscopePropagatorFifo(...) as mct:
+        with EventTapeWriter(path=mct.fifo_path) as evttar:
+            ...
+    assert mct.returncode == 0
+    """
+
+    def __init__(
+        self,
+        fifo_path,
+        output_path,
+        light_field_geometry_path,
+        merlict_plenoscope_propagator_path,
+        merlict_plenoscope_propagator_config_path,
+        random_seed,
+        photon_origins,
+        stdout_path,
+        stderr_path,
+    ):
+        self.fifo_path = str(fifo_path)
+        if os.path.lexists(self.fifo_path):
+            os.remove(self.fifo_path)
+        os.mkfifo(self.fifo_path)
+        self.returncode = None
+        self._stdout = open(stdout_path, "w")
+        self._stderr = open(stderr_path, "w")
+        call = _make_plenoscope_propagator_call(
+            corsika_run_path=self.fifo_path,
+            output_path=output_path,
+            light_field_geometry_path=light_field_geometry_path,
+            merlict_plenoscope_propagator_path=merlict_plenoscope_propagator_path,
+            merlict_plenoscope_propagator_config_path=merlict_plenoscope_propagator_config_path,
+            random_seed=random_seed,
+            photon_origins=photon_origins,
+        )
+        self._proc = subprocess.Popen(
+            call, stdout=self._stdout, stderr=self._stderr
+        )
+        self._writer_done = threading.Event()
+        self._watchdog = threading.Thread(target=self._unblock_writer)
+        self._watchdog.daemon = True
+        self._watchdog.start()
+
+    def _unblock_writer(self):
+        self._proc.wait()
+        while not self._writer_done.is_set():
+            try:
+                fd = os.open(self.fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+                os.close(fd)
+            except OSError:
+                pass
+            self._writer_done.wait(timeout=0.1)
+
+    def wait(self):
+        if self.returncode is None:
+            self._writer_done.set()
+            self.returncode = self._proc.wait()
+            self._watchdog.join()
+            self._stdout.close()
+            self._stderr.close()
+            os.remove(self.fifo_path)
+        return self.returncode
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None and self._proc.poll() is None:
+            self._proc.kill()
+        self.wait()
+
+    def __repr__(self):
+        out = "{:s}(fifo_path='{:s}')".format(
+            self.__class__.__name__, self.fifo_path
+        )
+        return out
+
+
 def read_plenoscope_geometry(merlict_scenery_path):
     with open(merlict_scenery_path, "rt") as f:
         _scenery = json_numpy.loads(f.read())
@@ -58,6 +58,32 @@ def estimate_onregion(
     reco_core_radius,
     config,
 ):
+    onregions = estimate_onregions(
+        reco_cx=np.array([reco_cx], dtype=np.float64),
+        reco_cy=np.array([reco_cy], dtype=np.float64),
+        reco_main_axis_azimuth=np.array(
+            [reco_main_axis_azimuth], dtype=np.float64
+        ),
+        reco_num_photons=np.array([reco_num_photons], dtype=np.float64),
+        reco_core_radius=np.array([reco_core_radius], dtype=np.float64),
+        config=config,
+    )
+    return {key: float(onregions[key][0]) for key in onregions}
+
+
+def estimate_onregions(
+    reco_cx,
+    reco_cy,
+    reco_main_axis_azimuth,
+    reco_num_photons,
+    reco_core_radius,
+    config,
+):
+    """
+    Returns the onregions of many events, a dict of arrays with the same
+    keys as estimate_onregion(). The arguments are arrays, one entry for
+    each event.
+    """
     pivot_opening_angle = np.deg2rad(config["opening_angle_deg"])
     opening_angle_scaling = np.interp(
         x=reco_num_photons,
@@ -78,9 +104,11 @@ def estimate_onregion(
     ellipse_solid_angle = np.pi * ellipse_mayor_radius * ellipse_minor_radius
 
     return {
-        "ellipse_center_cx": float(reco_cx),
-        "ellipse_center_cy": float(reco_cy),
-        "ellipse_main_axis_azimuth": float(reco_main_axis_azimuth),
+        "ellipse_center_cx": np.asarray(reco_cx, dtype=np.float64),
+        "ellipse_center_cy": np.asarray(reco_cy, dtype=np.float64),
+        "ellipse_main_axis_azimuth": np.asarray(
+            reco_main_axis_azimuth, dtype=np.float64
+        ),
         "ellipse_mayor_radius": ellipse_mayor_radius,
         "ellipse_minor_radius": ellipse_minor_radius,
         "ellipse_solid_angle": ellipse_solid_angle,
@@ -99,6 +127,139 @@ def is_direction_inside(cx, cy, onregion):
     )
 
 
+def is_direction_inside_onregions(cx, cy, onregions):
+    """
+    Returns a mask, True for each event whose direction cx, cy is inside
+    its onregion. All arguments are arrays, see estimate_onregions().
+    """
+    return is_direction_inside(cx=cx, cy=cy, onregion=onregions)
+
+
+def make_polygons(onregions, num_steps=1000):
+    """
+    Returns the polygons of the onregions, shape (num, num_steps, 2).
+    """
+    theta = np.linspace(0, 2 * np.pi, num_steps, endpoint=False)[None, :]
+    mayor = onregions["ellipse_mayor_radius"][:, None]
+    minor = onregions["ellipse_minor_radius"][:, None]
+    azimuth = onregions["ellipse_main_axis_azimuth"][:, None]
+    radius = (mayor * minor) / np.sqrt(
+        (minor * np.cos(theta)) ** 2 + (mayor * np.sin(theta)) ** 2
+    )
+    polygons = np.zeros(shape=(mayor.shape[0], num_steps, 2))
+    polygons[:, :, 0] = (
+        onregions["ellipse_center_cx"][:, None]
+        + np.cos(theta + azimuth) * radius
+    )
+    polygons[:, :, 1] = (
+        onregions["ellipse_center_cy"][:, None]
+        + np.sin(theta + azimuth) * radius
+    )
+    return polygons
+
+
+def intersecting_area_of_onregions_and_polygon(
+    onregions, polygon, num_steps=1000, chunk_size=1024
+):
+    """
+    Returns the area of the intersection of each onregion's polygon with
+    the polygon, like intersecting_area_of_polygons() for each onregion.
+    Both must be convex, and counter-clockwise like make_polygon() and
+    make_circular_polygon().
+    """
+    polygon = np.asarray(polygon, dtype=np.float64)
+    center = np.mean(polygon, axis=0)
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    outer_radius = np.max(np.hypot(*(polygon - center).T))
+    to_center = center - polygon
+    inner_radius = np.min(
+        np.abs(edges[:, 0] * to_center[:, 1] - edges[:, 1] * to_center[:, 0])
+        / np.hypot(edges[:, 0], edges[:, 1])
+    )
+
+    dist = np.hypot(
+        onregions["ellipse_center_cx"] - center[0],
+        onregions["ellipse_center_cy"] - center[1],
+    )
+    radius = np.maximum(
+        onregions["ellipse_mayor_radius"], onregions["ellipse_minor_radius"]
+    )
+    inside = dist + radius <= inner_radius
+    partial = np.logical_and(
+        np.logical_not(inside), dist < outer_radius + radius
+    )
+
+    areas = np.zeros(dist.shape[0])
+    for mask, both in [(inside, False), (partial, True)]:
+        (ii,) = np.nonzero(mask)
+        for start in range(0, ii.shape[0], chunk_size):
+            jj = ii[start : start + chunk_size]
+            chunk = {key: onregions[key][jj] for key in onregions}
+            polygons = make_polygons(onregions=chunk, num_steps=num_steps)
+            if both:
+                areas[jj] = intersecting_area_of_convex_polygons(
+                    a=polygons, b=polygon
+                )
+            else:
+                areas[jj] = _area_of_polygons(polygons)
+    return areas
+
+
+def _area_of_polygons(polygons):
+    nxt = np.roll(polygons, -1, axis=1)
+    return 0.5 * np.sum(
+        polygons[:, :, 0] * nxt[:, :, 1] - polygons[:, :, 1] * nxt[:, :, 0],
+        axis=1,
+    )
+
+
+def intersecting_area_of_convex_polygons(a, b):
+    """
+    Returns the area of the intersection of the convex, counter-clockwise
+    polygons a[i] and b[i]. By Green's theorem, the area is the sum over
+    the edges of a clipped to b, and the edges of b clipped to a.
+
+    Parameters
+    ----------
+    a : array (num, num_vertices_a, 2)
+    b : array (num, num_vertices_b, 2) or (num_vertices_b, 2)
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if b.ndim == 2:
+        b = np.broadcast_to(b, (a.shape[0],) + b.shape)
+    return _area_of_edges_clipped_to_convex_polygons(
+        edges=a, polygons=b
+    ) + _area_of_edges_clipped_to_convex_polygons(edges=b, polygons=a)
+
+
+def _area_of_edges_clipped_to_convex_polygons(edges, polygons):
+    direction = np.roll(edges, -1, axis=1) - edges
+    normal = np.roll(polygons, -1, axis=1) - polygons
+
+    # A point p is inside the edge j of a polygon when
+    # cross(normal_j, p - polygon_j) >= 0. Along the edge i,
+    # p = edges_i + t * direction_i, this is num_ij + t * den_ij >= 0.
+    rot = np.stack([-normal[:, :, 1], normal[:, :, 0]], axis=1)
+    offset = np.sum(rot * np.swapaxes(polygons, 1, 2), axis=1)
+    num = np.matmul(edges, rot) - offset[:, None, :]
+    den = np.matmul(direction, rot)
+    parallel_outside = np.any(np.logical_and(den == 0, num < 0), axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.negative(num, out=num)
+        np.divide(t, den, out=t)
+    t_lo = np.max(np.where(den > 0, t, 0.0), axis=2)
+    t_hi = np.min(np.where(den < 0, t, 1.0), axis=2)
+    np.maximum(t_lo, 0.0, out=t_lo)
+    np.minimum(t_hi, 1.0, out=t_hi)
+    valid = np.logical_and(t_lo < t_hi, np.logical_not(parallel_outside))
+
+    p_lo = edges + t_lo[:, :, None] * direction
+    p_hi = edges + t_hi[:, :, None] * direction
+    cross = p_lo[:, :, 0] * p_hi[:, :, 1] - p_lo[:, :, 1] * p_hi[:, :, 0]
+    return 0.5 * np.sum(np.where(valid, cross, 0.0), axis=1)
+
+
 def _is_point_inside_ellipse(
     point_x,
     point_y,
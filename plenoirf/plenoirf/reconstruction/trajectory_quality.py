@@ -6,6 +6,42 @@ import airshower_template_generator as atg
 import sparse_numeric_table as spt
 
 
+# The columns of the event-table which make_rectangular_table() reads, and
+# which estimate_trajectory_quality() reads with QUALITY_FEATURES.
+COLUMN_KEYS = {
+    "primary": [
+        "momentum_x_GeV_per_c",
+        "momentum_y_GeV_per_c",
+        "momentum_z_GeV_per_c",
+    ],
+    "core": ["core_x_m", "core_y_m"],
+    "reconstructed_trajectory": ["x_m", "y_m", "cx_rad", "cy_rad"],
+    "features": [
+        "image_half_depth_shift_cx",
+        "image_half_depth_shift_cy",
+        "num_photons",
+        "image_smallest_ellipse_solid_angle",
+    ],
+}
+
+
+def make_column_keys(column_keys=None):
+    """
+    Returns the column_keys for table.read() of the event-table for
+    make_rectangular_table(), and the columns in column_keys which the
+    caller reads, too. A level with None has all its columns.
+    """
+    column_keys = column_keys if column_keys else {}
+    out = {}
+    for level_key in set(COLUMN_KEYS) | set(column_keys):
+        if level_key in column_keys and column_keys[level_key] is None:
+            out[level_key] = None
+            continue
+        keys = COLUMN_KEYS.get(level_key, []) + column_keys.get(level_key, [])
+        out[level_key] = sorted(set(keys))
+    return out
+
+
 def make_rectangular_table(event_table, plenoscope_pointing):
     tab = spt.cut_and_sort_table_on_indices(
         table=event_table,
@@ -0,0 +1,234 @@
+"""
+Record the resources used by the stages of a run in its runtime.jsonl.
+
+Each stage logs one line with its wall-time which is compatible with
+jlogging.TimeDelta, i.e. '<stage>:delta:<seconds>', and one line with its
+resources '<stage>:resources:<key>=<value>,<key>=<value>,...'.
+"""
+import json
+import os
+import shutil
+import time
+import resource
+import pandas as pd
+
+DELTA_KEY = ":delta:"
+RESOURCES_KEY = ":resources:"
+
+RESOURCE_KEYS = [
+    "cpu_user_s",
+    "cpu_sys_s",
+    "children_cpu_user_s",
+    "children_cpu_sys_s",
+    "peak_rss_byte",
+    "children_peak_rss_byte",
+    "read_byte",
+    "write_byte",
+    "children_read_byte",
+    "children_write_byte",
+]
+
+# ru_inblock, ru_oublock are in units of 512 byte.
+RUSAGE_BLOCK_SIZE_BYTE = 512
+
+# ru_maxrss is in kilo byte on linux.
+RUSAGE_MAXRSS_UNIT_BYTE = 1024
+
+
+def read_proc_self_io(path="/proc/self/io"):
+    """
+    Returns the bytes read and written by this process according to
+    /proc/self/io. Returns NaN when /proc/self/io can not be read.
+    """
+    out = {"read_bytes": float("nan"), "write_bytes": float("nan")}
+    try:
+        with open(path, "rt") as f:
+            for line in f:
+                key, value = line.split(":")
+                if key in out:
+                    out[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return out
+
+
+def _snapshot():
+    return {
+        "time": time.time(),
+        "self": resource.getrusage(resource.RUSAGE_SELF),
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN),
+        "io": read_proc_self_io(),
+    }
+
+
+def _resources_between(start, stop):
+    sta, sto = start, stop
+    return {
+        "cpu_user_s": sto["self"].ru_utime - sta["self"].ru_utime,
+        "cpu_sys_s": sto["self"].ru_stime - sta["self"].ru_stime,
+        "children_cpu_user_s": (
+            sto["children"].ru_utime - sta["children"].ru_utime
+        ),
+        "children_cpu_sys_s": (
+            sto["children"].ru_stime - sta["children"].ru_stime
+        ),
+        "peak_rss_byte": sto["self"].ru_maxrss * RUSAGE_MAXRSS_UNIT_BYTE,
+        "children_peak_rss_byte": (
+            sto["children"].ru_maxrss * RUSAGE_MAXRSS_UNIT_BYTE
+        ),
+        "read_byte": sto["io"]["read_bytes"] - sta["io"]["read_bytes"],
+        "write_byte": sto["io"]["write_bytes"] - sta["io"]["write_bytes"],
+        "children_read_byte": RUSAGE_BLOCK_SIZE_BYTE
+        * (sto["children"].ru_inblock - sta["children"].ru_inblock),
+        "children_write_byte": RUSAGE_BLOCK_SIZE_BYTE
+        * (sto["children"].ru_oublock - sta["children"].ru_oublock),
+    }
+
+
+class Stage:
+    """
+    Like jlogging.TimeDelta, but also logs the cpu-time, the peak
+    resident-set-size, the bytes read and written of this process and of
+    its children (CORSIKA, merlict) which were waited for during the
+    stage. Use count() to log the number of events processed in the stage.
+
+    The peak resident-set-size is the maximum since the process started,
+    not since the stage started.
+    """
+
+    def __init__(self, logger, name):
+        assert "," not in name and "=" not in name
+        self.logger = logger
+        self.name = name
+        self.counts = {}
+
+    def count(self, key, num):
+        assert key.startswith("num_")
+        self.counts[key] = int(num)
+
+    def __enter__(self):
+        self.start = _snapshot()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop = _snapshot()
+        self.logger.info(
+            self.name + DELTA_KEY + "{:f}".format(self.delta())
+        )
+        usage = _resources_between(start=self.start, stop=self.stop)
+        usage.update(self.counts)
+        self.logger.info(self.name + RESOURCES_KEY + _dumps(usage))
+
+    def delta(self):
+        return self.stop["time"] - self.start["time"]
+
+
+class AccumulatedStage:
+    """
+    For a stage which runs in many pieces interleaved with other stages,
+    e.g. once for each event. Enter it for each piece, and call log() once
+    in the end to log the sum of the pieces like a Stage does.
+    Only the wall-time and the cpu-time are accumulated.
+    """
+
+    def __init__(self, logger, name):
+        assert "," not in name and "=" not in name
+        self.logger = logger
+        self.name = name
+        self.counts = {}
+        self.usage = {
+            "cpu_user_s": 0.0,
+            "cpu_sys_s": 0.0,
+            "children_cpu_user_s": 0.0,
+            "children_cpu_sys_s": 0.0,
+        }
+        self.wall_s = 0.0
+
+    def count(self, key, num):
+        assert key.startswith("num_")
+        self.counts[key] = int(num)
+
+    def __enter__(self):
+        self.start = os.times()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        stop = os.times()
+        self.wall_s += stop.elapsed - self.start.elapsed
+        self.usage["cpu_user_s"] += stop.user - self.start.user
+        self.usage["cpu_sys_s"] += stop.system - self.start.system
+        self.usage["children_cpu_user_s"] += (
+            stop.children_user - self.start.children_user
+        )
+        self.usage["children_cpu_sys_s"] += (
+            stop.children_system - self.start.children_system
+        )
+
+    def log(self):
+        self.logger.info(self.name + DELTA_KEY + "{:f}".format(self.wall_s))
+        usage = dict(self.usage)
+        usage.update(self.counts)
+        self.logger.info(self.name + RESOURCES_KEY + _dumps(usage))
+
+
+def _dumps(usage):
+    return ",".join(["{:s}={}".format(k, usage[k]) for k in usage])
+
+
+def _loads(s):
+    usage = {}
+    for item in s.split(","):
+        key, value = item.split("=")
+        usage[key] = float(value)
+    return usage
+
+
+def reduce_into_records(list_of_log_paths):
+    """
+    Returns one record for each run's runtime.jsonl. The wall-time of a
+    stage is in the column '<stage>', its resources are in the columns
+    '<stage>.<key>'.
+    """
+    list_of_log_records = []
+    for log_path in list_of_log_paths:
+        run_id = int(os.path.basename(log_path)[0:6])
+        run = {"run_id": run_id}
+        with open(log_path, "rt") as fin:
+            for line in fin:
+                logline = json.loads(line)
+                if "m" not in logline:
+                    continue
+                msg = logline["m"]
+                if DELTA_KEY in msg:
+                    iname = str.find(msg, DELTA_KEY)
+                    name = msg[:iname]
+                    run[name] = float(msg[(iname + len(DELTA_KEY)) :])
+                elif RESOURCES_KEY in msg:
+                    iname = str.find(msg, RESOURCES_KEY)
+                    name = msg[:iname]
+                    usage = _loads(msg[(iname + len(RESOURCES_KEY)) :])
+                    for key in usage:
+                        run[name + "." + key] = usage[key]
+        list_of_log_records.append(run)
+    return list_of_log_records
+
+
+def reduce(list_of_log_paths, out_path):
+    log_records = reduce_into_records(list_of_log_paths=list_of_log_paths)
+    log_df = pd.DataFrame(log_records)
+    if len(log_records) > 0:
+        log_df = log_df.sort_values(by=["run_id"])
+    log_df.to_csv(out_path + ".tmp", index=False, na_rep="nan")
+    shutil.move(out_path + ".tmp", out_path)
+
+
+def stage_keys(column_keys):
+    """
+    Returns the names of the stages in the columns of a runtime.csv.
+    """
+    stages = []
+    for key in column_keys:
+        if key == "run_id" or "." in key or key.startswith("num_"):
+            continue
+        stages.append(key)
+    return stages
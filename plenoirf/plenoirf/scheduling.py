@@ -0,0 +1,248 @@
+"""
+Estimate the cost of the jobs for instrument_response.run_job, and bundle
+the jobs so that the bundles take about the same time.
+
+The cost of a job is its number of air-showers times the seconds per
+air-shower. The seconds per air-shower of a site and particle are the
+median of the runs in a past runtime.csv. Without a past runtime.csv, the
+seconds per air-shower are a prior which scales with the mean energy of
+the thrown particles, and with the solid angle they are thrown into. The
+prior is calibrated with the sites and particles which have a past
+runtime.csv.
+
+The bundles are made longest-processing-time-first: The most expensive
+job is added to the bundle with the least cost so far.
+"""
+import os
+import glob
+import heapq
+import numpy as np
+import pandas as pd
+
+from . import runtime
+from . import utils
+
+# Only the ratios of the prior matter when it is calibrated.
+PRIOR_SECONDS_PER_SHOWER_PER_GEV = 1e-2
+PRIOR_SECONDS_PER_SHOWER_PER_GEV_PER_SR = 1e-1
+
+NUM_SHOWERS_COLUMN = "draw_primary.num_events"
+
+
+def mean_energy_of_power_law(start, stop, slope):
+    """
+    Returns the mean energy of a power-law E**slope in [start, stop].
+    """
+    assert 0.0 < start <= stop
+    if start == stop:
+        return start
+    if np.isclose(slope, -1.0):
+        return (stop - start) / np.log(stop / start)
+    if np.isclose(slope, -2.0):
+        return np.log(stop / start) / (1.0 / start - 1.0 / stop)
+    return ((slope + 1.0) / (slope + 2.0)) * (
+        (stop ** (slope + 2.0) - start ** (slope + 2.0))
+        / (stop ** (slope + 1.0) - start ** (slope + 1.0))
+    )
+
+
+def _job_energy_range(job):
+    particle = job["particle"]
+    start = np.max(
+        [
+            np.min(particle["energy_bin_edges_GeV"]),
+            np.min(job["site_particle_deflection"]["particle_energy_GeV"]),
+        ]
+    )
+    stop = np.max(particle["energy_bin_edges_GeV"])
+    return start, stop
+
+
+def prior_seconds_per_shower(job):
+    start, stop = _job_energy_range(job=job)
+    mean_energy_GeV = mean_energy_of_power_law(
+        start=start, stop=stop, slope=job["particle"]["energy_power_law_slope"]
+    )
+    solid_angle_thrown_sr = utils.cone_solid_angle(
+        np.deg2rad(job["particle"]["max_scatter_angle_deg"])
+    )
+    return mean_energy_GeV * (
+        PRIOR_SECONDS_PER_SHOWER_PER_GEV
+        + PRIOR_SECONDS_PER_SHOWER_PER_GEV_PER_SR * solid_angle_thrown_sr
+    )
+
+
+def read_seconds_per_run(runtime_csv_path):
+    """
+    Returns a DataFrame with the run_id, the seconds of all stages, and
+    the number of air-showers of each run in a runtime.csv.
+    """
+    rt = pd.read_csv(runtime_csv_path)
+    stages = runtime.stage_keys(rt.columns)
+    out = pd.DataFrame({"run_id": rt["run_id"]})
+    out["seconds"] = rt[stages].fillna(0.0).sum(axis=1)
+    if NUM_SHOWERS_COLUMN in rt:
+        out["num_showers"] = rt[NUM_SHOWERS_COLUMN]
+    else:
+        out["num_showers"] = np.nan
+    return out
+
+
+def read_seconds_per_shower(runtime_csv_path):
+    """
+    Returns the median seconds per air-shower of the runs in a
+    runtime.csv, or None when it has no runs with air-showers.
+    """
+    runs = read_seconds_per_run(runtime_csv_path=runtime_csv_path)
+    valid = runs["num_showers"] > 0
+    if np.sum(valid) == 0:
+        return None
+    return float(
+        np.median(runs["seconds"][valid] / runs["num_showers"][valid])
+    )
+
+
+def find_runtime_csv_paths(production_dirs):
+    """
+    Returns paths[site_key][particle_key] of the runtime.csv files in the
+    production_dirs, e.g. run_dir/event_table. The first production_dir
+    with a runtime.csv of a site and particle wins.
+    """
+    paths = {}
+    for production_dir in production_dirs:
+        pattern = os.path.join(production_dir, "*", "*", "runtime.csv")
+        for path in sorted(glob.glob(pattern)):
+            site_particle_dir = os.path.dirname(path)
+            pk = os.path.basename(site_particle_dir)
+            sk = os.path.basename(os.path.dirname(site_particle_dir))
+            if sk not in paths:
+                paths[sk] = {}
+            if pk not in paths[sk]:
+                paths[sk][pk] = path
+    return paths
+
+
+def read_actual_seconds(runtime_csv_paths):
+    """
+    Returns seconds[site_key][particle_key][run_id] of the runs in the
+    runtime.csv files.
+    """
+    seconds = {}
+    for sk in runtime_csv_paths:
+        seconds[sk] = {}
+        for pk in runtime_csv_paths[sk]:
+            runs = read_seconds_per_run(runtime_csv_paths[sk][pk])
+            seconds[sk][pk] = {
+                int(run_id): float(sec)
+                for run_id, sec in zip(runs["run_id"], runs["seconds"])
+            }
+    return seconds
+
+
+def init_cost_model(jobs, runtime_csv_paths=None):
+    """
+    Returns the cost-model for the jobs.
+
+    Parameters
+    ----------
+    jobs : list
+        The jobs for instrument_response.run_job.
+    runtime_csv_paths : dict
+        runtime_csv_paths[site_key][particle_key] is the path of a past
+        runtime.csv of this site and particle.
+    """
+    runtime_csv_paths = runtime_csv_paths if runtime_csv_paths else {}
+    observed = {}
+    ratios = []
+    for job in jobs:
+        sk = job["site_key"]
+        pk = job["particle_key"]
+        if sk in observed and pk in observed[sk]:
+            continue
+        if sk not in runtime_csv_paths or pk not in runtime_csv_paths[sk]:
+            continue
+        seconds_per_shower = read_seconds_per_shower(
+            runtime_csv_path=runtime_csv_paths[sk][pk]
+        )
+        if seconds_per_shower is None:
+            continue
+        if sk not in observed:
+            observed[sk] = {}
+        observed[sk][pk] = seconds_per_shower
+        ratios.append(seconds_per_shower / prior_seconds_per_shower(job=job))
+
+    return {
+        "observed_seconds_per_shower": observed,
+        "prior_calibration": float(np.median(ratios)) if ratios else 1.0,
+    }
+
+
+def estimate_cost(cost_model, job):
+    """
+    Returns the expected seconds of the job.
+    """
+    observed = cost_model["observed_seconds_per_shower"]
+    sk = job["site_key"]
+    pk = job["particle_key"]
+    if sk in observed and pk in observed[sk]:
+        seconds_per_shower = observed[sk][pk]
+    else:
+        seconds_per_shower = cost_model[
+            "prior_calibration"
+        ] * prior_seconds_per_shower(job=job)
+    return job["num_air_showers"] * seconds_per_shower
+
+
+def bundle_jobs(jobs, costs, num_bundles):
+    """
+    Returns the bundles, lists of jobs, and their expected costs.
+    Longest-processing-time-first: Each job, the most expensive first, is
+    added to the bundle with the least cost so far. The makespan is at
+    most 4/3 of the optimum.
+    """
+    assert len(jobs) == len(costs)
+    assert num_bundles > 0
+    num_bundles = min([num_bundles, len(jobs)])
+    bundles = [[] for b in range(num_bundles)]
+    loads = [0.0 for b in range(num_bundles)]
+    heap = [(0.0, b) for b in range(num_bundles)]
+    order = np.argsort(-np.asarray(costs, dtype=np.float64), kind="stable")
+    for j in order:
+        load, b = heapq.heappop(heap)
+        bundles[b].append(jobs[j])
+        loads[b] = load + costs[j]
+        heapq.heappush(heap, (loads[b], b))
+    return bundles, loads
+
+
+def make_report(bundles, predicted_loads, actual_seconds):
+    """
+    Returns the predicted and the actual makespan of the bundles.
+
+    Parameters
+    ----------
+    actual_seconds : dict
+        actual_seconds[site_key][particle_key][run_id] are the seconds the
+        run took according to its runtime.csv.
+    """
+    actual_loads = []
+    num_missing = 0
+    for bundle in bundles:
+        load = 0.0
+        for job in bundle:
+            try:
+                load += actual_seconds[job["site_key"]][job["particle_key"]][
+                    job["run_id"]
+                ]
+            except KeyError:
+                num_missing += 1
+        actual_loads.append(load)
+    return {
+        "num_bundles": len(bundles),
+        "num_jobs": int(np.sum([len(bundle) for bundle in bundles])),
+        "num_jobs_without_runtime": num_missing,
+        "predicted_makespan_s": float(np.max(predicted_loads)),
+        "actual_makespan_s": float(np.max(actual_loads)),
+        "predicted_load_s": [float(load) for load in predicted_loads],
+        "actual_load_s": actual_loads,
+    }
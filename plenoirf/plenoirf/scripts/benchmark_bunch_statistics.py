@@ -0,0 +1,84 @@
+"""
+Benchmarks the statistics of synthetic CORSIKA Cherenkov-bunches.
+
+Usage: python benchmark_bunch_statistics.py [NUM_BUNCHES]
+"""
+import plenoirf
+import corsika_primary as cpw
+import numpy as np
+import timeit
+import sys
+
+argv = sys.argv
+if argv[0] == "ipython" and argv[1] == "-i":
+    argv.pop(1)
+
+NUM_BUNCHES = int(float(argv[1])) if len(argv) > 1 else 10 * 1000 * 1000
+NUM_REPETITIONS = 3
+
+prng = np.random.Generator(np.random.PCG64(seed=1))
+
+
+def make_cherenkov_bunches(prng, num_bunches):
+    cb = np.zeros(shape=(num_bunches, 8), dtype=np.float32)
+    cb[:, cpw.I.BUNCH.X] = prng.normal(scale=300 * cpw.M2CM, size=num_bunches)
+    cb[:, cpw.I.BUNCH.Y] = prng.normal(scale=300 * cpw.M2CM, size=num_bunches)
+    cb[:, cpw.I.BUNCH.CX] = prng.normal(scale=np.deg2rad(2), size=num_bunches)
+    cb[:, cpw.I.BUNCH.CY] = prng.normal(scale=np.deg2rad(2), size=num_bunches)
+    cb[:, cpw.I.BUNCH.TIME] = prng.normal(scale=10e-9, size=num_bunches)
+    cb[:, cpw.I.BUNCH.ZEM] = prng.uniform(1e5, 1e6, size=num_bunches)
+    cb[:, cpw.I.BUNCH.BSIZE] = prng.uniform(0.9, 1.0, size=num_bunches)
+    cb[:, cpw.I.BUNCH.WVL] = prng.uniform(250, 700, size=num_bunches)
+    return cb
+
+
+def report(name, func):
+    t = min(timeit.repeat(func, number=1, repeat=NUM_REPETITIONS))
+    print(
+        "{:<48s} {:9.3f}s  {:7.1f}M bunches/s".format(
+            name, t, 1e-6 * NUM_BUNCHES / t
+        )
+    )
+    return t
+
+
+def median_of_each_column(cb):
+    # The former way, one np.median for each strided column.
+    return {
+        key: np.median(cb[:, column])
+        for key, column in plenoirf.bunch_statistics.MEDIAN_COLUMNS.items()
+    }
+
+
+cherenkov_bunches = make_cherenkov_bunches(prng=prng, num_bunches=NUM_BUNCHES)
+print("num. bunches: {:d}".format(NUM_BUNCHES))
+
+t_ref = report(
+    "np.median of each column",
+    lambda: median_of_each_column(cb=cherenkov_bunches),
+)
+t_exa = report(
+    "bunch_statistics.medians",
+    lambda: plenoirf.bunch_statistics.medians(
+        cherenkov_bunches=cherenkov_bunches
+    ),
+)
+print("speedup: {:.1f}".format(t_ref / t_exa))
+t_app = report(
+    "bunch_statistics.medians, approximate",
+    lambda: plenoirf.bunch_statistics.medians(
+        cherenkov_bunches=cherenkov_bunches, approximate=True
+    ),
+)
+print("speedup: {:.1f}".format(t_ref / t_app))
+
+exact = plenoirf.bunch_statistics.medians(cherenkov_bunches=cherenkov_bunches)
+approx = plenoirf.bunch_statistics.medians(
+    cherenkov_bunches=cherenkov_bunches, approximate=True
+)
+for key in exact:
+    print(
+        "{:<8s} exact {: 12.5e}  approximate {: 12.5e}".format(
+            key, exact[key], approx[key]
+        )
+    )
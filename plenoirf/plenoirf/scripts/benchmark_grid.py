@@ -0,0 +1,104 @@
+"""
+Benchmarks the grid on synthetic CORSIKA Cherenkov-bunches.
+
+Usage: python benchmark_grid.py [NUM_BUNCHES]
+"""
+import plenoirf
+import corsika_primary as cpw
+import numpy as np
+import timeit
+import sys
+
+argv = sys.argv
+if argv[0] == "ipython" and argv[1] == "-i":
+    argv.pop(1)
+
+NUM_BUNCHES = int(float(argv[1])) if len(argv) > 1 else 10 * 1000 * 1000
+NUM_REPETITIONS = 3
+
+prng = np.random.Generator(np.random.PCG64(seed=1))
+
+grid_geometry = plenoirf.grid.init_geometry(
+    instrument_aperture_outer_diameter=71.0,
+    bin_width_overhead=1.1,
+    instrument_field_of_view_outer_radius_deg=3.25,
+    instrument_pointing_direction=[0, 0, 1],
+    field_of_view_overhead=1.1,
+    num_bins_radius=512,
+)
+
+
+def make_cherenkov_bunches(prng, num_bunches):
+    cb = np.zeros(shape=(num_bunches, 8), dtype=np.float32)
+    cb[:, cpw.I.BUNCH.X] = prng.normal(scale=300 * cpw.M2CM, size=num_bunches)
+    cb[:, cpw.I.BUNCH.Y] = prng.normal(scale=300 * cpw.M2CM, size=num_bunches)
+    cb[:, cpw.I.BUNCH.CX] = prng.normal(scale=np.deg2rad(2), size=num_bunches)
+    cb[:, cpw.I.BUNCH.CY] = prng.normal(scale=np.deg2rad(2), size=num_bunches)
+    cb[:, cpw.I.BUNCH.TIME] = prng.normal(scale=10e-9, size=num_bunches)
+    cb[:, cpw.I.BUNCH.ZEM] = prng.uniform(1e5, 1e6, size=num_bunches)
+    cb[:, cpw.I.BUNCH.BSIZE] = prng.uniform(0.9, 1.0, size=num_bunches)
+    cb[:, cpw.I.BUNCH.WVL] = prng.uniform(250e-9, 700e-9, size=num_bunches)
+    return cb
+
+
+def report(name, func):
+    t = min(timeit.repeat(func, number=1, repeat=NUM_REPETITIONS))
+    print(
+        "{:<48s} {:9.3f}s  {:7.1f}M bunches/s".format(
+            name, t, 1e-6 * NUM_BUNCHES / t
+        )
+    )
+    return t
+
+
+cherenkov_bunches = make_cherenkov_bunches(prng=prng, num_bunches=NUM_BUNCHES)
+print("num. bunches: {:d}".format(NUM_BUNCHES))
+
+# histogram
+# ---------
+x = cpw.CM2M * cherenkov_bunches[:, cpw.I.BUNCH.X]
+y = cpw.CM2M * cherenkov_bunches[:, cpw.I.BUNCH.Y]
+w = cherenkov_bunches[:, cpw.I.BUNCH.BSIZE]
+xy_bin_edges = grid_geometry["xy_bin_edges"]
+
+t_ref = report(
+    "histogram2d_overflow_and_bin_idxs",
+    lambda: plenoirf.grid.histogram2d_overflow_and_bin_idxs(
+        x=x, y=y, weights=w, xy_bin_edges=xy_bin_edges
+    ),
+)
+t_uni = report(
+    "histogram2d_overflow_and_bin_idxs_uniform",
+    lambda: plenoirf.grid.histogram2d_overflow_and_bin_idxs_uniform(
+        x=x, y=y, weights=w, xy_bin_edges=xy_bin_edges
+    ),
+)
+print("speedup: {:.1f}".format(t_ref / t_uni))
+
+# field-of-view
+# -------------
+cx = cherenkov_bunches[:, cpw.I.BUNCH.CX]
+cy = cherenkov_bunches[:, cpw.I.BUNCH.CY]
+fov_deg = grid_geometry["field_of_view_radius_deg"]
+tilted_pointing = [np.sin(np.deg2rad(5.0)), 0.0, np.cos(np.deg2rad(5.0))]
+
+for name, pointing in [("zenith", [0, 0, 1]), ("tilted", tilted_pointing)]:
+    t_ref = report(
+        "_mask_inside_field_of_view_by_angle, " + name,
+        lambda: plenoirf.grid._mask_inside_field_of_view_by_angle(
+            cx=cx,
+            cy=cy,
+            field_of_view_radius_deg=fov_deg,
+            pointing_direction=pointing,
+        ),
+    )
+    t_cos = report(
+        "mask_inside_field_of_view, " + name,
+        lambda: plenoirf.grid.mask_inside_field_of_view(
+            cx=cx,
+            cy=cy,
+            field_of_view_radius_deg=fov_deg,
+            pointing_direction=pointing,
+        ),
+    )
+    print("speedup: {:.1f}".format(t_ref / t_cos))
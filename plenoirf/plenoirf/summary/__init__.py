@@ -17,6 +17,8 @@ from .. import production
 from .. import grid
 from .. import outer_telescope_array
 from . import figure
+from . import dag
+from . import fingerprint
 from .cosmic_flux import make_gamma_ray_reference_flux
 from .scripts_multiprocessing import run_parallel
 
@@ -146,7 +148,7 @@ def _estimate_num_events_past_trigger(run_dir, irf_config):
     num_events_past_trigger = 10 * 1000
     for site_key in irf_config["config"]["sites"]:
         for particle_key in irf_config["config"]["particles"]:
-            event_table = spt.read(
+            event_table = table.read(
                 path=os.path.join(
                     run_dir,
                     "event_table",
@@ -154,7 +156,7 @@ def _estimate_num_events_past_trigger(run_dir, irf_config):
                     particle_key,
                     "event_table.tar",
                 ),
-                structure=table.STRUCTURE,
+                level_keys=["pasttrigger"],
             )
             if event_table["pasttrigger"].shape[0] < num_events_past_trigger:
                 num_events_past_trigger = event_table["pasttrigger"].shape[0]
@@ -401,9 +403,22 @@ def read_train_test_frame(
     sk = site_key
     pk = particle_key
 
-    airshower_table = spt.read(
+    column_keys = {
+        "trigger": analysis.light_field_trigger_modi.make_column_keys(
+            trigger_config["modus"]
+        ),
+        "features": [
+            "num_photons",
+            "image_smallest_ellipse_num_photons_on_edge_field_of_view",
+        ],
+    }
+    for level_key in level_keys:
+        if level_key in table.STRUCTURE:
+            column_keys[level_key] = None
+
+    airshower_table = table.read(
         path=os.path.join(run_dir, "event_table", sk, pk, "event_table.tar",),
-        structure=table.STRUCTURE,
+        column_keys=column_keys,
     )
 
     airshower_table["transformed_features"] = spt.read(
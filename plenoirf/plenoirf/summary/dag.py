@@ -0,0 +1,787 @@
+"""
+The inputs and outputs of the summary's scripts.
+
+Each script declares its inputs and outputs as paths relative to the
+run_dir. A script depends on the scripts which write one of its inputs.
+When a script starts to read the output of an other script, its inputs
+must be declared here, see find_undeclared_inputs().
+"""
+import os
+
+SCRIPTS = {}
+
+SCRIPTS["0005_common_binning"] = {
+    "inputs": ["input", "summary/summary_config.json"],
+    "outputs": ["summary/0005_common_binning"],
+}
+
+SCRIPTS["0009_flux_of_gamma_rays"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+    ],
+    "outputs": ["summary/0009_flux_of_gamma_rays"],
+}
+
+SCRIPTS["0010_flux_of_cosmic_rays"] = {
+    "inputs": ["input", "summary/summary_config.json"],
+    "outputs": ["summary/0010_flux_of_cosmic_rays"],
+}
+
+SCRIPTS["0015_flux_of_airshowers"] = {
+    "inputs": [
+        "input",
+        "magnetic_deflection",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0010_flux_of_cosmic_rays",
+    ],
+    "outputs": ["summary/0015_flux_of_airshowers"],
+}
+
+SCRIPTS["0016_flux_of_airshowers_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0015_flux_of_airshowers",
+    ],
+    "outputs": ["summary/0016_flux_of_airshowers_plot"],
+}
+
+SCRIPTS["0017_flux_of_airshowers_rebin"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0015_flux_of_airshowers",
+    ],
+    "outputs": ["summary/0017_flux_of_airshowers_rebin"],
+}
+
+SCRIPTS["0030_splitting_train_and_test_sample"] = {
+    "inputs": ["input", "event_table", "summary/summary_config.json"],
+    "outputs": ["summary/0030_splitting_train_and_test_sample"],
+}
+
+SCRIPTS["0040_weights_from_thrown_to_expected_energy_spectrum"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0009_flux_of_gamma_rays",
+        "summary/0015_flux_of_airshowers",
+    ],
+    "outputs": [
+        "summary/0040_weights_from_thrown_to_expected_energy_spectrum",
+    ],
+}
+
+SCRIPTS["0054_passing_trigger_if_only_accepting_not_rejecting"] = {
+    "inputs": ["input", "event_table", "summary/summary_config.json"],
+    "outputs": [
+        "summary/0054_passing_trigger_if_only_accepting_not_rejecting",
+    ],
+}
+
+SCRIPTS["0055_passing_trigger"] = {
+    "inputs": ["input", "event_table", "summary/summary_config.json"],
+    "outputs": ["summary/0055_passing_trigger"],
+}
+
+SCRIPTS["0056_passing_basic_quality"] = {
+    "inputs": ["input", "event_table", "summary/summary_config.json"],
+    "outputs": ["summary/0056_passing_basic_quality"],
+}
+
+SCRIPTS["0059_passing_trajectory_quality"] = {
+    "inputs": ["input", "event_table", "summary/summary_config.json"],
+    "outputs": ["summary/0059_passing_trajectory_quality"],
+}
+
+SCRIPTS["0060_cherenkov_photon_classification_plot"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+    ],
+    "outputs": ["summary/0060_cherenkov_photon_classification_plot"],
+}
+
+SCRIPTS["0061_plot_features"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0040_weights_from_thrown_to_expected_energy_spectrum",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+    ],
+    "outputs": ["summary/0061_plot_features"],
+}
+
+SCRIPTS["0062_transform_features"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0030_splitting_train_and_test_sample",
+    ],
+    "outputs": ["summary/0062_transform_features"],
+}
+
+SCRIPTS["0064_airshower_maximim_plot"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0040_weights_from_thrown_to_expected_energy_spectrum",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+    ],
+    "outputs": ["summary/0064_airshower_maximim_plot"],
+}
+
+SCRIPTS["0065_learning_airshower_maximum_and_energy"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0030_splitting_train_and_test_sample",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+        "summary/0059_passing_trajectory_quality",
+        "summary/0062_transform_features",
+    ],
+    "outputs": ["summary/0065_learning_airshower_maximum_and_energy"],
+}
+
+SCRIPTS["0066_energy_estimate_quality"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+        "summary/0059_passing_trajectory_quality",
+        "summary/0065_learning_airshower_maximum_and_energy",
+    ],
+    "outputs": ["summary/0066_energy_estimate_quality"],
+}
+
+SCRIPTS["0070_trigger_probability_vs_cherenkov_size"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0055_passing_trigger",
+    ],
+    "outputs": ["summary/0070_trigger_probability_vs_cherenkov_size"],
+}
+
+SCRIPTS["0071_trigger_probability_vs_cherenkov_size_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0070_trigger_probability_vs_cherenkov_size",
+    ],
+    "outputs": ["summary/0071_trigger_probability_vs_cherenkov_size_plot"],
+}
+
+SCRIPTS["0074_trigger_probability_vs_cherenkov_density_on_ground"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0054_passing_trigger_if_only_accepting_not_rejecting",
+        "summary/0055_passing_trigger",
+    ],
+    "outputs": [
+        "summary/0074_trigger_probability_vs_cherenkov_density_on_ground",
+    ],
+}
+
+SCRIPTS["0075_trigger_probability_vs_cherenkov_density_on_ground_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0074_trigger_probability_vs_cherenkov_density_on_ground",
+    ],
+    "outputs": [
+        "summary/0075_trigger_probability_vs_cherenkov_density_on_ground_plot",
+    ],
+}
+
+SCRIPTS["0100_trigger_acceptance_for_cosmic_particles"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+    ],
+    "outputs": ["summary/0100_trigger_acceptance_for_cosmic_particles"],
+}
+
+SCRIPTS["0101_trigger_acceptance_for_cosmic_particles_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0100_trigger_acceptance_for_cosmic_particles",
+    ],
+    "outputs": ["summary/0101_trigger_acceptance_for_cosmic_particles_plot"],
+}
+
+SCRIPTS["0102_trigger_acceptance_for_cosmic_particles_vs_max_scatter_angle"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+    ],
+    "outputs": [
+        "summary/0102_trigger_acceptance_for_cosmic_particles_vs_max_scatter_angle",
+    ],
+}
+
+SCRIPTS["0103_trigger_acceptance_for_cosmic_particles_vs_max_scatter_angle_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0102_trigger_acceptance_for_cosmic_particles_vs_max_scatter_angle",
+    ],
+    "outputs": [
+        "summary/0103_trigger_acceptance_for_cosmic_particles_vs_max_scatter_angle_plot",
+    ],
+}
+
+SCRIPTS["0105_trigger_rates_for_cosmic_particles"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0009_flux_of_gamma_rays",
+        "summary/0015_flux_of_airshowers",
+        "summary/0100_trigger_acceptance_for_cosmic_particles",
+    ],
+    "outputs": ["summary/0105_trigger_rates_for_cosmic_particles"],
+}
+
+SCRIPTS["0106_trigger_rates_for_cosmic_particles_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0105_trigger_rates_for_cosmic_particles",
+    ],
+    "outputs": ["summary/0106_trigger_rates_for_cosmic_particles_plot"],
+}
+
+SCRIPTS["0107_trigger_rates_for_cosmic_particles_vs_max_scatter_angle"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0017_flux_of_airshowers_rebin",
+        "summary/0102_trigger_acceptance_for_cosmic_particles_vs_max_scatter_angle",
+    ],
+    "outputs": [
+        "summary/0107_trigger_rates_for_cosmic_particles_vs_max_scatter_angle",
+    ],
+}
+
+SCRIPTS["0108_trigger_rates_for_cosmic_particles_vs_max_scatter_angle_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0107_trigger_rates_for_cosmic_particles_vs_max_scatter_angle",
+    ],
+    "outputs": [
+        "summary/0108_trigger_rates_for_cosmic_particles_vs_max_scatter_angle_plot",
+    ],
+}
+
+SCRIPTS["0120_trigger_rates_for_night_sky_background"] = {
+    "inputs": ["input", "event_table", "summary/summary_config.json"],
+    "outputs": ["summary/0120_trigger_rates_for_night_sky_background"],
+}
+
+SCRIPTS["0130_trigger_ratescan_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0105_trigger_rates_for_cosmic_particles",
+        "summary/0120_trigger_rates_for_night_sky_background",
+    ],
+    "outputs": ["summary/0130_trigger_ratescan_plot"],
+}
+
+SCRIPTS["0131_trigger_rates_total"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0105_trigger_rates_for_cosmic_particles",
+        "summary/0120_trigger_rates_for_night_sky_background",
+    ],
+    "outputs": ["summary/0131_trigger_rates_total"],
+}
+
+SCRIPTS["0210_trajectory_estimating_quality"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0040_weights_from_thrown_to_expected_energy_spectrum",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+        "summary/0059_passing_trajectory_quality",
+    ],
+    "outputs": ["summary/0210_trajectory_estimating_quality"],
+}
+
+SCRIPTS["0212_trajectory_debugging_with_example_events"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "light_field_geometry",
+        "summary/summary_config.json",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+    ],
+    "outputs": ["summary/0212_trajectory_debugging_with_example_events"],
+}
+
+SCRIPTS["0213_trajectory_benchmarking"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+        "summary/0059_passing_trajectory_quality",
+    ],
+    "outputs": ["summary/0213_trajectory_benchmarking"],
+}
+
+SCRIPTS["0214_trajectory_benchmarking_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0213_trajectory_benchmarking",
+    ],
+    "outputs": ["summary/0214_trajectory_benchmarking_plot"],
+}
+
+SCRIPTS["0230_point_spread_function"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+        "summary/0059_passing_trajectory_quality",
+        "summary/0065_learning_airshower_maximum_and_energy",
+    ],
+    "outputs": ["summary/0230_point_spread_function"],
+}
+
+SCRIPTS["0300_onregion_trigger_acceptance"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+        "summary/0059_passing_trajectory_quality",
+    ],
+    "outputs": ["summary/0300_onregion_trigger_acceptance"],
+}
+
+SCRIPTS["0301_onregion_trigger_acceptance_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0100_trigger_acceptance_for_cosmic_particles",
+        "summary/0300_onregion_trigger_acceptance",
+    ],
+    "outputs": ["summary/0301_onregion_trigger_acceptance_plot"],
+}
+
+SCRIPTS["0320_onregion_trigger_rates_for_cosmic_rays"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0009_flux_of_gamma_rays",
+        "summary/0015_flux_of_airshowers",
+        "summary/0300_onregion_trigger_acceptance",
+    ],
+    "outputs": ["summary/0320_onregion_trigger_rates_for_cosmic_rays"],
+}
+
+SCRIPTS["0325_onregion_trigger_rates_for_cosmic_rays_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0320_onregion_trigger_rates_for_cosmic_rays",
+    ],
+    "outputs": ["summary/0325_onregion_trigger_rates_for_cosmic_rays_plot"],
+}
+
+SCRIPTS["0340_trigger_integral_spectral_exclusion_zone_as_in_phd"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0100_trigger_acceptance_for_cosmic_particles",
+        "summary/0105_trigger_rates_for_cosmic_particles",
+    ],
+    "outputs": [
+        "summary/0340_trigger_integral_spectral_exclusion_zone_as_in_phd",
+    ],
+}
+
+SCRIPTS["0530_diffsens_background_diff_rates"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0017_flux_of_airshowers_rebin",
+        "summary/0066_energy_estimate_quality",
+        "summary/0300_onregion_trigger_acceptance",
+    ],
+    "outputs": ["summary/0530_diffsens_background_diff_rates"],
+}
+
+SCRIPTS["0534_diffsens_signal_area_and_background_rates_for_multiple_scenarios"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0066_energy_estimate_quality",
+        "summary/0300_onregion_trigger_acceptance",
+        "summary/0530_diffsens_background_diff_rates",
+    ],
+    "outputs": [
+        "summary/0534_diffsens_signal_area_and_background_rates_for_multiple_scenarios",
+    ],
+}
+
+SCRIPTS["0535_diffsens_signal_area_and_background_rates_for_multiple_scenarios_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0300_onregion_trigger_acceptance",
+        "summary/0534_diffsens_signal_area_and_background_rates_for_multiple_scenarios",
+    ],
+    "outputs": [
+        "summary/0535_diffsens_signal_area_and_background_rates_for_multiple_scenarios_plot",
+    ],
+}
+
+SCRIPTS["0539_diffsens_observation_times"] = {
+    "inputs": ["input", "summary/summary_config.json"],
+    "outputs": ["summary/0539_diffsens_observation_times"],
+}
+
+SCRIPTS["0540_diffsens_estimate"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0534_diffsens_signal_area_and_background_rates_for_multiple_scenarios",
+        "summary/0539_diffsens_observation_times",
+    ],
+    "outputs": ["summary/0540_diffsens_estimate"],
+}
+
+SCRIPTS["0544_diffsens_estimate_fermi_lat"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0539_diffsens_observation_times",
+    ],
+    "outputs": ["summary/0544_diffsens_estimate_fermi_lat"],
+}
+
+SCRIPTS["0545_diffsens_estimate_cta_south"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0539_diffsens_observation_times",
+    ],
+    "outputs": ["summary/0545_diffsens_estimate_cta_south"],
+}
+
+SCRIPTS["0550_diffsens_plot"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0540_diffsens_estimate",
+        "summary/0544_diffsens_estimate_fermi_lat",
+        "summary/0545_diffsens_estimate_cta_south",
+    ],
+    "outputs": ["summary/0550_diffsens_plot"],
+}
+
+SCRIPTS["0610_sensitivity_vs_observation_time"] = {
+    "inputs": [
+        "input",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0540_diffsens_estimate",
+    ],
+    "outputs": ["summary/0610_sensitivity_vs_observation_time"],
+}
+
+SCRIPTS["0611_sensitivity_vs_observation_time_blank"] = {
+    "inputs": ["input", "summary/summary_config.json"],
+    "outputs": ["summary/0611_sensitivity_vs_observation_time_blank"],
+}
+
+SCRIPTS["0810_grid_direction_of_primaries_plot"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+    ],
+    "outputs": ["summary/0810_grid_direction_of_primaries_plot"],
+}
+
+SCRIPTS["0811_grid_direction_of_primaries_plot_radial"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+    ],
+    "outputs": ["summary/0811_grid_direction_of_primaries_plot_radial"],
+}
+
+SCRIPTS["0815_grid_illumination_plot"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+    ],
+    "outputs": ["summary/0815_grid_illumination_plot"],
+}
+
+SCRIPTS["0817_grid_illumination_hadron_vs_gamma"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+    ],
+    "outputs": ["summary/0817_grid_illumination_hadron_vs_gamma"],
+}
+
+SCRIPTS["0820_passing_trigger_of_outer_array_of_small_telescopes"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0074_trigger_probability_vs_cherenkov_density_on_ground",
+    ],
+    "outputs": [
+        "summary/0820_passing_trigger_of_outer_array_of_small_telescopes",
+    ],
+}
+
+SCRIPTS["0821_passing_trigger_of_outer_array_of_small_telescopes_plot"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0055_passing_trigger",
+        "summary/0820_passing_trigger_of_outer_array_of_small_telescopes",
+    ],
+    "outputs": [
+        "summary/0821_passing_trigger_of_outer_array_of_small_telescopes_plot",
+    ],
+}
+
+SCRIPTS["0910_runtime"] = {
+    "inputs": ["input", "event_table", "summary/summary_config.json"],
+    "outputs": ["summary/0910_runtime"],
+}
+
+SCRIPTS["0981_make_document"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "summary/summary_config.json",
+        "summary/0005_common_binning",
+        "summary/0016_flux_of_airshowers_plot",
+        "summary/0060_cherenkov_photon_classification_plot",
+        "summary/0066_energy_estimate_quality",
+        "summary/0071_trigger_probability_vs_cherenkov_size_plot",
+        "summary/0075_trigger_probability_vs_cherenkov_density_on_ground_plot",
+        "summary/0101_trigger_acceptance_for_cosmic_particles_plot",
+        "summary/0106_trigger_rates_for_cosmic_particles_plot",
+        "summary/0108_trigger_rates_for_cosmic_particles_vs_max_scatter_angle_plot",
+        "summary/0130_trigger_ratescan_plot",
+        "summary/0131_trigger_rates_total",
+        "summary/0213_trajectory_benchmarking",
+        "summary/0230_point_spread_function",
+        "summary/0301_onregion_trigger_acceptance_plot",
+        "summary/0325_onregion_trigger_rates_for_cosmic_rays_plot",
+        "summary/0550_diffsens_plot",
+        "summary/0610_sensitivity_vs_observation_time",
+        "summary/0820_passing_trigger_of_outer_array_of_small_telescopes",
+        "summary/0821_passing_trigger_of_outer_array_of_small_telescopes_plot",
+    ],
+    "outputs": ["summary/0981_make_document"],
+}
+
+SCRIPTS["1010_plot_refocus_stack_for_example_events"] = {
+    "inputs": [
+        "input",
+        "event_table",
+        "light_field_geometry",
+        "summary/summary_config.json",
+        "summary/0055_passing_trigger",
+        "summary/0056_passing_basic_quality",
+    ],
+    "outputs": ["summary/1010_plot_refocus_stack_for_example_events"],
+}
+
+SCRIPTS["1100_plot_summation_lixels_into_seven_pixels"] = {
+    "inputs": ["light_field_geometry", "summary/summary_config.json"],
+    "outputs": ["summary/1100_plot_summation_lixels_into_seven_pixels"],
+}
+
+SCRIPTS["1110_plot_summation_photo_sensors_into_pixels_to_compensate_aberrations"] = {
+    "inputs": ["light_field_geometry", "summary/summary_config.json"],
+    "outputs": [
+        "summary/1110_plot_summation_photo_sensors_into_pixels_to_compensate_aberrations",
+    ],
+}
+
+SCRIPTS["1200_demonstrate_tomography"] = {
+    "inputs": ["input", "light_field_geometry", "summary/summary_config.json"],
+    "outputs": [
+        "summary/1200_demonstrate_tomography",
+        "demo_helium_for_tomography",
+    ],
+}
+
+
+def _overlap(a, b):
+    """
+    Returns True when one of the paths a and b is within the other.
+    """
+    a = a.strip("/")
+    b = b.strip("/")
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def find_dependencies(script_names, scripts=SCRIPTS):
+    """
+    Returns dependencies[script_name], the list of the script_names which
+    write one of the script's inputs.
+    """
+    dependencies = {}
+    for name in script_names:
+        dependencies[name] = []
+        for other in script_names:
+            if other == name:
+                continue
+            if any(
+                _overlap(i, o)
+                for i in scripts[name]["inputs"]
+                for o in scripts[other]["outputs"]
+            ):
+                dependencies[name].append(other)
+    return dependencies
+
+
+def find_dependants(dependencies, script_names):
+    """
+    Returns the sorted script_names and all the scripts which depend on
+    them, directly or indirectly.
+    """
+    out = set(script_names)
+    num = -1
+    while num != len(out):
+        num = len(out)
+        for name in dependencies:
+            if set(dependencies[name]) & out:
+                out.add(name)
+    return sorted(out)
+
+
+def topological_order(dependencies):
+    """
+    Returns the script_names so that each script comes after its
+    dependencies. Raises an AssertionError on a cycle.
+    """
+    order = []
+    done = set()
+    while len(order) < len(dependencies):
+        ready = [
+            name
+            for name in sorted(dependencies)
+            if name not in done and set(dependencies[name]) <= done
+        ]
+        assert len(ready) > 0, "Dependencies have a cycle."
+        order += ready
+        done.update(ready)
+    return order
+
+
+def find_undeclared_inputs(script_dir, scripts=SCRIPTS):
+    """
+    Returns undeclared[script_name], the list of the other scripts which
+    are mentioned in the script's source but are not declared as its
+    inputs. A script without declaration has None.
+    """
+    script_names = sorted(
+        os.path.splitext(f)[0]
+        for f in os.listdir(script_dir)
+        if str.isdigit(f[0:4]) and f.endswith(".py")
+    )
+    dependencies = find_dependencies(
+        script_names=[n for n in script_names if n in scripts],
+        scripts=scripts,
+    )
+    undeclared = {}
+    for name in script_names:
+        if name not in scripts:
+            undeclared[name] = None
+            continue
+        with open(os.path.join(script_dir, name + ".py"), "rt") as f:
+            code = f.read()
+        missing = [
+            other
+            for other in script_names
+            if other != name
+            and str.find(code, other) >= 0
+            and other not in dependencies[name]
+        ]
+        if missing:
+            undeclared[name] = missing
+    return undeclared
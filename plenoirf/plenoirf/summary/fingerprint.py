@@ -0,0 +1,198 @@
+"""
+Fingerprints of the summary's scripts to re-run only what changed.
+
+The fingerprint of a script is the sha256 of:
+
+    - the source of the script,
+    - the subtree of summary_config.json which the script reads, this is
+      the top-level keys in sum_config["..."],
+    - the digests of its declared inputs (see dag.py).
+
+The digest of an other script's output is the sha256 of its files, and is
+recorded in summary/manifest.json when the script completes. The digest of
+an input outside of the summary, like the event_table, is made from the
+sizes and modification-times of its files, as its content is too large to
+be read every time.
+"""
+import os
+import re
+import json
+import shutil
+import hashlib
+
+MANIFEST_FILENAME = "manifest.json"
+SUMMARY_CONFIG_INPUT = "summary/summary_config.json"
+
+# Derived caches which are written while the summary runs, and logs.
+SKIP_SUFFIXES = (".columns", ".tmp")
+SKIP_NAMES = ("stdout.md", "stderr.md")
+
+
+def _sha256(s):
+    return hashlib.sha256(s.encode()).hexdigest()
+
+
+def _hash_file(path, block_size=2 ** 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def _skip(name):
+    return name in SKIP_NAMES or name.endswith(SKIP_SUFFIXES)
+
+
+def digest_of_path(path, content=True):
+    """
+    Returns the digest of the file or directory in path. With content, the
+    files are read, else only their sizes and modification-times are used.
+    """
+    if not os.path.exists(path):
+        return "missing"
+    if os.path.isfile(path):
+        paths = [("", path)]
+    else:
+        paths = []
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not _skip(d))
+            for f in sorted(files):
+                if _skip(f):
+                    continue
+                fpath = os.path.join(root, f)
+                paths.append((os.path.relpath(fpath, path), fpath))
+    h = hashlib.sha256()
+    for relpath, fpath in paths:
+        h.update(relpath.encode())
+        if content:
+            h.update(_hash_file(fpath).encode())
+        else:
+            st = os.stat(fpath)
+            h.update("{:d},{:d}".format(st.st_size, st.st_mtime_ns).encode())
+    return h.hexdigest()
+
+
+def _is_summary_path(relpath):
+    return relpath.strip("/").startswith("summary/")
+
+
+def digest_of_input(run_dir, relpath):
+    return digest_of_path(
+        path=os.path.join(run_dir, relpath),
+        content=_is_summary_path(relpath),
+    )
+
+
+def digest_of_outputs(run_dir, outputs):
+    return _sha256(
+        json.dumps(
+            {o: digest_of_input(run_dir=run_dir, relpath=o) for o in outputs},
+            sort_keys=True,
+        )
+    )
+
+
+def find_config_keys(code):
+    """
+    Returns the sorted top-level keys of the summary-config which the
+    script's code reads, or None when the code uses the config in an other
+    way and all of it must be hashed.
+    """
+    keys = set(re.findall(r'\bsum_config\[\s*"(\w+)"\s*\]', code))
+    other_uses = re.findall(r"\bsum_config\b(?!\s*\[)(?!\s*=[^=])", code)
+    if other_uses:
+        return None
+    return sorted(keys)
+
+
+def digest_of_config_subtree(summary_config, keys):
+    if keys is None:
+        subtree = summary_config
+    else:
+        subtree = {k: summary_config.get(k) for k in keys}
+    return _sha256(json.dumps(subtree, sort_keys=True))
+
+
+def make_fingerprint(run_dir, script_path, script, manifest):
+    """
+    Returns the fingerprint of the script, and the digests it is made of.
+
+    Parameters
+    ----------
+    script : dict
+        The declaration of the script's inputs and outputs in dag.SCRIPTS.
+    manifest : dict
+        The manifest, its output_digests are used for the inputs written
+        by other scripts.
+    """
+    with open(script_path, "rt") as f:
+        code = f.read()
+    digests = {"script": _sha256(code), "inputs": {}}
+    for relpath in script["inputs"]:
+        if relpath == SUMMARY_CONFIG_INPUT:
+            with open(os.path.join(run_dir, relpath), "rt") as f:
+                summary_config = json.loads(f.read())
+            digest = digest_of_config_subtree(
+                summary_config=summary_config, keys=find_config_keys(code),
+            )
+        else:
+            digest = _output_digest_in_manifest(manifest, relpath)
+            if digest is None:
+                digest = digest_of_input(run_dir=run_dir, relpath=relpath)
+        digests["inputs"][relpath] = digest
+    return {
+        "fingerprint": _sha256(json.dumps(digests, sort_keys=True)),
+        "digests": digests,
+    }
+
+
+def _output_digest_in_manifest(manifest, relpath):
+    for name in manifest:
+        if relpath in manifest[name]["outputs"]:
+            return manifest[name]["output_digest"]
+    return None
+
+
+def is_up_to_date(run_dir, manifest, script_name, script, fingerprint):
+    """
+    Returns True when the script completed before with this fingerprint,
+    and its outputs still exist.
+    """
+    if script_name not in manifest:
+        return False
+    if manifest[script_name]["fingerprint"] != fingerprint["fingerprint"]:
+        return False
+    for relpath in script["outputs"]:
+        if not os.path.exists(os.path.join(run_dir, relpath)):
+            return False
+    return True
+
+
+def make_manifest_entry(run_dir, script, fingerprint):
+    return {
+        "fingerprint": fingerprint["fingerprint"],
+        "digests": fingerprint["digests"],
+        "outputs": list(script["outputs"]),
+        "output_digest": digest_of_outputs(
+            run_dir=run_dir, outputs=script["outputs"]
+        ),
+    }
+
+
+def read_manifest(run_dir):
+    path = os.path.join(run_dir, "summary", MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rt") as f:
+        return json.loads(f.read())
+
+
+def write_manifest(run_dir, manifest):
+    path = os.path.join(run_dir, "summary", MANIFEST_FILENAME)
+    with open(path + ".tmp", "wt") as f:
+        f.write(json.dumps(manifest, indent=4, sort_keys=True))
+    shutil.move(path + ".tmp", path)
@@ -23,11 +23,11 @@ for sk in SITES:
         site_dir = os.path.join(pa["out_dir"], sk)
         os.makedirs(site_dir, exist_ok=True)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={"primary": []},
         )
 
         train_idxs, test_idxs = sklearn.model_selection.train_test_split(
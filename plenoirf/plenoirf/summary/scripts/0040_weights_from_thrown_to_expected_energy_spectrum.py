@@ -1,7 +1,6 @@
 #!/usr/bin/python
 import sys
 import plenoirf as irf
-import sparse_numeric_table as spt
 import os
 import numpy as np
 import sebastians_matplotlib_addons as seb
@@ -85,11 +84,12 @@ for sk in SITES:
         thrown_spectrum["rates"][sk][pk] = {}
         energy_ranges[sk][pk] = {}
 
-        _table = spt.read(
+        _table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            level_keys=["primary"],
+            column_keys={"primary": ["energy_GeV"]},
         )
 
         thrown_spectrum["rates"][sk][pk] = np.histogram(
@@ -1,7 +1,6 @@
 #!/usr/bin/python
 import sys
 import plenoirf as irf
-import sparse_numeric_table as spt
 import os
 import json_numpy
 
@@ -22,11 +21,16 @@ for sk in irf_config["config"]["sites"]:
         sk_pk_dir = os.path.join(pa["out_dir"], sk, pk)
         os.makedirs(sk_pk_dir, exist_ok=True)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            level_keys=["trigger"],
+            column_keys={
+                "trigger": irf.analysis.light_field_trigger_modi.make_column_keys(
+                    trigger_modus
+                )
+            },
         )
 
         idx_pasttrigger = irf.analysis.light_field_trigger_modi.make_indices(
@@ -1,7 +1,6 @@
 #!/usr/bin/python
 import sys
 import plenoirf as irf
-import sparse_numeric_table as spt
 import os
 import json_numpy
 
@@ -22,7 +21,7 @@ for site_key in irf_config["config"]["sites"]:
         site_particle_dir = os.path.join(pa["out_dir"], site_key, particle_key)
         os.makedirs(site_particle_dir, exist_ok=True)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"],
                 "event_table",
@@ -30,7 +29,13 @@ for site_key in irf_config["config"]["sites"]:
                 particle_key,
                 "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            level_keys=["features"],
+            column_keys={
+                "features": [
+                    "num_photons",
+                    "image_smallest_ellipse_num_photons_on_edge_field_of_view",
+                ]
+            },
         )
 
         idx_pastquality = irf.analysis.cuts.cut_quality(
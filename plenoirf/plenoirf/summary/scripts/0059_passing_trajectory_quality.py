@@ -19,11 +19,11 @@ for sk in irf_config["config"]["sites"]:
         site_particle_dir = os.path.join(pa["out_dir"], sk, pk)
         os.makedirs(site_particle_dir, exist_ok=True)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar"
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys=irf.reconstruction.trajectory_quality.make_column_keys(),
         )
 
         event_frame = irf.reconstruction.trajectory_quality.make_rectangular_table(
@@ -40,9 +40,18 @@ for sk in irf_config["config"]["sites"]:
 
         site_particle_prefix = "{:s}_{:s}".format(sk, pk)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=opj(pa["run_dir"], "event_table", sk, pk, "event_table.tar",),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": ["energy_GeV"],
+                "trigger": ["num_cherenkov_pe"],
+                CHCL: [
+                    "num_true_positives",
+                    "num_false_negatives",
+                    "num_false_positives",
+                ],
+                "features": ["num_photons"],
+            },
         )
 
         idx_common = spt.intersection(
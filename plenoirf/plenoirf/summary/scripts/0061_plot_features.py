@@ -42,11 +42,12 @@ for sk in SITES:
     tables[sk] = {}
     for pk in PARTICLES:
 
-        _table = spt.read(
+        _table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            level_keys=["primary", "features"],
+            column_keys={"primary": ["energy_GeV"]},
         )
 
         idx_common = spt.intersection(
@@ -34,11 +34,11 @@ for sk in SITES:
     ft_trafo[sk] = {}
     for pk in ["gamma"]:
 
-        _table = spt.read(
+        _table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            level_keys=["features"],
         )
 
         features = spt.cut_table_on_indices(
@@ -65,11 +65,11 @@ for sk in SITES:
     for pk in PARTICLES:
         transformed_features[sk][pk] = {}
 
-        features = spt.read(
+        features = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            level_keys=["features"],
         )["features"]
         transformed_features[sk][pk][spt.IDX] = np.array(features[spt.IDX])
 
@@ -45,11 +45,18 @@ distance_bin_edges = np.geomspace(5e3, 25e3, num_bins + 1)
 
 for sk in SITES:
     for pk in PARTICLES:
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": ["energy_GeV"],
+                "cherenkovsize": [],
+                "cherenkovpool": ["maximum_asl_m"],
+                "core": [],
+                "trigger": [],
+                "features": ["image_smallest_ellipse_object_distance"],
+            },
         )
 
         idx_common = spt.intersection(
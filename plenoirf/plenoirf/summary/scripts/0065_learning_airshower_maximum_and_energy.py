@@ -86,9 +86,13 @@ def read_event_frame(
     sk = site_key
     pk = particle_key
 
-    airshower_table = spt.read(
+    airshower_table = irf.table.read(
         path=os.path.join(run_dir, "event_table", sk, pk, "event_table.tar",),
-        structure=irf.table.STRUCTURE,
+        column_keys={
+            "primary": ["energy_GeV"],
+            "cherenkovpool": ["maximum_asl_m"],
+            "reconstructed_trajectory": ["x_m", "y_m", "cx_rad", "cy_rad"],
+        },
     )
 
     airshower_table["transformed_features"] = spt.read(
@@ -53,24 +53,14 @@ min_number_samples = 1
 mk = "energy"
 
 
-def align_on_idx(input_idx, input_values, target_idxs):
-    Q = {}
-    for ii in range(len(input_idx)):
-        Q[input_idx[ii]] = input_values[ii]
-    aligned_values = np.nan * np.ones(target_idxs.shape[0])
-    for ii in range(target_idxs.shape[0]):
-        aligned_values[ii] = Q[target_idxs[ii]]
-    return aligned_values
-
-
 for sk in SITES:
     os.makedirs(os.path.join(pa["out_dir"], sk), exist_ok=True)
     for pk in PARTICLES:
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={"primary": ["energy_GeV"]},
         )
 
         idx_valid = spt.intersection(
@@ -87,10 +77,11 @@ for sk in SITES:
         )
 
         true_energy = valid_event_table["primary"]["energy_GeV"]
-        reco_energy = align_on_idx(
-            input_idx=reconstructed_energy[sk][pk][mk]["idx"],
-            input_values=reconstructed_energy[sk][pk][mk]["energy"],
-            target_idxs=valid_event_table["primary"]["idx"],
+        reco_energy = irf.join.left(
+            keys=reconstructed_energy[sk][pk][mk]["idx"],
+            values=reconstructed_energy[sk][pk][mk]["energy"],
+            target_keys=valid_event_table["primary"]["idx"],
+            require_all=True,
         )
 
         cm = confusion_matrix.init(
@@ -27,7 +27,7 @@ for site_key in irf_config["config"]["sites"]:
         site_particle_dir = opj(pa["out_dir"], site_key, particle_key)
         os.makedirs(site_particle_dir, exist_ok=True)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"],
                 "event_table",
@@ -35,7 +35,7 @@ for site_key in irf_config["config"]["sites"]:
                 particle_key,
                 "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={"trigger": ["num_cherenkov_pe"]},
         )
 
         key = "trigger_probability_vs_cherenkov_size"
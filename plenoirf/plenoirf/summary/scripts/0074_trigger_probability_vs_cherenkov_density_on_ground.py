@@ -42,11 +42,11 @@ for sk in SITES:
         site_particle_dir = opj(pa["out_dir"], sk, pk)
         os.makedirs(site_particle_dir, exist_ok=True)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={"cherenkovsizepart": ["num_photons"], "trigger": []},
         )
 
         for tm in trigger_modi:
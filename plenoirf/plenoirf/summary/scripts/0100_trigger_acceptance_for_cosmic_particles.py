@@ -39,11 +39,27 @@ for sk in SITES:
 
         os.makedirs(site_particle_dir, exist_ok=True)
 
-        diffuse_particle_table = spt.read(
+        diffuse_particle_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": [
+                    "energy_GeV",
+                    "azimuth_rad",
+                    "zenith_rad",
+                    "solid_angle_thrown_sr",
+                ],
+                "grid": [
+                    "area_thrown_m2",
+                    "num_bins_above_threshold",
+                    "num_bins_thrown",
+                    "num_reuses",
+                ],
+                "trigger": irf.analysis.light_field_trigger_modi.make_column_keys(
+                    trigger_modus
+                ),
+            },
         )
 
         # point source
@@ -70,13 +86,14 @@ for sk in SITES:
         absolute_uncertainty = []
         for threshold in trigger_thresholds:
             idx_detected = irf.analysis.light_field_trigger_modi.make_indices(
-                trigger_table=point_particle_table["trigger"],
+                trigger_table=diffuse_particle_table["trigger"],
                 threshold=threshold,
                 modus=trigger_modus,
             )
-            mask_detected = spt.make_mask_of_right_in_left(
-                left_indices=point_particle_table["primary"][spt.IDX],
-                right_indices=idx_detected,
+            mask_detected = irf.analysis.effective_quantity.make_mask_detected_for_reused_showers(
+                shower_indices=point_particle_table["primary"][spt.IDX],
+                num_reuses=point_particle_table["grid"]["num_reuses"],
+                detected_indices=idx_detected,
             )
             (
                 _q_eff,
@@ -131,9 +148,10 @@ for sk in SITES:
                 threshold=threshold,
                 modus=trigger_modus,
             )
-            mask_detected = spt.make_mask_of_right_in_left(
-                left_indices=diffuse_particle_table["primary"][spt.IDX],
-                right_indices=idx_detected,
+            mask_detected = irf.analysis.effective_quantity.make_mask_detected_for_reused_showers(
+                shower_indices=diffuse_particle_table["primary"][spt.IDX],
+                num_reuses=diffuse_particle_table["grid"]["num_reuses"],
+                detected_indices=idx_detected,
             )
             (
                 _q_eff,
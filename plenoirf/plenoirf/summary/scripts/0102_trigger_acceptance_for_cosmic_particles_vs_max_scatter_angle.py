@@ -44,11 +44,25 @@ for sk in SITES:
 
         os.makedirs(sk_pk_dir, exist_ok=True)
 
-        shower_table = spt.read(
+        shower_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": [
+                    "energy_GeV",
+                    "azimuth_rad",
+                    "zenith_rad",
+                    "magnet_azimuth_rad",
+                    "magnet_zenith_rad",
+                ],
+                "grid": [
+                    "area_thrown_m2",
+                    "num_bins_above_threshold",
+                    "num_bins_thrown",
+                    "num_reuses",
+                ],
+            },
         )
 
         # diffuse source
@@ -111,9 +125,10 @@ for sk in SITES:
                 level_keys=["primary", "grid"],
             )
 
-            S_mask_shower_detected = spt.make_mask_of_right_in_left(
-                left_indices=S_shower_table["primary"][spt.IDX],
-                right_indices=passing_trigger[sk][pk]["idx"],
+            S_mask_shower_detected = irf.analysis.effective_quantity.make_mask_detected_for_reused_showers(
+                shower_indices=S_shower_table["primary"][spt.IDX],
+                num_reuses=S_shower_table["grid"]["num_reuses"],
+                detected_indices=passing_trigger[sk][pk]["idx"],
             )
 
             S_quantity_scatter = (
@@ -42,11 +42,16 @@ for sk in SITES:
         ),
     }
     for pk in PARTICLES:
-        airshower_table = spt.read(
+        airshower_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "trigger": ["num_cherenkov_pe"]
+                + irf.analysis.light_field_trigger_modi.make_column_keys(
+                    trigger_modus
+                )
+            },
         )
 
         # The true num of Cherenkov-photons in the light-field-sequence must be
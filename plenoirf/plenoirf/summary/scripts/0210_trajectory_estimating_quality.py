@@ -156,17 +156,6 @@ def write_correlation_figure(
     seb.close(fig)
 
 
-def align_values_with_event_frame(event_frame, idxs, values):
-    Q = {}
-    for ii in range(len(idxs)):
-        Q[idxs[ii]] = values[ii]
-
-    aligned_values = np.nan * np.ones(event_frame.shape[0])
-    for ii in range(event_frame.shape[0]):
-        aligned_values[ii] = Q[event_frame[spt.IDX][ii]]
-    return aligned_values
-
-
 the = "theta"
 
 QP = {}
@@ -180,11 +169,19 @@ for sk in SITES:
 
 for sk in SITES:
     for pk in PARTICLES:
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar"
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys=irf.reconstruction.trajectory_quality.make_column_keys(
+                {
+                    "primary": ["energy_GeV"],
+                    "features": [
+                        "image_smallest_ellipse_object_distance",
+                        "image_num_islands",
+                    ],
+                }
+            ),
         )
         idx_common = spt.intersection(
             [passing_trigger[sk][pk]["idx"], passing_quality[sk][pk]["idx"],]
@@ -198,10 +195,11 @@ for sk in SITES:
             plenoscope_pointing=irf_config["config"]["plenoscope_pointing"],
         )
 
-        quality = align_values_with_event_frame(
-            event_frame=event_frame,
-            idxs=passing_trajectory[sk][pk]["trajectory_quality"][spt.IDX],
+        quality = irf.join.left(
+            keys=passing_trajectory[sk][pk]["trajectory_quality"][spt.IDX],
             values=passing_trajectory[sk][pk]["trajectory_quality"]["quality"],
+            target_keys=event_frame[spt.IDX],
+            require_all=True,
         )
 
         write_correlation_figure(
@@ -72,11 +72,27 @@ for sk in irf_config["config"]["sites"]:
     for pk in irf_config["config"]["particles"]:
         truth_by_index[sk][pk] = {}
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar"
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": [
+                    "energy_GeV",
+                    "momentum_x_GeV_per_c",
+                    "momentum_y_GeV_per_c",
+                    "momentum_z_GeV_per_c",
+                ],
+                "cherenkovsize": [],
+                "grid": [],
+                "cherenkovpool": [],
+                "cherenkovsizepart": [],
+                "cherenkovpoolpart": [],
+                "core": ["core_x_m", "core_y_m"],
+                "trigger": [],
+                "pasttrigger": [],
+                "cherenkovclassification": [],
+            },
         )
         common_idx = spt.intersection(
             [passing_trigger[sk][pk]["idx"], passing_quality[sk][pk]["idx"]]
@@ -124,7 +140,7 @@ axes_style = {"spines": [], "axes": ["x", "y"], "grid": True}
 def read_shower_maximum_object_distance(
     site_key, particle_key, key="image_smallest_ellipse_object_distance"
 ):
-    event_table = spt.read(
+    event_table = irf.table.read(
         path=os.path.join(
             pa["run_dir"],
             "event_table",
@@ -132,7 +148,7 @@ def read_shower_maximum_object_distance(
             particle_key,
             "event_table.tar",
         ),
-        structure=irf.table.STRUCTURE,
+        column_keys={"features": [key]},
     )
 
     return spt.get_column_as_dict_by_index(
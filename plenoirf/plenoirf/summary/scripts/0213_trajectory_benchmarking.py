@@ -189,11 +189,13 @@ for sk in irf_config["config"]["sites"]:
         site_particle_dir = os.path.join(pa["out_dir"], sk, pk)
         os.makedirs(site_particle_dir, exist_ok=True)
 
-        _event_table = spt.read(
+        _event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar"
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys=irf.reconstruction.trajectory_quality.make_column_keys(
+                {"primary": ["energy_GeV"]}
+            ),
         )
         idx_common = spt.intersection(
             [
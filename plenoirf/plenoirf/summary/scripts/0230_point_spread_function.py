@@ -48,27 +48,19 @@ cta = irf.other_instruments.cherenkov_telescope_array_south
 fermi = irf.other_instruments.fermi_lat
 
 
-def align_on_idx(input_idx, input_values, target_idxs):
-    Q = {}
-    for ii in range(len(input_idx)):
-        Q[input_idx[ii]] = input_values[ii]
-    aligned_values = np.nan * np.ones(target_idxs.shape[0])
-    for ii in range(target_idxs.shape[0]):
-        aligned_values[ii] = Q[target_idxs[ii]]
-    return aligned_values
-
-
 for sk in irf_config["config"]["sites"]:
     pk = "gamma"
 
     site_particle_dir = os.path.join(pa["out_dir"], sk, pk)
     os.makedirs(site_particle_dir, exist_ok=True)
 
-    event_table = spt.read(
+    event_table = irf.table.read(
         path=os.path.join(
             pa["run_dir"], "event_table", sk, pk, "event_table.tar"
         ),
-        structure=irf.table.STRUCTURE,
+        column_keys=irf.reconstruction.trajectory_quality.make_column_keys(
+            {"primary": ["energy_GeV"]}
+        ),
     )
     idx_valid = spt.intersection(
         [
@@ -88,10 +80,11 @@ for sk in irf_config["config"]["sites"]:
     )
 
     true_energy = rectab["primary/energy_GeV"]
-    reco_energy = align_on_idx(
-        input_idx=reconstructed_energy[sk][pk][mk]["idx"],
-        input_values=reconstructed_energy[sk][pk][mk]["energy"],
-        target_idxs=rectab["idx"],
+    reco_energy = irf.join.left(
+        keys=reconstructed_energy[sk][pk][mk]["idx"],
+        values=reconstructed_energy[sk][pk][mk]["energy"],
+        target_keys=rectab["idx"],
+        require_all=True,
     )
     theta_deg = np.rad2deg(rectab["trajectory/theta_rad"])
     theta_deg = np.abs(theta_deg)
@@ -67,21 +67,6 @@ def cut_candidates_for_detection(
     )
 
 
-def make_wighted_mask_wrt_primary_table(
-    primary_table, idx_dict_of_weights, default_weight=0.0
-):
-    num_primaries = primary_table[spt.IDX].shape[0]
-    mask = np.zeros(num_primaries)
-
-    for ii in range(num_primaries):
-        idx = primary_table[spt.IDX][ii]
-        if idx in idx_dict_of_weights:
-            mask[ii] = idx_dict_of_weights[idx]
-        else:
-            mask[ii] = default_weight
-    return mask
-
-
 for sk in SITES:
     for ok in ONREGION_TYPES:
         for pk in PARTICLES:
@@ -91,9 +76,26 @@ for sk in SITES:
     for pk in PARTICLES:
         # point source
         # -------------
-        diffuse_thrown = spt.read(
+        diffuse_thrown = irf.table.read(
             path=opj(pa["run_dir"], "event_table", sk, pk, "event_table.tar",),
-            structure=irf.table.STRUCTURE,
+            column_keys=irf.reconstruction.trajectory_quality.make_column_keys(
+                {
+                    "primary": [
+                        "energy_GeV",
+                        "azimuth_rad",
+                        "zenith_rad",
+                        "solid_angle_thrown_sr",
+                    ],
+                    "grid": [
+                        "area_thrown_m2",
+                        "num_bins_above_threshold",
+                        "num_bins_thrown",
+                    ],
+                    "reconstructed_trajectory": [
+                        "fuzzy_main_axis_azimuth_rad"
+                    ],
+                }
+            ),
         )
 
         idx_source_in_possible_onregion = irf.analysis.cuts.cut_primary_direction_within_angle(
@@ -125,34 +127,31 @@ for sk in SITES:
 
         for ok in ONREGION_TYPES:
             onregion_config = copy.deepcopy(ONREGION_TYPES[ok])
-            idx_dict_source_in_onregion = {}
-            for ii in range(poicanarr[spt.IDX].shape[0]):
-
-                _onregion = irf.reconstruction.onregion.estimate_onregion(
-                    reco_cx=poicanarr["reconstructed_trajectory/cx_rad"][ii],
-                    reco_cy=poicanarr["reconstructed_trajectory/cy_rad"][ii],
-                    reco_main_axis_azimuth=poicanarr[
-                        "reconstructed_trajectory/fuzzy_main_axis_azimuth_rad"
-                    ][ii],
-                    reco_num_photons=poicanarr["features/num_photons"][ii],
-                    reco_core_radius=np.hypot(
-                        poicanarr["reconstructed_trajectory/x_m"][ii],
-                        poicanarr["reconstructed_trajectory/y_m"][ii],
-                    ),
-                    config=onregion_config,
-                )
-
-                hit = irf.reconstruction.onregion.is_direction_inside(
-                    cx=poicanarr["true_trajectory/cx_rad"][ii],
-                    cy=poicanarr["true_trajectory/cy_rad"][ii],
-                    onregion=_onregion,
-                )
+            onregions = irf.reconstruction.onregion.estimate_onregions(
+                reco_cx=poicanarr["reconstructed_trajectory/cx_rad"],
+                reco_cy=poicanarr["reconstructed_trajectory/cy_rad"],
+                reco_main_axis_azimuth=poicanarr[
+                    "reconstructed_trajectory/fuzzy_main_axis_azimuth_rad"
+                ],
+                reco_num_photons=poicanarr["features/num_photons"],
+                reco_core_radius=np.hypot(
+                    poicanarr["reconstructed_trajectory/x_m"],
+                    poicanarr["reconstructed_trajectory/y_m"],
+                ),
+                config=onregion_config,
+            )
 
-                idx_dict_source_in_onregion[poicanarr[spt.IDX][ii]] = hit
+            hits = irf.reconstruction.onregion.is_direction_inside_onregions(
+                cx=poicanarr["true_trajectory/cx_rad"],
+                cy=poicanarr["true_trajectory/cy_rad"],
+                onregions=onregions,
+            )
 
-            mask_detected = make_wighted_mask_wrt_primary_table(
-                primary_table=point_thrown["primary"],
-                idx_dict_of_weights=idx_dict_source_in_onregion,
+            mask_detected = irf.join.left(
+                keys=poicanarr[spt.IDX],
+                values=hits,
+                target_keys=point_thrown["primary"][spt.IDX],
+                fill_value=0.0,
             )
 
             (
@@ -205,42 +204,35 @@ for sk in SITES:
         for ok in ONREGION_TYPES:
             onregion_config = copy.deepcopy(ONREGION_TYPES[ok])
 
-            idx_dict_probability_for_source_in_onregion = {}
-            for ii in range(difcanarr[spt.IDX].shape[0]):
-
-                _onregion = irf.reconstruction.onregion.estimate_onregion(
-                    reco_cx=difcanarr["reconstructed_trajectory/cx_rad"][ii],
-                    reco_cy=difcanarr["reconstructed_trajectory/cy_rad"][ii],
-                    reco_main_axis_azimuth=difcanarr[
-                        "reconstructed_trajectory/fuzzy_main_axis_azimuth_rad"
-                    ][ii],
-                    reco_num_photons=difcanarr["features/num_photons"][ii],
-                    reco_core_radius=np.hypot(
-                        difcanarr["reconstructed_trajectory/x_m"][ii],
-                        difcanarr["reconstructed_trajectory/y_m"][ii],
-                    ),
-                    config=onregion_config,
-                )
-
-                onregion_polygon = irf.reconstruction.onregion.make_polygon(
-                    onregion=_onregion, num_steps=37
-                )
-
-                overlap_srad = irf.reconstruction.onregion.intersecting_area_of_polygons(
-                    a=onregion_polygon, b=POSSIBLE_ONREGION_POLYGON
-                )
+            onregions = irf.reconstruction.onregion.estimate_onregions(
+                reco_cx=difcanarr["reconstructed_trajectory/cx_rad"],
+                reco_cy=difcanarr["reconstructed_trajectory/cy_rad"],
+                reco_main_axis_azimuth=difcanarr[
+                    "reconstructed_trajectory/fuzzy_main_axis_azimuth_rad"
+                ],
+                reco_num_photons=difcanarr["features/num_photons"],
+                reco_core_radius=np.hypot(
+                    difcanarr["reconstructed_trajectory/x_m"],
+                    difcanarr["reconstructed_trajectory/y_m"],
+                ),
+                config=onregion_config,
+            )
 
-                probability_to_contain_random_source = (
-                    overlap_srad / SOLID_ANGLE_TO_CONTAIN_SOURCE
-                )
+            overlap_srad = irf.reconstruction.onregion.intersecting_area_of_onregions_and_polygon(
+                onregions=onregions,
+                polygon=POSSIBLE_ONREGION_POLYGON,
+                num_steps=37,
+            )
 
-                idx_dict_probability_for_source_in_onregion[
-                    difcanarr[spt.IDX][ii]
-                ] = probability_to_contain_random_source
+            probability_to_contain_random_source = (
+                overlap_srad / SOLID_ANGLE_TO_CONTAIN_SOURCE
+            )
 
-            mask_probability_for_source_in_onregion = make_wighted_mask_wrt_primary_table(
-                primary_table=diffuse_thrown["primary"],
-                idx_dict_of_weights=idx_dict_probability_for_source_in_onregion,
+            mask_probability_for_source_in_onregion = irf.join.left(
+                keys=difcanarr[spt.IDX],
+                values=probability_to_contain_random_source,
+                target_keys=diffuse_thrown["primary"][spt.IDX],
+                fill_value=0.0,
             )
 
             (
@@ -40,7 +40,7 @@ for site_key in irf_config["config"]["sites"]:
 
         # read
         # ----
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"],
                 "event_table",
@@ -48,7 +48,9 @@ for site_key in irf_config["config"]["sites"]:
                 particle_key,
                 "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": ["energy_GeV", "azimuth_rad", "zenith_rad"]
+            },
         )
 
         # summarize
@@ -55,11 +55,19 @@ for sk in SITES:
     for pk in PARTICLES:
         o[sk][pk] = {}
 
-        evttab = spt.read(
+        evttab = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": [
+                    "energy_GeV",
+                    "azimuth_rad",
+                    "zenith_rad",
+                    "magnet_azimuth_rad",
+                    "magnet_zenith_rad",
+                ]
+            },
         )
 
         passed_trigger = spt.make_mask_of_right_in_left(
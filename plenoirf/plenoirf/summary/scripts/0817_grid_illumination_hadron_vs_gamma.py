@@ -75,11 +75,20 @@ for sk in SITES:
             list(detected_grid_histograms.keys())
         )
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
+            column_keys={
+                "primary": ["energy_GeV"],
+                "grid": [],
+                "core": ["bin_idx_x", "bin_idx_y"],
+                "cherenkovsize": [],
+                "cherenkovpool": [],
+                "cherenkovsizepart": [],
+                "cherenkovpoolpart": [],
+                "trigger": [],
+            },
         )
 
         detected_events = spt.cut_table_on_indices(
@@ -50,11 +50,10 @@ for sk in SITES:
     for pk in PARTICLES:
         pv[sk][pk] = {}
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
         )
 
         for ak in ARRAY_CONFIGS:
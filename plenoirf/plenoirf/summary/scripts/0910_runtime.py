@@ -2,6 +2,7 @@
 import sys
 from os.path import join as opj
 import os
+import io
 import pandas as pd
 import numpy as np
 import json_numpy
@@ -82,10 +83,7 @@ def write_relative_runtime(table, out_path, figure_style):
     total_times = {}
     total_time = 0
 
-    KEYS = []
-    for key in ert.dtype.names:
-        if "num_" not in key and "run_id" not in key:
-            KEYS.append(key)
+    KEYS = irf.runtime.stage_keys(ert.dtype.names)
 
     for key in KEYS:
         total_times[key] = np.sum(ert[key])
@@ -170,6 +168,128 @@ def write_speed(table, out_path, figure_style):
     os.rename(out_path + ".json" + ".tmp", out_path + ".json")
 
 
+def _median_of_valid(values):
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.isfinite(values)
+    if np.sum(valid) == 0:
+        return float("nan")
+    return float(np.median(values[valid]))
+
+
+def _stage_resource(table, stage, key):
+    column = stage + "." + key
+    if column in table.dtype.names:
+        return table[column]
+    return np.nan * np.ones(table.shape[0])
+
+
+def _write_horizontal_bars(values, xlabel, out_path, figure_style):
+    labels = list(values.keys())
+    sizes = np.array([values[key] for key in labels])
+    valid = np.isfinite(sizes)
+
+    fig = seb.figure(figure_style)
+    ax = seb.add_axes(fig=fig, span=[0.5, 0.15, 0.45, 0.8])
+    _y = np.arange(len(labels))
+    for ikey in range(len(labels)):
+        if not valid[ikey]:
+            continue
+        x = sizes[ikey]
+        ax.plot(
+            [0, x, x, 0],
+            [_y[ikey] - 0.5, _y[ikey] - 0.5, _y[ikey] + 0.5, _y[ikey] + 0.5],
+            "k",
+        )
+    ax.set_xlabel(xlabel)
+    ax.set_yticks(_y)
+    ax.set_yticklabels(labels, rotation=0)
+    if np.sum(valid) > 0 and np.max(sizes[valid]) > 0:
+        ax.set_xlim([0, np.max(sizes[valid]) * 1.1])
+    fig.savefig(out_path + ".tmp" + ".jpg")
+    os.rename(out_path + ".tmp" + ".jpg", out_path + ".jpg")
+    seb.close(fig)
+
+
+def write_throughput(table, out_path, figure_style):
+    """
+    Events processed per wall-time in each stage, using the number of
+    events each stage logged itself.
+    """
+    ert = table
+    throughput = {}
+    cpu_efficiency = {}
+    for stage in irf.runtime.stage_keys(ert.dtype.names):
+        num_events = _stage_resource(ert, stage, "num_events")
+        wall = ert[stage]
+        mask = np.logical_and(num_events > 0, wall > 0)
+        throughput[stage] = _median_of_valid(num_events[mask] / wall[mask])
+
+        cpu = np.zeros(ert.shape[0])
+        for key in [
+            "cpu_user_s",
+            "cpu_sys_s",
+            "children_cpu_user_s",
+            "children_cpu_sys_s",
+        ]:
+            cpu += _stage_resource(ert, stage, key)
+        busy = wall > 0
+        cpu_efficiency[stage] = _median_of_valid(cpu[busy] / wall[busy])
+
+    _write_horizontal_bars(
+        values=throughput,
+        xlabel="throughput / events s$^{-1}$",
+        out_path=out_path,
+        figure_style=figure_style,
+    )
+    with open(out_path + ".json" + ".tmp", "wt") as fout:
+        fout.write(
+            json_numpy.dumps(
+                {"throughput": throughput, "cpu_over_wall": cpu_efficiency}
+            )
+        )
+    os.rename(out_path + ".json" + ".tmp", out_path + ".json")
+
+
+def write_memory(table, out_path, figure_style):
+    """
+    The peak resident-set-size of the run when each stage ended, and the
+    peak of the child-processes (CORSIKA, merlict).
+    Also the bytes read and written in each stage.
+    """
+    ert = table
+    out = {
+        "peak_rss_GB": {},
+        "children_peak_rss_GB": {},
+        "read_GB": {},
+        "write_GB": {},
+    }
+    for stage in irf.runtime.stage_keys(ert.dtype.names):
+        out["peak_rss_GB"][stage] = 1e-9 * _median_of_valid(
+            _stage_resource(ert, stage, "peak_rss_byte")
+        )
+        out["children_peak_rss_GB"][stage] = 1e-9 * _median_of_valid(
+            _stage_resource(ert, stage, "children_peak_rss_byte")
+        )
+        out["read_GB"][stage] = 1e-9 * _median_of_valid(
+            _stage_resource(ert, stage, "read_byte")
+            + _stage_resource(ert, stage, "children_read_byte")
+        )
+        out["write_GB"][stage] = 1e-9 * _median_of_valid(
+            _stage_resource(ert, stage, "write_byte")
+            + _stage_resource(ert, stage, "children_write_byte")
+        )
+
+    _write_horizontal_bars(
+        values=out["peak_rss_GB"],
+        xlabel="peak resident-set-size / GB",
+        out_path=out_path,
+        figure_style=figure_style,
+    )
+    with open(out_path + ".json" + ".tmp", "wt") as fout:
+        fout.write(json_numpy.dumps(out))
+    os.rename(out_path + ".json" + ".tmp", out_path + ".json")
+
+
 os.makedirs(pa["out_dir"], exist_ok=True)
 
 for sk in SITES:
@@ -180,11 +300,11 @@ for sk in SITES:
         if os.path.exists(extended_runtime_path):
             extended_runtime_table = read_csv_records(extended_runtime_path)
         else:
-            event_table = spt.read(
+            event_table = irf.table.read(
                 path=os.path.join(
                     pa["run_dir"], "event_table", sk, pk, "event_table.tar",
                 ),
-                structure=irf.table.STRUCTURE,
+                column_keys={"primary": [], "trigger": [], "pasttrigger": []},
             )
             runtime_table = read_csv_records(
                 opj(pa["run_dir"], "event_table", sk, pk, "runtime.csv",)
@@ -208,6 +328,18 @@ for sk in SITES:
             figure_style=seb.FIGURE_1_1,
         )
 
+        write_throughput(
+            table=extended_runtime_table,
+            out_path=opj(pa["out_dir"], prefix_str + "_throughput_runtime"),
+            figure_style=seb.FIGURE_1_1,
+        )
+
+        write_memory(
+            table=extended_runtime_table,
+            out_path=opj(pa["out_dir"], prefix_str + "_memory_runtime"),
+            figure_style=seb.FIGURE_1_1,
+        )
+
         ertt = extended_runtime_table
 
         t_corsika = np.median(
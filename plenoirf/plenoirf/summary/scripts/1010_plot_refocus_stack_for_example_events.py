@@ -109,11 +109,10 @@ for sk in SITES:
         pk_dir = os.path.join(sk_dir, pk)
         os.makedirs(pk_dir, exist_ok=True)
 
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"], "event_table", sk, pk, "event_table.tar"
             ),
-            structure=irf.table.STRUCTURE,
         )
         common_idx = spt.intersection(
             [passing_trigger[sk][pk]["idx"], passing_quality[sk][pk]["idx"]]
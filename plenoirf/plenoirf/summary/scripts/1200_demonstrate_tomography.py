@@ -279,9 +279,9 @@ for sk in ["namibia"]:
         print("===", sk, pk, "===")
 
         print("- read event_table")
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(sk_pk_dir, "event_table.tar",),
-            structure=irf.table.STRUCTURE,
+            column_keys={"core": ["core_x_m", "core_y_m"]},
         )
 
         print("- find events with full output")
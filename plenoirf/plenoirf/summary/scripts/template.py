@@ -2,7 +2,6 @@
 import sys
 import copy
 import plenoirf as irf
-import sparse_numeric_table as spt
 import os
 import json_numpy
 
@@ -16,7 +15,7 @@ os.makedirs(pa["out_dir"], exist_ok=True)
 
 for site_key in irf_config["config"]["sites"]:
     for particle_key in irf_config["config"]["particles"]:
-        event_table = spt.read(
+        event_table = irf.table.read(
             path=os.path.join(
                 pa["run_dir"],
                 "event_table",
@@ -24,5 +23,4 @@ for site_key in irf_config["config"]["sites"]:
                 particle_key,
                 "event_table.tar",
             ),
-            structure=irf.table.STRUCTURE,
         )
@@ -1,10 +1,41 @@
+"""
+Runs the summary's scripts along the dependencies declared in dag.py.
+
+Each script runs in its own process, forked from a forkserver which has
+already imported the heavy modules. The stdout and stderr of a script are
+streamed into files in summary/logs while it runs, and are moved into the
+script's out_dir when it completes. Scripts which do not depend on each
+other run concurrently.
+
+A script only runs when its fingerprint changed since it completed the
+last time, or when a script it depends on runs, see fingerprint.py.
+"""
 import pkg_resources
 import os
+import sys
 import glob
-import subprocess
-import time
+import runpy
+import shutil
+import traceback
+import multiprocessing
+from multiprocessing import connection as mp_connection
 import json_numpy
 from .. import provenance
+from . import dag
+from . import fingerprint
+
+PRELOAD_MODULES = [
+    "numpy",
+    "scipy",
+    "pandas",
+    "matplotlib",
+    "sklearn",
+    "json_numpy",
+    "sparse_numeric_table",
+    "plenopy",
+    "plenoirf",
+    "sebastians_matplotlib_addons",
+]
 
 
 def find_script_names(script_dir):
@@ -20,19 +51,6 @@ def find_script_names(script_dir):
     return script_names
 
 
-def find_job_dependencies(script_dir, script_names):
-    job_dependencies = {}
-    for script_name in script_names:
-        job_dependencies[script_name] = []
-        script_path = os.path.join(script_dir, script_name + ".py")
-        with open(script_path, "rt") as fin:
-            code = fin.read()
-            for sn in script_names:
-                if str.find(code, sn) >= 0:
-                    job_dependencies[script_name].append(sn)
-    return job_dependencies
-
-
 def num_jobs(job_statii, status):
     num = 0
     for name in job_statii:
@@ -64,7 +82,100 @@ def find_script_names_not_yet_complete(run_dir, script_names):
     return out
 
 
-def run_parallel(run_dir, num_threads=6, polling_interval=1):
+def make_context(preload_modules=PRELOAD_MODULES):
+    """
+    Returns the multiprocessing-context of the script's processes. The
+    forkserver imports the preload_modules once, and ignores the ones which
+    can not be imported.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(preload_modules)
+    else:
+        ctx = multiprocessing.get_context("spawn")
+    return ctx
+
+
+def _log_paths(run_dir, script_name):
+    log_dir = os.path.join(run_dir, "summary", "logs")
+    return {
+        "stdout": os.path.join(log_dir, script_name + ".stdout.md"),
+        "stderr": os.path.join(log_dir, script_name + ".stderr.md"),
+    }
+
+
+def run_script(script_path, run_dir, stdout_path, stderr_path, cwd):
+    """
+    Runs the script like 'python script_path run_dir' in this process. The
+    file-descriptors of stdout and stderr are redirected into the files, so
+    the output of compiled extensions is captured, too.
+    """
+    os.chdir(cwd)
+    fout = open(stdout_path, "wb")
+    ferr = open(stderr_path, "wb")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(fout.fileno(), 1)
+    os.dup2(ferr.fileno(), 2)
+    sys.stdout = open(1, "wt", buffering=1, closefd=False)
+    sys.stderr = open(2, "wt", buffering=1, closefd=False)
+    sys.argv = [script_path, run_dir]
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    except SystemExit:
+        raise
+    except BaseException:
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def find_script_names_not_up_to_date(
+    run_dir, script_dir, script_names, manifest
+):
+    """
+    Returns the script_names which have no output yet, or whose
+    fingerprint differs from the one in the manifest.
+    """
+    out = []
+    for name in script_names:
+        fp = fingerprint.make_fingerprint(
+            run_dir=run_dir,
+            script_path=os.path.join(script_dir, name + ".py"),
+            script=dag.SCRIPTS[name],
+            manifest=manifest,
+        )
+        if not fingerprint.is_up_to_date(
+            run_dir=run_dir,
+            manifest=manifest,
+            script_name=name,
+            script=dag.SCRIPTS[name],
+            fingerprint=fp,
+        ):
+            out.append(name)
+    return out
+
+
+def run_parallel(
+    run_dir, num_threads=6, script_names=None, preload_modules=PRELOAD_MODULES
+):
+    """
+    Runs the summary's scripts which are not up to date, and the scripts
+    which depend on them. With script_names, these scripts run in any case.
+    A script starts as soon as all the scripts it depends on are complete.
+    When its fingerprint then turns out to be unchanged, e.g. because the
+    outputs of the scripts it depends on did not change, it is skipped.
+    After the first error, no more scripts are started.
+
+    Returns
+    -------
+    job_statii : dict
+        The status of each script: 'complete', 'cached', 'error', or
+        'pending'.
+    """
+    run_dir = os.path.abspath(run_dir)
     json_numpy.write(
         path=os.path.join(run_dir, "summary", "provenance.json"),
         out_dict=provenance.make_provenance(),
@@ -73,85 +184,115 @@ def run_parallel(run_dir, num_threads=6, polling_interval=1):
     script_dir = pkg_resources.resource_filename(
         "plenoirf", os.path.join("summary", "scripts")
     )
+    manifest = fingerprint.read_manifest(run_dir=run_dir)
 
-    script_names = find_script_names(script_dir=script_dir)
-    script_names = find_script_names_not_yet_complete(
-        run_dir=run_dir, script_names=script_names
-    )
-    job_dependencies = find_job_dependencies(
-        script_dir=script_dir, script_names=script_names,
+    all_script_names = find_script_names(script_dir=script_dir)
+    if script_names is None:
+        forced = set()
+        changed = find_script_names_not_up_to_date(
+            run_dir=run_dir,
+            script_dir=script_dir,
+            script_names=all_script_names,
+            manifest=manifest,
+        )
+    else:
+        forced = set(script_names)
+        changed = script_names
+    script_names = dag.find_dependants(
+        dependencies=dag.find_dependencies(script_names=all_script_names),
+        script_names=changed,
     )
-    job_statii = {}
-    job_handles = {}
-    job_stderr_len = {}
-    for name in script_names:
-        job_statii[name] = "pending"
-        job_handles[name] = None
+    job_dependencies = dag.find_dependencies(script_names=script_names)
+    dag.topological_order(job_dependencies)
 
-    num_polls = 0
+    os.makedirs(os.path.join(run_dir, "summary", "logs"), exist_ok=True)
+    ctx = make_context(preload_modules=preload_modules)
+
+    job_statii = {name: "pending" for name in script_names}
+    fingerprints = {}
+    running = {}
     while True:
-        if num_jobs(job_statii, "error"):
-            break
+        num_cached = -1
+        while num_jobs(job_statii, "error") == 0 and num_cached != 0:
+            num_cached = 0
+            jobs_ready_to_run = find_jobs_ready_to_run(
+                _cached_as_complete(job_statii), job_dependencies
+            )
+            for name in jobs_ready_to_run:
+                if len(running) >= num_threads:
+                    break
+                script_path = os.path.join(script_dir, name + ".py")
+                fp = fingerprint.make_fingerprint(
+                    run_dir=run_dir,
+                    script_path=script_path,
+                    script=dag.SCRIPTS[name],
+                    manifest=manifest,
+                )
+                if name not in forced and fingerprint.is_up_to_date(
+                    run_dir=run_dir,
+                    manifest=manifest,
+                    script_name=name,
+                    script=dag.SCRIPTS[name],
+                    fingerprint=fp,
+                ):
+                    job_statii[name] = "cached"
+                    num_cached += 1
+                    print("[cached  ]", name)
+                    continue
+
+                manifest.pop(name, None)
+                fingerprint.write_manifest(run_dir=run_dir, manifest=manifest)
+                fingerprints[name] = fp
+                log_paths = _log_paths(run_dir=run_dir, script_name=name)
+                proc = ctx.Process(
+                    target=run_script,
+                    kwargs={
+                        "script_path": script_path,
+                        "run_dir": run_dir,
+                        "stdout_path": log_paths["stdout"],
+                        "stderr_path": log_paths["stderr"],
+                        "cwd": os.getcwd(),
+                    },
+                    name=name,
+                )
+                proc.start()
+                job_statii[name] = "running"
+                running[proc.sentinel] = (name, proc)
+                print("[run     ]", name)
 
-        if num_jobs(job_statii, "complete") == len(job_statii):
+        if len(running) == 0:
             break
 
-        num_free_threads = num_threads - num_jobs(job_statii, "running")
-        jobs_ready_to_run = find_jobs_ready_to_run(
-            job_statii, job_dependencies
-        )
-        num_jobs_to_submit = min([len(jobs_ready_to_run), num_free_threads])
-
-        for ii in range(num_jobs_to_submit):
-            name = jobs_ready_to_run[ii]
-            script_path = os.path.join(script_dir, name + ".py")
-            pii = subprocess.Popen(
-                args=["python", script_path, run_dir],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            job_statii[name] = "running"
-            job_handles[name] = pii
-
-        for name in script_names:
-            job_popen = job_handles[name]
-            if job_popen is not None:
-                rc = job_popen.poll()
-
-                if rc is None:
-                    assert job_statii[name] == "running"
-                else:
-                    job_stdout, job_stderr = job_handles[name].communicate()
-                    job_stderr_len[name] = len(job_stderr)
-                    script_out_dir = os.path.join(run_dir, "summary", name)
-                    os.makedirs(script_out_dir, exist_ok=True)
-                    opath = os.path.join(script_out_dir, "stdout.md")
-                    epath = os.path.join(script_out_dir, "stderr.md")
-                    with open(opath, "wb") as fo, open(epath, "wb") as fe:
-                        fo.write(job_stdout)
-                        fe.write(job_stderr)
-
-                    if rc >= 0:
-                        job_statii[name] = "complete"
-                        job_handles[name] = None
-                    else:
-                        job_statii[name] = "error"
-                        job_handles[name] = None
-
-        print("\n\n")
-        print("[P]ending [R]unning [C]omplete len(stderr)")
-        print("------------------------------------------ Polls:", num_polls)
-        for name in script_names:
-            sta = job_statii[name]
-            if sta == "pending":
-                print("{:<70s}    [P]. .  -".format(name))
-            elif sta == "running":
-                print("{:<70s}     .[R].  -".format(name))
-            elif sta == "complete":
-                elen = job_stderr_len[name]
-                print("{:<70s}     . .[C] {:d}".format(name, elen))
+        for sentinel in mp_connection.wait(list(running.keys())):
+            name, proc = running.pop(sentinel)
+            proc.join()
+            if proc.exitcode == 0:
+                job_statii[name] = "complete"
+                _move_logs_into_out_dir(run_dir=run_dir, script_name=name)
+                manifest[name] = fingerprint.make_manifest_entry(
+                    run_dir=run_dir,
+                    script=dag.SCRIPTS[name],
+                    fingerprint=fingerprints[name],
+                )
+                fingerprint.write_manifest(run_dir=run_dir, manifest=manifest)
+                print("[complete]", name)
             else:
-                print("{:<70s}     ? ? ?".format(name))
+                job_statii[name] = "error"
+                print("[error   ]", name, "exitcode:", proc.exitcode)
+
+    return job_statii
+
+
+def _cached_as_complete(job_statii):
+    return {
+        name: "complete" if status == "cached" else status
+        for name, status in job_statii.items()
+    }
+
 
-        time.sleep(polling_interval)
-        num_polls += 1
+def _move_logs_into_out_dir(run_dir, script_name):
+    out_dir = os.path.join(run_dir, "summary", script_name)
+    os.makedirs(out_dir, exist_ok=True)
+    log_paths = _log_paths(run_dir=run_dir, script_name=script_name)
+    for key in log_paths:
+        shutil.move(log_paths[key], os.path.join(out_dir, key + ".md"))
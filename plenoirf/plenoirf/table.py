@@ -1,4 +1,10 @@
+import os
+import fcntl
+import json
+import shutil
+import tempfile
 import numpy as np
+import sparse_numeric_table as spt
 
 STRUCTURE = {}
 
@@ -80,6 +86,12 @@ STRUCTURE["grid"] = {
     "area_thrown_m2": {"dtype": "<f8", "comment": ""},
     "artificial_core_limitation": {"dtype": "<i8", "comment": "Flag"},
     "artificial_core_limitation_radius_m": {"dtype": "<f8", "comment": ""},
+    "num_reuses": {
+        "dtype": "<i8",
+        "comment": "The number of distinct bins above threshold which were "
+        "drawn to reuse the airshower. "
+        "The reuses have their own UIDs, see unique.make_reuse_uid().",
+    },
 }
 
 STRUCTURE["cherenkovpool"] = {
@@ -455,3 +467,211 @@ _traj["fuzzy_main_axis_azimuth_uncertainty_rad"] = {
 }
 
 STRUCTURE["reconstructed_trajectory"] = _traj
+
+
+# Columnar event-table
+# --------------------
+# The event_table.tar is converted once into a directory with one .npy for
+# each column of each level, and a manifest.json. The columns are read with
+# np.load(mmap_mode="r"), so only the columns which are used are read.
+# Scripts read concurrently, so a valid columnar event-table is never
+# removed, and a stale one is renamed aside before it is removed.
+
+COLUMNAR_MANIFEST_VERSION = 2
+
+# Columns which were added to STRUCTURE later. The columnar event-table of
+# an event_table.tar written before gets these columns with these values.
+COLUMN_DEFAULTS = {"grid": {"num_reuses": 1}}
+
+
+def columnar_path(path):
+    """
+    Returns the path of the columnar event-table of the event_table.tar
+    in path.
+    """
+    return os.path.splitext(path)[0] + ".columns"
+
+
+def _source_fingerprint(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def write_columnar(path, table, source_path=None):
+    """
+    Writes the table, a dict of levels with columns, into the directory
+    path. The directory is made next to path and moved in place. With
+    source_path, a columnar event-table in path which is valid for
+    source_path is kept.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    tmp_path = tempfile.mkdtemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=parent
+    )
+    manifest = {"version": COLUMNAR_MANIFEST_VERSION, "levels": {}}
+    if source_path is not None:
+        manifest["source"] = _source_fingerprint(source_path)
+    for level_key in table:
+        level = table[level_key]
+        os.makedirs(os.path.join(tmp_path, level_key))
+        columns = {}
+        for column_key in level.dtype.names:
+            column = np.asarray(level[column_key])
+            np.save(
+                os.path.join(tmp_path, level_key, column_key + ".npy"), column
+            )
+            columns[column_key] = column.dtype.str
+        for column_key in COLUMN_DEFAULTS.get(level_key, {}):
+            if column_key in columns:
+                continue
+            column = np.full(
+                level.shape[0],
+                COLUMN_DEFAULTS[level_key][column_key],
+                dtype=STRUCTURE[level_key][column_key]["dtype"],
+            )
+            np.save(
+                os.path.join(tmp_path, level_key, column_key + ".npy"), column
+            )
+            columns[column_key] = column.dtype.str
+        manifest["levels"][level_key] = {
+            "num_rows": int(level.shape[0]),
+            "columns": columns,
+        }
+    with open(os.path.join(tmp_path, "manifest.json"), "wt") as f:
+        f.write(json.dumps(manifest, indent=4))
+
+    if source_path is not None and is_columnar_valid(
+        path=path, source_path=source_path
+    ):
+        shutil.rmtree(tmp_path)
+        return
+    _replace_dir(tmp_path=tmp_path, path=path)
+
+
+def _replace_dir(tmp_path, path):
+    if os.path.exists(path):
+        old_path = tmp_path + ".old"
+        os.makedirs(old_path)
+        try:
+            os.rename(path, os.path.join(old_path, "columns"))
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(old_path)
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # An other process was faster.
+        shutil.rmtree(tmp_path)
+
+
+def read_columnar_manifest(path):
+    with open(os.path.join(path, "manifest.json"), "rt") as f:
+        return json.loads(f.read())
+
+
+def is_columnar_valid(path, source_path):
+    try:
+        manifest = read_columnar_manifest(path)
+    except FileNotFoundError:
+        return False
+    if manifest["version"] != COLUMNAR_MANIFEST_VERSION:
+        return False
+    return manifest.get("source") == _source_fingerprint(source_path)
+
+
+def convert_to_columnar(path):
+    """
+    Converts the event_table.tar in path into its columnar event-table.
+    The event_table.tar is locked while it is converted, so concurrent
+    readers convert it only once.
+    """
+    cpath = columnar_path(path)
+    with open(path, "rb") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if is_columnar_valid(path=cpath, source_path=path):
+                return
+            write_columnar(
+                path=cpath,
+                table=spt.read(path=path, structure=STRUCTURE),
+                source_path=path,
+            )
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def read_columns(path, level_keys=None, column_keys=None):
+    """
+    Returns a dict of levels, each a dict of read-only, memory-mapped
+    columns, from the columnar event-table in path.
+
+    Parameters
+    ----------
+    level_keys : list
+        The levels to read. Default is the levels in column_keys, or all
+        levels without column_keys.
+    column_keys : dict
+        column_keys[level_key] is the list of columns to read of this
+        level. The spt.IDX column is always read. Default, or None, is all
+        columns.
+    """
+    manifest = read_columnar_manifest(path)
+    column_keys = column_keys if column_keys else {}
+    if level_keys is None:
+        if column_keys:
+            level_keys = list(column_keys.keys())
+        else:
+            level_keys = list(manifest["levels"].keys())
+    out = {}
+    for level_key in level_keys:
+        available = manifest["levels"][level_key]["columns"]
+        if column_keys.get(level_key) is not None:
+            keys = [spt.IDX] + [
+                ck for ck in column_keys[level_key] if ck != spt.IDX
+            ]
+        else:
+            keys = list(available.keys())
+        out[level_key] = {}
+        for column_key in keys:
+            assert column_key in available, "No column {:s}/{:s}".format(
+                level_key, column_key
+            )
+            out[level_key][column_key] = np.load(
+                os.path.join(path, level_key, column_key + ".npy"),
+                mmap_mode="r",
+            )
+    return out
+
+
+def read(path, level_keys=None, column_keys=None):
+    """
+    Returns the event-table in the event_table.tar in path like spt.read,
+    a dict of levels, each a np.recarray, but only with the requested
+    levels and columns. The requested columns are copied into the
+    recarrays, so request only the columns which are used. Use
+    read_columns() for the memory-maps. The event_table.tar is converted
+    into its columnar event-table on the first read.
+
+    Parameters
+    ----------
+    level_keys : list
+        The levels to read. Default is the levels in column_keys, or all
+        levels without column_keys.
+    column_keys : dict
+        column_keys[level_key] is the list of columns to read of this
+        level. The spt.IDX column is always read. Default, or None, is all
+        columns.
+    """
+    cpath = columnar_path(path)
+    if not is_columnar_valid(path=cpath, source_path=path):
+        convert_to_columnar(path=path)
+    columns = read_columns(
+        path=cpath, level_keys=level_keys, column_keys=column_keys
+    )
+    out = {}
+    for level_key in columns:
+        level = columns[level_key]
+        out[level_key] = np.rec.fromarrays(
+            [level[ck] for ck in level], names=list(level.keys())
+        )
+    return out
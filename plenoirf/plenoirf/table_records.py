@@ -0,0 +1,191 @@
+"""
+Collect the records of the event-table column by column.
+
+Each level of table.STRUCTURE gets typed numpy buffers, one per column,
+which grow geometrically. A record is either appended as a dict, or it is
+written directly into the buffers using the Row returned by new_row().
+The sparse-numeric-table is made from the buffers without an intermediate
+list of dicts. Each column of each row must be written before the records
+are exported.
+"""
+import numpy as np
+import sparse_numeric_table as spt
+
+INITIAL_CAPACITY = 64
+
+
+def init(structure, capacity=INITIAL_CAPACITY):
+    """
+    Returns a dict of LevelRecords, one for each level in structure.
+    This is a drop-in for the dict of lists of records.
+    """
+    table_records = {}
+    for level_key in structure:
+        table_records[level_key] = LevelRecords(
+            level_structure=structure[level_key], capacity=capacity
+        )
+    return table_records
+
+
+def to_sparse_numeric_table(table_records):
+    """
+    Returns the sparse-numeric-table, a dict of recarrays, one for each
+    level in table_records.
+    """
+    table = {}
+    for level_key in table_records:
+        table[level_key] = table_records[level_key].to_recarray()
+    return table
+
+
+class Row:
+    """
+    A view on one row in LevelRecords. Reading and writing a column of the
+    Row reads and writes the buffer of the column.
+    """
+
+    __slots__ = ("_columns", "_written", "_i")
+
+    def __init__(self, level, i):
+        # The dicts of columns are kept when the buffers grow.
+        self._columns = level._columns
+        self._written = level._written
+        self._i = i
+
+    def __getitem__(self, column_key):
+        return self._columns[column_key][self._i]
+
+    def __setitem__(self, column_key, value):
+        self._columns[column_key][self._i] = value
+        self._written[column_key][self._i] = True
+
+    def __contains__(self, column_key):
+        return column_key in self._columns
+
+    def keys(self):
+        return self._columns.keys()
+
+    def __repr__(self):
+        return "{:s}({:d})".format(self.__class__.__name__, self._i)
+
+
+class LevelRecords:
+    """
+    The records of one level in typed numpy buffers, one per column.
+    The columns are spt.IDX and the columns in the level's structure.
+    """
+
+    def __init__(self, level_structure, capacity=INITIAL_CAPACITY):
+        assert capacity > 0
+        self._dtypes = {spt.IDX: spt.IDX_DTYPE}
+        for column_key in level_structure:
+            self._dtypes[column_key] = level_structure[column_key]["dtype"]
+        self._size = 0
+        self._columns = {}
+        self._written = {}
+        for column_key in self._dtypes:
+            self._columns[column_key] = np.zeros(
+                capacity, dtype=self._dtypes[column_key]
+            )
+            self._written[column_key] = np.zeros(capacity, dtype=np.bool_)
+
+    def _capacity(self):
+        return self._columns[spt.IDX].shape[0]
+
+    def _reserve(self, size):
+        capacity = self._capacity()
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for column_key in self._columns:
+            column = np.zeros(capacity, dtype=self._dtypes[column_key])
+            column[0 : self._size] = self._columns[column_key][0 : self._size]
+            self._columns[column_key] = column
+            written = np.zeros(capacity, dtype=np.bool_)
+            written[0 : self._size] = self._written[column_key][0 : self._size]
+            self._written[column_key] = written
+
+    def new_row(self, idx):
+        """
+        Appends a row with index idx and returns a Row to write its columns.
+        All columns of the row must be written, this is asserted when the
+        records are exported.
+        """
+        self._reserve(self._size + 1)
+        row = Row(level=self, i=self._size)
+        row[spt.IDX] = idx
+        self._size += 1
+        return row
+
+    def append(self, record):
+        """
+        Appends a record, e.g. a dict, which has all the level's columns.
+        Keys of the record which are not in the level are ignored.
+        """
+        self._reserve(self._size + 1)
+        for column_key in self._columns:
+            self._columns[column_key][self._size] = record[column_key]
+            self._written[column_key][self._size] = True
+        self._size += 1
+
+    def extend_columns(self, columns):
+        """
+        Appends the rows in columns, a dict of arrays, one per column.
+        """
+        num = len(columns[spt.IDX])
+        self._reserve(self._size + num)
+        for column_key in self._columns:
+            assert len(columns[column_key]) == num
+            self._columns[column_key][self._size : self._size + num] = columns[
+                column_key
+            ]
+            self._written[column_key][self._size : self._size + num] = True
+        self._size += num
+
+    def clear(self):
+        for column_key in self._written:
+            self._written[column_key][0 : self._size] = False
+        self._size = 0
+
+    def _assert_all_written(self):
+        for column_key in self._written:
+            num_missing = self._size - np.count_nonzero(
+                self._written[column_key][0 : self._size]
+            )
+            assert (
+                num_missing == 0
+            ), "Column '{:s}' is not written in {:d} rows.".format(
+                column_key, num_missing
+            )
+
+    def column(self, column_key):
+        return self._columns[column_key][0 : self._size].copy()
+
+    def to_columns(self):
+        self._assert_all_written()
+        return {key: self.column(key) for key in self._columns}
+
+    def to_recarray(self):
+        self._assert_all_written()
+        return np.rec.fromarrays(
+            [self.column(key) for key in self._columns],
+            dtype=[(key, self._dtypes[key]) for key in self._columns],
+        )
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._size
+        if i < 0 or i >= self._size:
+            raise IndexError("LevelRecords index out of range")
+        return Row(level=self, i=i)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield Row(level=self, i=i)
+
+    def __repr__(self):
+        return "{:s}(size={:d})".format(self.__class__.__name__, self._size)
@@ -0,0 +1,65 @@
+import plenoirf
+import corsika_primary as cpw
+import numpy as np
+
+bst = plenoirf.bunch_statistics
+
+
+def _make_bunches(prng, num_bunches):
+    cb = prng.normal(size=(num_bunches, 8)).astype(np.float32)
+    cb[:, cpw.I.BUNCH.ZEM] = prng.uniform(1e5, 1e6, size=num_bunches)
+    cb[:, cpw.I.BUNCH.WVL] = prng.uniform(-700, -250, size=num_bunches)
+    return cb
+
+
+def test_exact_medians_equal_np_median():
+    prng = np.random.Generator(np.random.PCG64(5))
+    for num_bunches in [1, 2, 3, 10, 1001, 1000]:
+        cb = _make_bunches(prng=prng, num_bunches=num_bunches)
+        med = bst.medians(cherenkov_bunches=cb)
+        for key in bst.MEDIAN_COLUMNS:
+            expected = np.median(cb[:, bst.MEDIAN_COLUMNS[key]])
+            assert med[key] == expected
+            assert med[key].dtype == expected.dtype
+
+
+def test_exact_median_is_nan_when_column_has_nan():
+    prng = np.random.Generator(np.random.PCG64(6))
+    cb = _make_bunches(prng=prng, num_bunches=100)
+    cb[17, cpw.I.BUNCH.CX] = np.nan
+    med = bst.medians(cherenkov_bunches=cb)
+    assert np.isnan(med["CX"])
+    assert not np.isnan(med["CY"])
+
+
+def test_approximate_medians_of_subsample():
+    prng = np.random.Generator(np.random.PCG64(7))
+    cb = _make_bunches(prng=prng, num_bunches=100 * 1000)
+    med = bst.medians(cherenkov_bunches=cb, approximate=True, num_samples=10)
+    sub = bst.medians(cherenkov_bunches=cb[::10000])
+    for key in bst.MEDIAN_COLUMNS:
+        assert med[key] == sub[key]
+
+    med = bst.medians(
+        cherenkov_bunches=cb, approximate=True, num_samples=10 * 1000
+    )
+    for key in bst.MEDIAN_COLUMNS:
+        column = cb[:, bst.MEDIAN_COLUMNS[key]]
+        q_low, q_high = np.quantile(column, [0.48, 0.52])
+        assert q_low <= med[key] <= q_high
+
+
+def test_statistics_record():
+    prng = np.random.Generator(np.random.PCG64(8))
+    cb = _make_bunches(prng=prng, num_bunches=999)
+    rec = bst.statistics(cherenkov_bunches=cb)
+    assert rec["num_bunches"] == 999
+    assert rec["num_photons"] == np.sum(cb[:, cpw.I.BUNCH.BSIZE])
+    assert rec["maximum_asl_m"] == cpw.CM2M * np.median(
+        cb[:, cpw.I.BUNCH.ZEM]
+    )
+    assert rec["wavelength_median_nm"] > 0.0
+
+    empty = bst.statistics(cherenkov_bunches=np.zeros((0, 8), np.float32))
+    assert empty["num_bunches"] == 0
+    assert "maximum_asl_m" not in empty
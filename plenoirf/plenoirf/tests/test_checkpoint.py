@@ -0,0 +1,138 @@
+import plenoirf
+import sparse_numeric_table as spt
+import json_line_logger as jlogging
+import numpy as np
+import os
+
+irf = plenoirf.instrument_response
+
+
+def make_prng():
+    return np.random.Generator(np.random.MT19937(seed=42))
+
+
+def write_row(level, idx, **values):
+    row = level.new_row(idx=idx)
+    for column_key in row.keys():
+        if column_key != spt.IDX:
+            row[column_key] = values.get(column_key, 0)
+
+
+def test_resume_restores_tabrec_and_prng(tmp_path):
+    job = {"run_id": 42, "site_key": "namibia", "particle_key": "gamma"}
+    logger = jlogging.LoggerStdout()
+    tmp_dir = str(tmp_path)
+
+    prng = make_prng()
+    tabrec = irf._init_table_records()
+    checkpoint_dir = irf._init_checkpoint_dir(job=job, tmp_dir=tmp_dir)
+    done, _ = irf._resume_checkpoint(
+        checkpoint_dir, "corsika_and_grid", tabrec, prng, logger
+    )
+    assert not done
+
+    _ = prng.uniform(size=17)
+    write_row(tabrec["primary"], idx=42000001, energy_GeV=1.5)
+    write_row(tabrec["core"], idx=42000001, core_x_m=-3.0)
+    irf._write_checkpoint(checkpoint_dir, "corsika_and_grid", tabrec, prng)
+    irf._write_checkpoint(
+        checkpoint_dir,
+        "pass_loose_trigger",
+        tabrec,
+        prng,
+        payload=[{"idx": 42000001, "tmp_path": "/a/b"}],
+    )
+    expected_next = prng.uniform(size=3)
+
+    # a new process resumes
+    prng = make_prng()
+    tabrec = irf._init_table_records()
+    checkpoint_dir = irf._init_checkpoint_dir(job=job, tmp_dir=tmp_dir)
+    done, _ = irf._resume_checkpoint(
+        checkpoint_dir, "corsika_and_grid", tabrec, prng, logger
+    )
+    assert done
+    assert tabrec["primary"][0]["energy_GeV"] == 1.5
+    assert tabrec["core"][0]["core_x_m"] == -3.0
+    done, payload = irf._resume_checkpoint(
+        checkpoint_dir, "pass_loose_trigger", tabrec, prng, logger
+    )
+    assert done
+    assert payload[0]["tmp_path"] == "/a/b"
+    np.testing.assert_array_equal(prng.uniform(size=3), expected_next)
+
+    done, _ = irf._resume_checkpoint(
+        checkpoint_dir, "merlict", tabrec, prng, logger
+    )
+    assert not done
+
+
+def test_checkpoints_of_other_job_are_removed(tmp_path):
+    logger = jlogging.LoggerStdout()
+    tmp_dir = str(tmp_path)
+    prng = make_prng()
+    tabrec = irf._init_table_records()
+
+    job = {"run_id": 42, "site_key": "namibia"}
+    checkpoint_dir = irf._init_checkpoint_dir(job=job, tmp_dir=tmp_dir)
+    irf._write_checkpoint(checkpoint_dir, "merlict", tabrec, prng)
+
+    other_job = {"run_id": 42, "site_key": "chile"}
+    checkpoint_dir = irf._init_checkpoint_dir(job=other_job, tmp_dir=tmp_dir)
+    done, _ = irf._resume_checkpoint(
+        checkpoint_dir, "merlict", tabrec, prng, logger
+    )
+    assert not done
+    assert os.path.exists(os.path.join(checkpoint_dir, "job.json"))
+
+
+def make_job(date_dict, num_trajectory_workers=1):
+    config = {
+        "plenoscope_pointing": {"azimuth_deg": 0.0, "zenith_deg": 0.0},
+        "particles": {"gamma": {"particle_id": 1}},
+        "sites": {"namibia": {"observation_level_asl_m": 2300}},
+        "grid": {},
+        "raw_sensor_response": {},
+        "sum_trigger": {},
+        "cherenkov_classification": {},
+        "reconstruction": {},
+        "artificial_core_limitation": {"gamma": None},
+    }
+    return irf.make_job_dict(
+        run_dir="/run",
+        production_key="prod",
+        run_id=42,
+        site_key="namibia",
+        particle_key="gamma",
+        config=config,
+        deflection_table={"namibia": {"gamma": {}}},
+        num_air_showers=10,
+        corsika_primary_path="corsika",
+        merlict_plenoscope_propagator_path="merlict",
+        tmp_dir="/tmp",
+        keep_tmp_dir=False,
+        date_dict=date_dict,
+        num_trajectory_workers=num_trajectory_workers,
+    )
+
+
+def test_resume_after_resubmitting_the_job(tmp_path):
+    logger = jlogging.LoggerStdout()
+    tmp_dir = str(tmp_path)
+    prng = make_prng()
+    tabrec = irf._init_table_records()
+
+    job = make_job(date_dict={"unix": 1.0, "iso": "2020-01-01"})
+    checkpoint_dir = irf._init_checkpoint_dir(job=job, tmp_dir=tmp_dir)
+    irf._write_checkpoint(checkpoint_dir, "merlict", tabrec, prng)
+
+    resubmitted_job = make_job(
+        date_dict={"unix": 2.0, "iso": "2020-01-02"}, num_trajectory_workers=4
+    )
+    checkpoint_dir = irf._init_checkpoint_dir(
+        job=resubmitted_job, tmp_dir=tmp_dir
+    )
+    done, _ = irf._resume_checkpoint(
+        checkpoint_dir, "merlict", tabrec, prng, logger
+    )
+    assert done
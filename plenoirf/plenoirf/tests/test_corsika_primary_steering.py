@@ -0,0 +1,136 @@
+import plenoirf
+import numpy as np
+
+cps = plenoirf.production.corsika_primary
+example = plenoirf.production.example
+
+
+DEFLECTION = {
+    "particle_energy_GeV": [5, 50, 1000],
+    "particle_azimuth_deg": [10.0, 20.0, 0.0],
+    "particle_zenith_deg": [40.0, 5.0, 0.0],
+    "cherenkov_x_m": [100.0, 10.0, 0.0],
+    "cherenkov_y_m": [-50.0, 1.0, 0.0],
+}
+
+# The view-cones reach beyond MAX_ZENITH_RAD.
+DEFLECTION_NEAR_HORIZON = dict(DEFLECTION)
+DEFLECTION_NEAR_HORIZON["particle_azimuth_deg"] = [-170.0, 90.0, 170.0]
+DEFLECTION_NEAR_HORIZON["particle_zenith_deg"] = [66.0, 62.0, 50.0]
+
+
+def _draw(prng_compatible, seed=1, deflection=DEFLECTION, num_events=1000):
+    return cps.draw_corsika_primary_steering_batch(
+        run_id=1,
+        site=example.EXAMPLE_SITE,
+        particle=example.EXAMPLE_PARTICLE,
+        site_particle_deflection=deflection,
+        num_events=num_events,
+        prng=np.random.Generator(np.random.MT19937(seed=seed)),
+        prng_compatible=prng_compatible,
+    )
+
+
+def test_steering_and_structured_array_match():
+    steering, primaries = _draw(prng_compatible=True)
+    assert len(steering["primaries"]) == primaries.shape[0]
+    for e, prm in enumerate(steering["primaries"]):
+        for key in primaries.dtype.names:
+            assert prm[key] == primaries[key][e]
+
+
+def test_steering_is_reproducible():
+    for prng_compatible in [True, False]:
+        _, a = _draw(prng_compatible=prng_compatible)
+        _, b = _draw(prng_compatible=prng_compatible)
+        np.testing.assert_array_equal(a, b)
+
+
+def test_batch_interpolates_deflection_like_scalar_interp():
+    _, primaries = _draw(prng_compatible=False)
+    for e in range(primaries.shape[0]):
+        expected = np.deg2rad(
+            np.interp(
+                x=primaries["energy_GeV"][e],
+                xp=[5, 50, 1000],
+                fp=[40.0, 5.0, 0.0],
+            )
+        )
+        assert primaries["magnet_zenith_rad"][e] == expected
+
+
+def test_viewcone_batch_is_within_cone():
+    prng = np.random.Generator(np.random.PCG64(3))
+    num = 10000
+    az = prng.uniform(low=-np.pi, high=np.pi, size=num)
+    zd = prng.uniform(low=0.0, high=np.deg2rad(60), size=num)
+    min_rad = np.deg2rad(2.0)
+    max_rad = np.deg2rad(13.0)
+    out_az, out_zd = cps.draw_azimuth_zenith_in_viewcone_batch(
+        prng=prng,
+        azimuth_rad=az,
+        zenith_rad=zd,
+        min_scatter_opening_angle_rad=min_rad,
+        max_scatter_opening_angle_rad=max_rad,
+    )
+
+    def direction(a, z):
+        return np.c_[np.cos(a) * np.sin(z), np.sin(a) * np.sin(z), np.cos(z)]
+
+    cos_delta = np.sum(direction(az, zd) * direction(out_az, out_zd), axis=1)
+    delta = np.arccos(np.clip(cos_delta, -1.0, 1.0))
+    assert np.all(delta >= min_rad - 1e-9)
+    assert np.all(delta <= max_rad + 1e-9)
+
+    # uniform in solid angle: half of the directions are within the
+    # cone of half the solid angle.
+    cos_half = 0.5 * (np.cos(min_rad) + np.cos(max_rad))
+    frac = np.mean(cos_delta >= cos_half)
+    assert 0.48 < frac < 0.52
+
+
+def test_viewcone_batch_rejects_beyond_max_zenith():
+    prng = np.random.Generator(np.random.PCG64(4))
+    num = 10000
+    zd = np.deg2rad(65.0) * np.ones(num)
+    out_az, out_zd = cps.draw_azimuth_zenith_in_viewcone_batch(
+        prng=prng,
+        azimuth_rad=np.zeros(num),
+        zenith_rad=zd,
+        min_scatter_opening_angle_rad=0.0,
+        max_scatter_opening_angle_rad=np.deg2rad(13.0),
+    )
+    assert np.all(out_zd <= cps.MAX_ZENITH_RAD)
+    assert np.any(out_zd > np.deg2rad(69.0))
+
+
+def _assert_histograms_match(a, b, bin_edges):
+    ha = np.histogram(a, bins=bin_edges)[0]
+    hb = np.histogram(b, bins=bin_edges)[0]
+    assert np.sum(ha) == np.sum(hb) == a.shape[0]
+    # within 5 sigma of the counting-statistics
+    assert np.all(np.abs(ha - hb) <= 5.0 * np.sqrt(ha + hb) + 1)
+
+
+def test_batch_and_prng_compatible_draw_the_same_distribution():
+    for deflection in [DEFLECTION, DEFLECTION_NEAR_HORIZON]:
+        _, compatible = _draw(
+            prng_compatible=True, deflection=deflection, num_events=20000
+        )
+        _, batch = _draw(
+            prng_compatible=False, deflection=deflection, num_events=20000
+        )
+        for key in ["energy_GeV", "magnet_azimuth_rad", "magnet_zenith_rad"]:
+            np.testing.assert_array_equal(compatible[key], batch[key])
+
+        _assert_histograms_match(
+            a=compatible["zenith_rad"],
+            b=batch["zenith_rad"],
+            bin_edges=np.linspace(0.0, np.pi / 2, 46),
+        )
+        _assert_histograms_match(
+            a=np.mod(compatible["azimuth_rad"], 2.0 * np.pi),
+            b=np.mod(batch["azimuth_rad"], 2.0 * np.pi),
+            bin_edges=np.linspace(0.0, 2.0 * np.pi, 37),
+        )
+        assert np.all(batch["zenith_rad"] <= cps.MAX_ZENITH_RAD)
@@ -0,0 +1,162 @@
+import plenoirf
+import numpy as np
+import multiprocessing
+import mmap
+import time
+import os
+
+
+class Geometry:
+    def __init__(self, prng):
+        self.number_lixel = 1000
+        self.cx_mean = prng.uniform(size=1000)
+        self.lixel_polygon = prng.uniform(size=(10, 2))
+        self.sensors = {
+            "ids": np.arange(5000, dtype=np.uint32),
+            "names": ["a", "b"],
+        }
+
+
+def _make_source_and_scenery(tmp_path, scenery):
+    source_path = str(tmp_path / "geometry")
+    os.makedirs(source_path)
+    with open(os.path.join(source_path, "geometry.bin"), "wb") as f:
+        f.write(bytes(100))
+    scenery_path = str(tmp_path / "scenery.json")
+    with open(scenery_path, "wt") as f:
+        f.write(scenery)
+    return source_path, scenery_path
+
+
+def test_cache_is_read_only_memmap_and_page_aligned(tmp_path):
+    source_path, scenery_path = _make_source_and_scenery(tmp_path, "{}")
+    geometry = Geometry(prng=np.random.Generator(np.random.PCG64(1)))
+    num_loads = []
+
+    def load(path):
+        num_loads.append(1)
+        return geometry
+
+    kwargs = {
+        "source_path": source_path,
+        "scenery_path": scenery_path,
+        "load": load,
+        "module_prefixes": (__name__,),
+    }
+    g1 = plenoirf.geometry_cache.read_or_load(**kwargs)
+    assert g1 is geometry
+    g2 = plenoirf.geometry_cache.read_or_load(**kwargs)
+    assert len(num_loads) == 1
+
+    assert isinstance(g2, Geometry)
+    assert g2.number_lixel == 1000
+    np.testing.assert_array_equal(g2.cx_mean, geometry.cx_mean)
+    np.testing.assert_array_equal(g2.sensors["ids"], geometry.sensors["ids"])
+    assert g2.sensors["names"] == ["a", "b"]
+
+    for array in [g2.cx_mean, g2.sensors["ids"]]:
+        assert isinstance(array, np.memmap)
+        assert not array.flags.writeable
+        assert array.offset % mmap.ALLOCATIONGRANULARITY == 0
+
+    # small arrays stay in the skeleton
+    assert not isinstance(g2.lixel_polygon, np.memmap)
+    np.testing.assert_array_equal(g2.lixel_polygon, geometry.lixel_polygon)
+
+
+def test_cache_is_invalid_when_scenery_changes(tmp_path):
+    source_path, scenery_path = _make_source_and_scenery(tmp_path, "{}")
+    geometry = Geometry(prng=np.random.Generator(np.random.PCG64(1)))
+    cache_path = plenoirf.geometry_cache.default_cache_path(source_path)
+    plenoirf.geometry_cache.write(
+        geometry=geometry,
+        cache_path=cache_path,
+        scenery_path=scenery_path,
+        source_path=source_path,
+        module_prefixes=(__name__,),
+    )
+    assert plenoirf.geometry_cache.is_valid(
+        cache_path=cache_path,
+        scenery_path=scenery_path,
+        source_path=source_path,
+    )
+
+    with open(scenery_path, "wt") as f:
+        f.write('{"mirror": 1}')
+    assert not plenoirf.geometry_cache.is_valid(
+        cache_path=cache_path,
+        scenery_path=scenery_path,
+        source_path=source_path,
+    )
+
+
+def test_valid_cache_is_kept_and_invalid_cache_is_replaced(tmp_path):
+    source_path, scenery_path = _make_source_and_scenery(tmp_path, "{}")
+    geometry = Geometry(prng=np.random.Generator(np.random.PCG64(1)))
+    cache_path = plenoirf.geometry_cache.default_cache_path(source_path)
+    kwargs = {
+        "geometry": geometry,
+        "cache_path": cache_path,
+        "scenery_path": scenery_path,
+        "source_path": source_path,
+        "module_prefixes": (__name__,),
+    }
+    plenoirf.geometry_cache.write(**kwargs)
+    inode = os.stat(cache_path).st_ino
+    g1 = plenoirf.geometry_cache.read(cache_path, (__name__,))
+
+    plenoirf.geometry_cache.write(**kwargs)
+    assert os.stat(cache_path).st_ino == inode
+
+    with open(scenery_path, "wt") as f:
+        f.write('{"mirror": 1}')
+    plenoirf.geometry_cache.write(**kwargs)
+    assert os.stat(cache_path).st_ino != inode
+    assert plenoirf.geometry_cache.is_valid(
+        cache_path=cache_path,
+        scenery_path=scenery_path,
+        source_path=source_path,
+    )
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "geometry",
+        "geometry.cache",
+        "scenery.json",
+    ]
+    # the memmaps of the replaced cache can still be read
+    np.testing.assert_array_equal(g1.cx_mean, geometry.cx_mean)
+
+
+def _read_or_load_many_times(source_path, scenery_path, expected, barrier):
+    def load(path):
+        time.sleep(0.05)
+        return Geometry(prng=np.random.Generator(np.random.PCG64(1)))
+
+    barrier.wait()
+    for i in range(20):
+        g = plenoirf.geometry_cache.read_or_load(
+            source_path=source_path,
+            scenery_path=scenery_path,
+            load=load,
+            module_prefixes=(__name__,),
+        )
+        np.testing.assert_array_equal(g.cx_mean, expected)
+
+
+def test_workers_starting_cold_at_the_same_time(tmp_path):
+    source_path, scenery_path = _make_source_and_scenery(tmp_path, "{}")
+    expected = Geometry(prng=np.random.Generator(np.random.PCG64(1))).cx_mean
+    ctx = multiprocessing.get_context("fork")
+    num_workers = 6
+    barrier = ctx.Barrier(num_workers)
+    procs = [
+        ctx.Process(
+            target=_read_or_load_many_times,
+            args=(source_path, scenery_path, expected, barrier),
+        )
+        for i in range(num_workers)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    assert [proc.exitcode for proc in procs] == [0] * num_workers
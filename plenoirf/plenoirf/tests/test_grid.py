@@ -1,6 +1,8 @@
 import plenoirf
 import corsika_primary as cpw
 import numpy as np
+import os
+import tarfile
 import pytest
 
 
@@ -324,3 +326,297 @@ def test_shower_x_moves_but_counteracted():
 
         assert 510 < result["random_choice"]["bin_idx_x"] < 514
         assert 510 < result["random_choice"]["bin_idx_y"] < 514
+
+
+def test_histogram_uniform_same_as_histogram2d():
+    prng = np.random.Generator(np.random.MT19937(seed=0))
+
+    cherenkov_bunches = make_cherenkov_bunches(
+        prng=prng,
+        cx_deg=0.0,
+        cx_std_deg=1.0,
+        cy_deg=0.0,
+        cy_std_deg=1.0,
+        x_m=0.0,
+        x_std_m=1e4,
+        y_m=0.0,
+        y_std_m=1e4,
+        num_bunches=100 * 1000,
+    )
+    xy_bin_edges = np.linspace(-2e4, 2e4, 2 * 64 + 1)
+    x = cherenkov_bunches[:, cpw.I.BUNCH.X] * cpw.CM2M
+    y = cherenkov_bunches[:, cpw.I.BUNCH.Y] * cpw.CM2M
+    w = cherenkov_bunches[:, cpw.I.BUNCH.BSIZE]
+
+    (
+        ref_hist,
+        ref_overflow,
+        ref_x_idxs,
+        ref_y_idxs,
+    ) = plenoirf.grid.histogram2d_overflow_and_bin_idxs(
+        x=x, y=y, weights=w, xy_bin_edges=xy_bin_edges
+    )
+    (
+        hist,
+        overflow,
+        x_idxs,
+        y_idxs,
+    ) = plenoirf.grid.histogram2d_overflow_and_bin_idxs_uniform(
+        x=x, y=y, weights=w, xy_bin_edges=xy_bin_edges
+    )
+
+    np.testing.assert_array_almost_equal(hist, ref_hist)
+    for key in ref_overflow:
+        assert ref_overflow[key] > 0.0
+        np.testing.assert_almost_equal(overflow[key], ref_overflow[key])
+    np.testing.assert_array_equal(x_idxs, ref_x_idxs)
+    np.testing.assert_array_equal(y_idxs, ref_y_idxs)
+
+
+def test_histogram_uniform_rejects_non_uniform_bin_edges():
+    with pytest.raises(AssertionError):
+        plenoirf.grid.histogram2d_overflow_and_bin_idxs_uniform(
+            x=np.zeros(3),
+            y=np.zeros(3),
+            weights=np.ones(3),
+            xy_bin_edges=np.array([-2.0, -1.0, 0.0, 3.0]),
+        )
+
+
+def test_bin_index_same_as_matching_bin_idxs():
+    prng = np.random.Generator(np.random.MT19937(seed=0))
+    num_bins = 16
+    num_bunches = 10 * 1000
+    x_bin_idxs = prng.integers(low=0, high=num_bins + 2, size=num_bunches)
+    y_bin_idxs = prng.integers(low=0, high=num_bins + 2, size=num_bunches)
+
+    bin_index = plenoirf.grid.init_bin_index(
+        x_bin_idxs=x_bin_idxs, y_bin_idxs=y_bin_idxs, num_bins=num_bins,
+    )
+
+    num_bunches_in_grid = 0
+    for bin_idx_x in range(num_bins):
+        for bin_idx_y in range(num_bins):
+            match_bin = np.logical_and(
+                x_bin_idxs - 1 == bin_idx_x, y_bin_idxs - 1 == bin_idx_y
+            )
+            bunch_idxs = plenoirf.grid.get_bunch_idxs_in_bin(
+                bin_index=bin_index, bin_idx_x=bin_idx_x, bin_idx_y=bin_idx_y,
+            )
+            np.testing.assert_array_equal(bunch_idxs, np.flatnonzero(match_bin))
+            num_bunches_in_grid += len(bunch_idxs)
+
+    assert num_bunches_in_grid == len(bin_index["bunch_idxs"])
+    assert num_bunches_in_grid < num_bunches
+
+
+def test_grid_assign_multiple_reuses_are_distinct():
+    prng = np.random.Generator(np.random.PCG64(seed=0))
+
+    cherenkov_bunches = make_cherenkov_bunches(
+        prng=prng,
+        cx_deg=0.0,
+        cx_std_deg=1.0,
+        cy_deg=0.0,
+        cy_std_deg=1.0,
+        x_m=0.0,
+        x_std_m=100.0,
+        y_m=0.0,
+        y_std_m=100.0,
+        num_bunches=10 * 1000,
+    )
+    result = plenoirf.grid.assign(
+        cherenkov_bunches=cherenkov_bunches,
+        grid_geometry=PLENOSCOPE_GRID_GEOMETRY,
+        shift_x=0.0,
+        shift_y=0.0,
+        threshold_num_photons=50,
+        prng=prng,
+        bin_idxs_limitation=None,
+        num_reuses=10,
+    )
+    assert result["num_bins_above_threshold"] > 10
+    choices = result["random_choices"]
+    assert len(choices) == 10
+    assert result["random_choice"] is choices[0]
+
+    bins = set([(c["bin_idx_x"], c["bin_idx_y"]) for c in choices])
+    assert len(bins) == len(choices)
+    for c in choices:
+        num_photons = np.sum(c["cherenkov_bunches"][:, cpw.I.BUNCH.BSIZE])
+        np.testing.assert_almost_equal(
+            num_photons, result["histogram"][c["bin_idx_x"], c["bin_idx_y"]]
+        )
+
+
+def test_mask_inside_field_of_view_same_as_angle():
+    prng = np.random.Generator(np.random.MT19937(seed=0))
+    num_bunches = 100 * 1000
+    cx = prng.uniform(low=-0.2, high=0.2, size=num_bunches)
+    cy = prng.uniform(low=-0.2, high=0.2, size=num_bunches)
+
+    pointings = [
+        [0, 0, 1],
+        [np.sin(np.deg2rad(5.0)), 0, np.cos(np.deg2rad(5.0))],
+        [0.05, -0.03, 1.0],
+    ]
+    for pointing in pointings:
+        pointing = np.array(pointing) / np.linalg.norm(pointing)
+        for fov_deg in [1.0, 3.575, 6.5]:
+            ref = plenoirf.grid._mask_inside_field_of_view_by_angle(
+                cx=cx,
+                cy=cy,
+                field_of_view_radius_deg=fov_deg,
+                pointing_direction=pointing,
+            )
+            mask = plenoirf.grid.mask_inside_field_of_view(
+                cx=cx,
+                cy=cy,
+                field_of_view_radius_deg=fov_deg,
+                pointing_direction=pointing,
+            )
+            assert np.sum(ref) > 0
+            assert np.sum(mask != ref) <= 1e-4 * num_bunches
+
+
+def test_histogram_bytes_dense_and_sparse():
+    prng = np.random.Generator(np.random.MT19937(seed=0))
+    img = np.zeros(shape=(64, 64))
+    img[prng.integers(0, 64, 50), prng.integers(0, 64, 50)] = prng.uniform(
+        low=1, high=1e3, size=50
+    )
+    img[0, 0] = np.nan
+    img[63, 63] = 7.0
+
+    for fmt in plenoirf.grid.HISTOGRAM_FILE_EXTENSIONS:
+        img_bytes = plenoirf.grid.histogram_to_bytes(img, fmt=fmt)
+        for read_fmt in [fmt, None]:
+            back = plenoirf.grid.bytes_to_histogram(img_bytes, fmt=read_fmt)
+            assert back.dtype == np.dtype("<f4")
+            np.testing.assert_array_equal(back, img.astype("<f4"))
+
+        file_name = plenoirf.grid.histogram_file_name(idx=1000042, fmt=fmt)
+        assert file_name.startswith("000001000042")
+        assert plenoirf.grid.histogram_format_from_file_name(file_name) == fmt
+
+    empty = np.zeros(shape=(4, 4))
+    empty_bytes = plenoirf.grid.histogram_to_bytes(empty, fmt="sparse")
+    np.testing.assert_array_equal(
+        plenoirf.grid.bytes_to_histogram(empty_bytes), empty
+    )
+
+
+def test_histograms_tar_with_mixed_formats(tmp_path):
+    hists = {
+        1000001: np.diag(np.arange(8.0)),
+        1000002: np.ones(shape=(8, 8)),
+    }
+    grid_histograms = {
+        1000001: plenoirf.grid.histogram_to_bytes(hists[1000001], "sparse"),
+        1000002: plenoirf.grid.histogram_to_bytes(hists[1000002], "dense"),
+    }
+    path = str(tmp_path / "grid.tar")
+    plenoirf.grid.write_histograms(path=path, grid_histograms=grid_histograms)
+
+    back = plenoirf.grid.read_histograms(path=path, indices=[1000002])
+    assert list(back.keys()) == [1000002]
+
+    with plenoirf.grid.GridReader(path=path) as reader:
+        for idx, img in reader:
+            np.testing.assert_array_equal(img, hists[idx])
+
+
+def test_read_histograms_with_and_without_index(tmp_path):
+    prng = np.random.Generator(np.random.PCG64(13))
+    grid_histograms = {}
+    for idx in 1000000 + np.arange(0, 300, 3):
+        img = prng.uniform(size=(8, 8)) * (prng.uniform(size=(8, 8)) > 0.8)
+        grid_histograms[int(idx)] = plenoirf.grid.histogram_to_bytes(
+            img, "sparse"
+        )
+
+    part_paths = []
+    for i, idxs in enumerate(np.array_split(sorted(grid_histograms), 3)):
+        part_path = str(tmp_path / "{:d}_grid.tar".format(i))
+        plenoirf.grid.write_histograms(
+            path=part_path,
+            grid_histograms={int(j): grid_histograms[j] for j in idxs},
+        )
+        part_paths.append(part_path)
+
+    path = str(tmp_path / "grid.tar")
+    plenoirf.grid.reduce(list_of_grid_paths=part_paths, out_path=path)
+    assert plenoirf.grid.read_histogram_index(path) is not None
+
+    indices = [1000000, 1000001, 1000150, 1000297, 9999999]
+    with_index = plenoirf.grid.read_histograms(path=path, indices=indices)
+    assert sorted(with_index.keys()) == [1000000, 1000150, 1000297]
+    for idx in with_index:
+        assert with_index[idx] == grid_histograms[idx]
+
+    os.remove(path + plenoirf.grid.HISTOGRAM_INDEX_EXT)
+    assert plenoirf.grid.read_histogram_index(path) is None
+    without_index = plenoirf.grid.read_histograms(path=path, indices=indices)
+    assert with_index == without_index
+
+    # an index which does not match its tar anymore is ignored
+    plenoirf.grid.write_histograms(
+        path=path, grid_histograms={1000150: grid_histograms[1000150]}
+    )
+    with open(path, "ab") as f:
+        f.write(bytes(tarfile.RECORDSIZE))
+    assert plenoirf.grid.read_histogram_index(path) is None
+    back = plenoirf.grid.read_histograms(path=path, indices=indices)
+    assert list(back.keys()) == [1000150]
+
+
+def test_reduce_copies_members_as_they_are(tmp_path):
+    part_paths = []
+    expected = []
+    for i, num in enumerate([3, 0, 1, 5]):
+        grid_histograms = {}
+        for j in range(num):
+            idx = 1000000 + 100 * i + j
+            img = np.eye(4 + j) * (1 + idx)
+            grid_histograms[idx] = plenoirf.grid.histogram_to_bytes(img)
+            expected.append((idx, grid_histograms[idx]))
+        part_path = str(tmp_path / "{:d}_grid.tar".format(i))
+        plenoirf.grid.write_histograms(part_path, grid_histograms)
+        part_paths.append(part_path)
+
+    path = str(tmp_path / "grid.tar")
+    plenoirf.grid.reduce(list_of_grid_paths=part_paths, out_path=path)
+
+    assert os.stat(path).st_size % tarfile.RECORDSIZE == 0
+    members = []
+    with tarfile.open(path, "r") as tarfin:
+        for tarinfo in tarfin:
+            idx = int(tarinfo.name[0 : plenoirf.unique.UID_NUM_DIGITS])
+            members.append((idx, tarfin.extractfile(tarinfo).read()))
+    assert members == expected
+
+    with plenoirf.grid.GridReader(path=path) as reader:
+        assert [idx for idx, img in reader] == [e[0] for e in expected]
+
+
+def test_dense_histogram_buffer_grows_and_is_read_back(tmp_path):
+    prng = np.random.Generator(np.random.PCG64(13))
+    buff = plenoirf.grid.DenseHistogramBuffer(shape=(5, 5), capacity=2)
+    expected = []
+    for i in range(11):
+        img = prng.uniform(size=(5, 5))
+        img[0, 0] = np.nan
+        buff.append(idx=1000000 + i, img=img)
+        expected.append(img.astype("<f4"))
+    assert len(buff) == 11
+
+    path = str(tmp_path / "grid_roi")
+    buff.write(path=path)
+    idx, histograms = plenoirf.grid.read_dense_histogram_buffer(path=path)
+    np.testing.assert_array_equal(idx, 1000000 + np.arange(11))
+    assert not histograms.flags.writeable
+    for i in range(11):
+        np.testing.assert_array_equal(histograms[i], expected[i])
+
+    img_bytes = plenoirf.grid.histogram_to_bytes(histograms[3])
+    assert img_bytes == plenoirf.grid.histogram_to_bytes(expected[3])
@@ -0,0 +1,71 @@
+import plenoirf
+import numpy as np
+import pytest
+import types
+
+irf = plenoirf.instrument_response
+
+
+class ReachedCorsika(Exception):
+    pass
+
+
+def make_job(grid_config):
+    config = {
+        "plenoscope_pointing": {"azimuth_deg": 0.0, "zenith_deg": 0.0},
+        "particles": {"gamma": {"particle_id": 1}},
+        "sites": {"namibia": {"observation_level_asl_m": 2300}},
+        "grid": grid_config,
+        "raw_sensor_response": {},
+        "sum_trigger": {},
+        "cherenkov_classification": {},
+        "reconstruction": {},
+        "artificial_core_limitation": {"gamma": None},
+    }
+    return irf.make_job_dict(
+        run_dir="/run",
+        production_key="prod",
+        run_id=42,
+        site_key="namibia",
+        particle_key="gamma",
+        config=config,
+        deflection_table={"namibia": {"gamma": {}}},
+        num_air_showers=10,
+        corsika_primary_path="corsika",
+        merlict_plenoscope_propagator_path="merlict",
+        tmp_dir="/tmp",
+        keep_tmp_dir=False,
+        date_dict={"unix": 1.0, "iso": "2020-01-01"},
+    )
+
+
+def test_grid_stage_runs_with_config_without_num_reuses(tmp_path, monkeypatch):
+    # a config written before airshowers could be reused
+    job = make_job(grid_config={"output_after_num_events": 10})
+    assert irf.num_reuses_per_shower(grid_config=job["grid"]) == 1
+
+    def event_tape_writer(path):
+        raise ReachedCorsika()
+
+    monkeypatch.setattr(irf, "_init_grid_geometry_from_job", lambda job: None)
+    monkeypatch.setattr(
+        irf.cpw,
+        "event_tape",
+        types.SimpleNamespace(EventTapeWriter=event_tape_writer),
+        raising=False,
+    )
+    with pytest.raises(ReachedCorsika):
+        irf._run_corsika_and_grid_and_output_to_tmp_dir(
+            job=job,
+            prng=np.random.Generator(np.random.PCG64(1)),
+            tmp_dir=str(tmp_path),
+            corsika_primary_steering={},
+            tabrec=irf._init_table_records(),
+            cherenkov_pools_path=str(tmp_path / "cherenkov_pools.tar"),
+        )
+
+
+def test_more_reuses_than_the_summary_can_join_are_refused():
+    make_job(grid_config={"num_reuses_per_shower": 1})
+    with pytest.raises(AssertionError):
+        make_job(grid_config={"num_reuses_per_shower": 2})
@@ -0,0 +1,63 @@
+import plenoirf
+import numpy as np
+import pytest
+
+
+def test_left_join_with_fill_value():
+    keys = np.array([7, 3, 11, 5], dtype=np.uint64)
+    values = np.array([True, False, True, True])
+    target_keys = np.array([1, 3, 5, 7, 9, 11, 13], dtype=np.uint64)
+
+    out = plenoirf.join.left(
+        keys=keys, values=values, target_keys=target_keys, fill_value=0.0
+    )
+    assert out.dtype == np.float64
+    np.testing.assert_array_equal(out, [0, 0, 1, 1, 0, 1, 0])
+
+    out = plenoirf.join.left(
+        keys=keys, values=values.astype(np.float64), target_keys=target_keys
+    )
+    np.testing.assert_array_equal(out[[1, 2]], [0.0, 1.0])
+    assert np.all(np.isnan(out[[0, 4, 6]]))
+
+
+def test_left_join_requires_all_keys():
+    keys = np.arange(100, dtype=np.uint64)[::-1]
+    values = np.arange(100) * 0.5
+    target_keys = np.array([99, 0, 42], dtype=np.uint64)
+
+    out = plenoirf.join.left(
+        keys=keys, values=values, target_keys=target_keys, require_all=True
+    )
+    np.testing.assert_array_equal(out, [0.0, 49.5, 28.5])
+
+    with pytest.raises(AssertionError):
+        plenoirf.join.left(
+            keys=keys,
+            values=values,
+            target_keys=np.array([100], dtype=np.uint64),
+            require_all=True,
+        )
+
+    with pytest.raises(AssertionError):
+        plenoirf.join.left(
+            keys=np.array([1, 1]), values=np.zeros(2), target_keys=[1]
+        )
+
+
+def test_inner_join_and_empty_keys():
+    keys = np.array([4, 2, 8])
+    values = np.array([40, 20, 80])
+    target_positions, aligned = plenoirf.join.inner(
+        keys=keys, values=values, target_keys=[9, 8, 1, 2, 3]
+    )
+    np.testing.assert_array_equal(target_positions, [1, 3])
+    np.testing.assert_array_equal(aligned, [80, 20])
+
+    out = plenoirf.join.left(
+        keys=np.array([], dtype=np.uint64),
+        values=np.array([]),
+        target_keys=np.array([1, 2], dtype=np.uint64),
+        fill_value=-1.0,
+    )
+    np.testing.assert_array_equal(out, [-1.0, -1.0])
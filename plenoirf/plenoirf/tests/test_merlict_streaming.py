@@ -0,0 +1,95 @@
+import plenoirf
+import json_line_logger as jlogging
+import numpy as np
+import pytest
+import os
+import stat
+import time
+
+irf = plenoirf.instrument_response
+
+CHUNK = b"x" * 4096
+NUM_CHUNKS = 256
+
+# the arguments are: -l L -c C -i IN -o OUT -r R
+PROPAGATORS = {
+    "copy": '#!/bin/sh\ncat "$6" > "$8"\n',
+    "dies_mid_stream": '#!/bin/sh\nhead -c 10000 "$6" > "$8"\nexit 3\n',
+    "dies_before_open": "#!/bin/sh\nexit 3\n",
+}
+
+
+def make_job(tmp_path, propagator):
+    propagator_path = str(tmp_path / "merlict.sh")
+    with open(propagator_path, "wt") as f:
+        f.write(PROPAGATORS[propagator])
+    os.chmod(propagator_path, stat.S_IRWXU)
+    log_dir = str(tmp_path / "log")
+    os.makedirs(log_dir)
+    return {
+        "run_id": 1,
+        "log_dir": log_dir,
+        "light_field_geometry_path": "light_field_geometry",
+        "merlict_plenoscope_propagator_path": propagator_path,
+        "merlict_plenoscope_propagator_config_path": "config.json",
+    }
+
+
+def fake_corsika_and_grid(
+    job, prng, tmp_dir, corsika_primary_steering, tabrec, cherenkov_pools_path
+):
+    # CORSIKA takes a while to start, merlict might be gone already.
+    time.sleep(0.3)
+    with open(cherenkov_pools_path, "wb") as f:
+        for i in range(NUM_CHUNKS):
+            f.write(CHUNK)
+    tabrec["primary"].new_row(idx=1000001)
+    tabrec["core"].new_row(idx=1000001)
+    return cherenkov_pools_path, tabrec
+
+
+def run_streaming(tmp_path, propagator):
+    job = make_job(tmp_path=tmp_path, propagator=propagator)
+    tmp_dir = str(tmp_path / "tmp")
+    os.makedirs(tmp_dir)
+    # a FIFO left behind by a killed job
+    os.mkfifo(os.path.join(tmp_dir, "cherenkov_pools.fifo"))
+    path, tabrec = irf._run_corsika_and_grid_and_merlict_streaming(
+        job=job,
+        prng=np.random.Generator(np.random.MT19937(seed=1)),
+        tmp_dir=tmp_dir,
+        corsika_primary_steering={},
+        tabrec=irf._init_table_records(),
+        logger=jlogging.LoggerStdout(),
+    )
+    return tmp_dir, path, tabrec
+
+
+def test_streaming_replaces_stale_fifo(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        irf,
+        "_run_corsika_and_grid_and_output_to_tmp_dir",
+        fake_corsika_and_grid,
+    )
+    tmp_dir, path, tabrec = run_streaming(tmp_path, propagator="copy")
+    assert os.path.getsize(path) == len(CHUNK) * NUM_CHUNKS
+    assert len(tabrec["core"]) == 1
+    assert not os.path.exists(os.path.join(tmp_dir, "cherenkov_pools.fifo"))
+    assert os.path.exists(str(tmp_path / "log" / "000001_merlict.stderr"))
+
+
+@pytest.mark.parametrize(
+    "propagator", ["dies_mid_stream", "dies_before_open"]
+)
+def test_streaming_does_not_block_when_propagator_dies(
+    tmp_path, monkeypatch, propagator
+):
+    monkeypatch.setattr(
+        irf,
+        "_run_corsika_and_grid_and_output_to_tmp_dir",
+        fake_corsika_and_grid,
+    )
+    with pytest.raises((BrokenPipeError, AssertionError)):
+        run_streaming(tmp_path, propagator=propagator)
+    tmp_dir = str(tmp_path / "tmp")
+    assert not os.path.exists(os.path.join(tmp_dir, "cherenkov_pools.fifo"))
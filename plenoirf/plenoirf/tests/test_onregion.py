@@ -73,3 +73,72 @@ def test_point_in_centered_rotated_ellipse():
     assert inside(0, 1)
     assert inside(0, 2)
     assert not inside(0, 2.1)
+
+
+ONREGION_CONFIG = {
+    "opening_angle_deg": 0.8,
+    "opening_angle_scaling": {
+        "reco_num_photons_pe": [1e1, 1e2, 1e3],
+        "scale": [1.0, 0.5, 0.25],
+    },
+    "ellipticity_scaling": {
+        "reco_core_radius_m": [0.0, 150.0, 400.0],
+        "scale": [1.0, 1.5, 3.0],
+    },
+}
+
+
+def _draw_events(prng, num):
+    return {
+        "reco_cx": np.deg2rad(prng.uniform(-4.0, 4.0, num)),
+        "reco_cy": np.deg2rad(prng.uniform(-4.0, 4.0, num)),
+        "reco_main_axis_azimuth": prng.uniform(0.0, 2.0 * np.pi, num),
+        "reco_num_photons": prng.uniform(1.0, 2e3, num),
+        "reco_core_radius": prng.uniform(0.0, 600.0, num),
+    }
+
+
+def test_onregions_of_arrays_equal_single_onregions():
+    onregion = plenoirf.reconstruction.onregion
+    prng = np.random.Generator(np.random.PCG64(1))
+    events = _draw_events(prng=prng, num=100)
+    true_cx = events["reco_cx"] + np.deg2rad(prng.normal(0.0, 0.5, 100))
+    true_cy = events["reco_cy"] + np.deg2rad(prng.normal(0.0, 0.5, 100))
+
+    onregions = onregion.estimate_onregions(**events, config=ONREGION_CONFIG)
+    hits = onregion.is_direction_inside_onregions(
+        cx=true_cx, cy=true_cy, onregions=onregions
+    )
+    assert 0 < np.sum(hits) < 100
+
+    for i in range(100):
+        single = onregion.estimate_onregion(
+            **{key: events[key][i] for key in events}, config=ONREGION_CONFIG
+        )
+        for key in single:
+            assert single[key] == onregions[key][i]
+        assert hits[i] == onregion.is_direction_inside(
+            cx=true_cx[i], cy=true_cy[i], onregion=single
+        )
+
+
+def test_intersecting_area_of_onregions_and_polygon():
+    onregion = plenoirf.reconstruction.onregion
+    prng = np.random.Generator(np.random.PCG64(2))
+    events = _draw_events(prng=prng, num=200)
+    onregions = onregion.estimate_onregions(**events, config=ONREGION_CONFIG)
+    circle = onregion.make_circular_polygon(
+        radius=np.deg2rad(2.75), num_steps=37
+    )
+
+    areas = onregion.intersecting_area_of_onregions_and_polygon(
+        onregions=onregions, polygon=circle, num_steps=37, chunk_size=16
+    )
+    for i in range(200):
+        single = {key: onregions[key][i] for key in onregions}
+        expected = onregion.intersecting_area_of_polygons(
+            a=onregion.make_polygon(onregion=single, num_steps=37), b=circle
+        )
+        np.testing.assert_allclose(areas[i], expected, rtol=1e-9, atol=1e-15)
+    assert np.any(areas == 0.0)
+    assert np.any(areas > 0.0)
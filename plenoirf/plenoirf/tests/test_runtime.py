@@ -0,0 +1,97 @@
+import plenoirf
+import json_line_logger as jlogging
+import numpy as np
+import pandas as pd
+import os
+
+
+def test_stages_are_reduced_into_runtime_csv(tmp_path):
+    log_paths = []
+    for run_id in [2, 1]:
+        log_path = str(tmp_path / "{:06d}_runtime.jsonl".format(run_id))
+        logger = jlogging.LoggerFile(path=log_path)
+        logger.info("starting run")
+        with plenoirf.runtime.Stage(logger, "draw_primary") as stage:
+            _ = np.random.uniform(size=100000)
+            stage.count("num_events", 10 * run_id)
+        with plenoirf.runtime.Stage(logger, "export table") as stage:
+            with open(str(tmp_path / "out.bin"), "wb") as f:
+                f.write(bytes(1000))
+        log_paths.append(log_path)
+
+    csv_path = str(tmp_path / "runtime.csv")
+    plenoirf.runtime.reduce(list_of_log_paths=log_paths, out_path=csv_path)
+    rt = pd.read_csv(csv_path).to_records(index=False)
+
+    np.testing.assert_array_equal(rt["run_id"], [1, 2])
+    np.testing.assert_array_equal(rt["draw_primary.num_events"], [10, 20])
+    assert np.all(rt["draw_primary"] >= 0.0)
+    assert np.all(rt["export table.peak_rss_byte"] > 0)
+    assert np.all(rt["draw_primary.cpu_user_s"] >= 0.0)
+
+    stages = plenoirf.runtime.stage_keys(rt.dtype.names)
+    assert stages == ["draw_primary", "export table"]
+
+
+def test_read_proc_self_io_missing_file(tmp_path):
+    proc_io = plenoirf.runtime.read_proc_self_io(path=str(tmp_path / "nope"))
+    assert np.isnan(proc_io["read_bytes"])
+    assert np.isnan(proc_io["write_bytes"])
+
+
+def test_accumulated_stage(tmp_path):
+    log_path = str(tmp_path / "000001_runtime.jsonl")
+    logger = jlogging.LoggerFile(path=log_path)
+    acc = plenoirf.runtime.AccumulatedStage(logger, "classify")
+    for i in range(3):
+        with acc:
+            _ = np.random.uniform(size=10000)
+    acc.count("num_events", 3)
+    acc.log()
+
+    csv_path = str(tmp_path / "runtime.csv")
+    plenoirf.runtime.reduce(list_of_log_paths=[log_path], out_path=csv_path)
+    rt = pd.read_csv(csv_path).to_records(index=False)
+    assert rt["classify"][0] >= 0.0
+    assert rt["classify.num_events"][0] == 3
+    assert "classify.peak_rss_byte" not in rt.dtype.names
+
+
+def test_run_reduce_job_moves_runtime_csv_in_place_once(tmp_path, monkeypatch):
+    run_dir = str(tmp_path / "run")
+    site_particle_dir = os.path.join(run_dir, "production", "namibia", "gamma")
+    log_dir = os.path.join(site_particle_dir, "log.map")
+    os.makedirs(log_dir)
+    for run_id in [1, 2]:
+        logger = jlogging.LoggerFile(
+            path=os.path.join(log_dir, "{:06d}_runtime.jsonl".format(run_id))
+        )
+        with plenoirf.runtime.Stage(logger, "draw_primary"):
+            pass
+
+    moves = []
+
+    def move(src, dst):
+        moves.append((src, dst))
+        os.replace(src, dst)
+
+    monkeypatch.setattr(plenoirf.runtime.shutil, "move", move)
+    monkeypatch.setattr(plenoirf.instrument_response.nfs, "move", move)
+
+    plenoirf.instrument_response.run_reduce_job(
+        reduce_job={
+            "run_dir": run_dir,
+            "production_key": "production",
+            "site_key": "namibia",
+            "particle_key": "gamma",
+            "artifact_key": "runtime",
+            "LAZY": False,
+        },
+        logger=jlogging.LoggerStdout(),
+    )
+
+    csv_path = os.path.join(site_particle_dir, "runtime.csv")
+    assert moves == [(csv_path + ".tmp", csv_path)]
+    assert sorted(os.listdir(site_particle_dir)) == ["log.map", "runtime.csv"]
+    rt = pd.read_csv(csv_path).to_records(index=False)
+    np.testing.assert_array_equal(rt["run_id"], [1, 2])
@@ -0,0 +1,99 @@
+import plenoirf
+import numpy as np
+import os
+
+
+def _make_job(site_key, particle_key, run_id, max_energy_GeV=100.0):
+    return {
+        "site_key": site_key,
+        "particle_key": particle_key,
+        "run_id": run_id,
+        "num_air_showers": 100,
+        "particle": {
+            "energy_bin_edges_GeV": [1.0, max_energy_GeV],
+            "energy_power_law_slope": -1.5,
+            "max_scatter_angle_deg": 5.0,
+        },
+        "site_particle_deflection": {"particle_energy_GeV": [2.0, 10.0]},
+    }
+
+
+def _integrate(f, x):
+    return np.sum(0.5 * (f[1:] + f[:-1]) * np.diff(x))
+
+
+def test_mean_energy_of_power_law():
+    for slope in [-1.0, -1.5, -2.0, -2.7]:
+        e = np.geomspace(1.0, 100.0, 100001)
+        w = e ** slope
+        expected = _integrate(e * w, e) / _integrate(w, e)
+        mean = plenoirf.scheduling.mean_energy_of_power_law(
+            start=1.0, stop=100.0, slope=slope
+        )
+        np.testing.assert_allclose(mean, expected, rtol=1e-4)
+
+
+def test_bundles_are_balanced():
+    prng = np.random.Generator(np.random.PCG64(13))
+    jobs = list(range(200))
+    costs = prng.uniform(1.0, 100.0, size=len(jobs))
+    bundles, loads = plenoirf.scheduling.bundle_jobs(
+        jobs=jobs, costs=costs, num_bundles=7
+    )
+    assert len(bundles) == 7
+    assert sorted([j for b in bundles for j in b]) == jobs
+    for bundle, load in zip(bundles, loads):
+        np.testing.assert_allclose(np.sum(costs[bundle]), load)
+    lower_bound = max([np.sum(costs) / 7, np.max(costs)])
+    assert np.max(loads) <= 4 / 3 * lower_bound
+
+
+def test_more_bundles_than_jobs():
+    bundles, loads = plenoirf.scheduling.bundle_jobs(
+        jobs=["a", "b"], costs=[1.0, 2.0], num_bundles=5
+    )
+    assert bundles == [["b"], ["a"]]
+    assert loads == [2.0, 1.0]
+
+
+def test_cost_model_calibrates_prior_with_runtime(tmp_path):
+    site_particle_dir = tmp_path / "namibia" / "gamma"
+    os.makedirs(site_particle_dir)
+    runtime_csv_path = str(site_particle_dir / "runtime.csv")
+    with open(runtime_csv_path, "wt") as f:
+        f.write("run_id,draw_primary,draw_primary.num_events,corsika\n")
+        f.write("1,1.0,100,99.0\n")
+        f.write("2,2.0,100,198.0\n")
+        f.write("3,1.0,100,299.0\n")
+
+    paths = plenoirf.scheduling.find_runtime_csv_paths([str(tmp_path)])
+    assert paths == {"namibia": {"gamma": runtime_csv_path}}
+
+    gamma = _make_job("namibia", "gamma", 1)
+    proton = _make_job("namibia", "proton", 1, max_energy_GeV=1000.0)
+    cost_model = plenoirf.scheduling.init_cost_model(
+        jobs=[gamma, proton], runtime_csv_paths=paths
+    )
+    np.testing.assert_allclose(
+        plenoirf.scheduling.estimate_cost(cost_model, gamma), 200.0
+    )
+    prior_ratio = plenoirf.scheduling.prior_seconds_per_shower(
+        proton
+    ) / plenoirf.scheduling.prior_seconds_per_shower(gamma)
+    assert prior_ratio > 1.0
+    np.testing.assert_allclose(
+        plenoirf.scheduling.estimate_cost(cost_model, proton),
+        200.0 * prior_ratio,
+    )
+
+    actual = plenoirf.scheduling.read_actual_seconds(paths)
+    assert actual["namibia"]["gamma"] == {1: 100.0, 2: 200.0, 3: 300.0}
+    report = plenoirf.scheduling.make_report(
+        bundles=[[gamma, proton], [_make_job("namibia", "gamma", 3)]],
+        predicted_loads=[10.0, 20.0],
+        actual_seconds=actual,
+    )
+    assert report["actual_load_s"] == [100.0, 300.0]
+    assert report["actual_makespan_s"] == 300.0
+    assert report["predicted_makespan_s"] == 20.0
+    assert report["num_jobs_without_runtime"] == 1
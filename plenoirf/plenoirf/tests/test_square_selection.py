@@ -33,3 +33,49 @@ def test_full():
         img=img, ix=r, iy=r, r=r, fill=0,
     )
     np.testing.assert_array_equal(img, omg)
+
+
+def _copy_square_selection_loop(img, ix, iy, r, fill):
+    out = fill * np.ones(shape=(2 * r + 1, 2 * r + 1), dtype=img.dtype)
+    for ox, x in enumerate(np.arange(ix - r, ix + r + 1)):
+        for oy, y in enumerate(np.arange(iy - r, iy + r + 1)):
+            if x >= 0 and x < img.shape[0]:
+                if y >= 0 and y < img.shape[1]:
+                    out[ox, oy] = img[x, y]
+    return out
+
+
+def test_equal_to_loop_and_batch():
+    prng = np.random.Generator(np.random.PCG64(2))
+    img = prng.uniform(size=(40, 31)).astype(np.float32)
+    r = 12
+    ixs = prng.integers(low=-30, high=70, size=200)
+    iys = prng.integers(low=-30, high=70, size=200)
+
+    batch = plenoirf.utils.copy_square_selections_from_2D_array(
+        img=img, ixs=ixs, iys=iys, r=r, fill=np.nan,
+    )
+    assert batch.shape == (200, 2 * r + 1, 2 * r + 1)
+    assert batch.dtype == np.float32
+
+    for i in range(len(ixs)):
+        expected = _copy_square_selection_loop(
+            img=img, ix=ixs[i], iy=iys[i], r=r, fill=np.nan
+        )
+        o = plenoirf.utils.copy_square_selection_from_2D_array(
+            img=img, ix=ixs[i], iy=iys[i], r=r, fill=np.nan,
+        )
+        np.testing.assert_array_equal(o, expected)
+        np.testing.assert_array_equal(batch[i], expected)
+
+
+def test_batch_of_int_image_with_nan_fill():
+    img = np.arange(32 ** 2).reshape(32, 32)
+    batch = plenoirf.utils.copy_square_selections_from_2D_array(
+        img=img, ixs=[0, 5], iys=[0, 5], r=1, fill=np.nan,
+    )
+    o = plenoirf.utils.copy_square_selection_from_2D_array(
+        img=img, ix=0, iy=0, r=1, fill=np.nan,
+    )
+    np.testing.assert_array_equal(batch[0], o)
+    assert batch[1, 1, 1] == 5 * 32 + 5
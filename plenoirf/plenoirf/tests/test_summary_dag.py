@@ -0,0 +1,63 @@
+import plenoirf
+import multiprocessing
+import os
+
+dag = plenoirf.summary.dag
+scripts_multiprocessing = plenoirf.summary.scripts_multiprocessing
+
+
+def test_all_scripts_declare_their_inputs():
+    script_dir = os.path.join(os.path.dirname(dag.__file__), "scripts")
+    assert dag.find_undeclared_inputs(script_dir=script_dir) == {}
+    script_names = scripts_multiprocessing.find_script_names(script_dir)
+    assert sorted(dag.SCRIPTS.keys()) == script_names
+    order = dag.topological_order(dag.find_dependencies(script_names))
+    assert len(order) == len(script_names)
+
+
+def test_dependencies_and_dependants():
+    scripts = {
+        "a": {"inputs": ["input"], "outputs": ["summary/a"]},
+        "b": {"inputs": ["summary/a/x.json"], "outputs": ["summary/b"]},
+        "c": {"inputs": ["summary/b", "input"], "outputs": ["summary/c"]},
+        "d": {"inputs": ["event_table"], "outputs": ["summary/d"]},
+    }
+    deps = dag.find_dependencies(["a", "b", "c", "d"], scripts=scripts)
+    assert deps == {"a": [], "b": ["a"], "c": ["b"], "d": []}
+    assert dag.find_dependants(deps, ["b"]) == ["b", "c"]
+    assert dag.topological_order(deps) == ["a", "d", "b", "c"]
+
+
+def test_run_script_streams_logs_and_exitcode(tmp_path):
+    script_path = str(tmp_path / "0001_hello.py")
+    with open(script_path, "wt") as f:
+        f.write("import sys\n")
+        f.write("print('run_dir', sys.argv[1])\n")
+        f.write("print('warn', file=sys.stderr)\n")
+        f.write("if sys.argv[1] == 'fail':\n")
+        f.write("    raise ValueError('bad')\n")
+
+    ctx = multiprocessing.get_context("fork")
+    for run_dir, exitcode in [("good", 0), ("fail", 1)]:
+        stdout_path = str(tmp_path / (run_dir + ".stdout.md"))
+        stderr_path = str(tmp_path / (run_dir + ".stderr.md"))
+        proc = ctx.Process(
+            target=scripts_multiprocessing.run_script,
+            kwargs={
+                "script_path": script_path,
+                "run_dir": run_dir,
+                "stdout_path": stdout_path,
+                "stderr_path": stderr_path,
+                "cwd": str(tmp_path),
+            },
+        )
+        proc.start()
+        proc.join()
+        assert proc.exitcode == exitcode
+        with open(stdout_path, "rt") as f:
+            assert f.read() == "run_dir {:s}\n".format(run_dir)
+        with open(stderr_path, "rt") as f:
+            stderr = f.read()
+        assert stderr.startswith("warn\n")
+        if exitcode:
+            assert "ValueError: bad" in stderr
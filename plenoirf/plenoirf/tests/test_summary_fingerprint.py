@@ -0,0 +1,82 @@
+import plenoirf
+import json
+import os
+
+fingerprint = plenoirf.summary.fingerprint
+
+
+def test_config_keys_of_script():
+    code = 'sum_config = read()\nx = sum_config["plot"]["a"]\n'
+    code += 'y = sum_config[ "trigger" ]\n'
+    assert fingerprint.find_config_keys(code) == ["plot", "trigger"]
+    assert fingerprint.find_config_keys(code + "f(sum_config)\n") is None
+
+
+def test_digest_skips_logs_and_caches(tmp_path):
+    out_dir = str(tmp_path / "0001_a")
+    os.makedirs(out_dir)
+    with open(os.path.join(out_dir, "a.json"), "wt") as f:
+        f.write("{}")
+    digest = fingerprint.digest_of_path(out_dir)
+
+    with open(os.path.join(out_dir, "stdout.md"), "wt") as f:
+        f.write("took 3s")
+    os.makedirs(os.path.join(out_dir, "event_table.columns"))
+    assert fingerprint.digest_of_path(out_dir) == digest
+
+    with open(os.path.join(out_dir, "a.json"), "wt") as f:
+        f.write("[]")
+    assert fingerprint.digest_of_path(out_dir) != digest
+    assert fingerprint.digest_of_path(str(tmp_path / "nope")) == "missing"
+
+
+def test_fingerprint_changes_only_with_its_config_subtree(tmp_path):
+    run_dir = str(tmp_path)
+    os.makedirs(os.path.join(run_dir, "summary", "0002_b"))
+    config_path = os.path.join(run_dir, "summary", "summary_config.json")
+    script_path = os.path.join(run_dir, "0002_b.py")
+    with open(script_path, "wt") as f:
+        f.write('sum_config = read()\nx = sum_config["b"]\n')
+    script = {
+        "inputs": ["summary/summary_config.json", "summary/0001_a"],
+        "outputs": ["summary/0002_b"],
+    }
+    manifest = {
+        "0001_a": {"outputs": ["summary/0001_a"], "output_digest": "abc"}
+    }
+
+    def fp(config):
+        with open(config_path, "wt") as f:
+            f.write(json.dumps(config))
+        return fingerprint.make_fingerprint(
+            run_dir=run_dir,
+            script_path=script_path,
+            script=script,
+            manifest=manifest,
+        )
+
+    fp1 = fp({"a": 1, "b": 2})
+    assert fp1["digests"]["inputs"]["summary/0001_a"] == "abc"
+    assert fp({"a": 3, "b": 2}) == fp1
+    assert fp({"a": 1, "b": 4}) != fp1
+
+    manifest["0002_b"] = fingerprint.make_manifest_entry(
+        run_dir=run_dir, script=script, fingerprint=fp1
+    )
+    fingerprint.write_manifest(run_dir=run_dir, manifest=manifest)
+    manifest = fingerprint.read_manifest(run_dir=run_dir)
+    assert fingerprint.is_up_to_date(
+        run_dir=run_dir,
+        manifest=manifest,
+        script_name="0002_b",
+        script=script,
+        fingerprint=fp({"a": 7, "b": 2}),
+    )
+    manifest["0001_a"]["output_digest"] = "def"
+    assert not fingerprint.is_up_to_date(
+        run_dir=run_dir,
+        manifest=manifest,
+        script_name="0002_b",
+        script=script,
+        fingerprint=fp({"a": 7, "b": 2}),
+    )
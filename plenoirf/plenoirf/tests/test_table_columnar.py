@@ -0,0 +1,205 @@
+import plenoirf
+import sparse_numeric_table as spt
+import numpy as np
+import multiprocessing
+import time
+import os
+
+
+def _make_table(num_primary, num_trigger):
+    primary = np.rec.fromarrays(
+        [
+            np.arange(num_primary, dtype="<u8"),
+            np.linspace(1, 10, num_primary),
+            np.arange(num_primary, dtype="<i8"),
+        ],
+        names=[spt.IDX, "energy_GeV", "particle_id"],
+    )
+    trigger = np.rec.fromarrays(
+        [np.arange(num_trigger, dtype="<u8"), np.ones(num_trigger)],
+        names=[spt.IDX, "response_pe"],
+    )
+    return {"primary": primary, "trigger": trigger}
+
+
+def test_read_only_requested_levels_and_columns(tmp_path):
+    path = str(tmp_path / "event_table.tar")
+    with open(path, "wb") as f:
+        f.write(b"not parsed when the columnar event-table is valid")
+
+    original = _make_table(num_primary=10, num_trigger=0)
+    plenoirf.table.write_columnar(
+        path=plenoirf.table.columnar_path(path),
+        table=original,
+        source_path=path,
+    )
+    assert os.path.isdir(str(tmp_path / "event_table.columns"))
+
+    full = plenoirf.table.read(path=path)
+    assert set(full.keys()) == {"primary", "trigger"}
+    for level_key in original:
+        assert full[level_key].dtype == original[level_key].dtype
+        for column_key in original[level_key].dtype.names:
+            np.testing.assert_array_equal(
+                full[level_key][column_key], original[level_key][column_key]
+            )
+
+    part = plenoirf.table.read(
+        path=path,
+        level_keys=["primary"],
+        column_keys={"primary": ["energy_GeV"]},
+    )
+    assert list(part.keys()) == ["primary"]
+    assert part["primary"].dtype.names == (spt.IDX, "energy_GeV")
+
+    # the levels default to the levels in column_keys
+    part = plenoirf.table.read(
+        path=path, column_keys={"primary": ["energy_GeV"], "trigger": None},
+    )
+    assert sorted(part.keys()) == ["primary", "trigger"]
+    assert part["primary"].dtype.names == (spt.IDX, "energy_GeV")
+    assert part["trigger"].dtype.names == (spt.IDX, "response_pe")
+
+    columns = plenoirf.table.read_columns(
+        path=plenoirf.table.columnar_path(path), level_keys=["primary"]
+    )
+    assert isinstance(columns["primary"]["energy_GeV"], np.memmap)
+    assert not columns["primary"]["energy_GeV"].flags.writeable
+
+
+def test_columnar_is_invalid_when_source_changes(tmp_path):
+    path = str(tmp_path / "event_table.tar")
+    with open(path, "wb") as f:
+        f.write(b"1")
+    cpath = plenoirf.table.columnar_path(path)
+    plenoirf.table.write_columnar(
+        path=cpath, table=_make_table(3, 2), source_path=path
+    )
+    assert plenoirf.table.is_columnar_valid(path=cpath, source_path=path)
+
+    with open(path, "wb") as f:
+        f.write(b"12")
+    assert not plenoirf.table.is_columnar_valid(path=cpath, source_path=path)
+
+    plenoirf.table.write_columnar(
+        path=cpath, table=_make_table(4, 2), source_path=path
+    )
+    assert plenoirf.table.is_columnar_valid(path=cpath, source_path=path)
+    manifest = plenoirf.table.read_columnar_manifest(cpath)
+    assert manifest["levels"]["primary"]["num_rows"] == 4
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "event_table.columns",
+        "event_table.tar",
+    ]
+
+
+def test_valid_columnar_is_kept_and_stale_is_replaced(tmp_path):
+    path = str(tmp_path / "event_table.tar")
+    with open(path, "wb") as f:
+        f.write(b"1")
+    cpath = plenoirf.table.columnar_path(path)
+    plenoirf.table.write_columnar(
+        path=cpath, table=_make_table(3, 2), source_path=path
+    )
+    inode = os.stat(cpath).st_ino
+    columns = plenoirf.table.read_columns(path=cpath)
+
+    plenoirf.table.write_columnar(
+        path=cpath, table=_make_table(4, 2), source_path=path
+    )
+    assert os.stat(cpath).st_ino == inode
+    # valid, so the event_table.tar is not parsed
+    plenoirf.table.convert_to_columnar(path=path)
+    assert os.stat(cpath).st_ino == inode
+    manifest = plenoirf.table.read_columnar_manifest(cpath)
+    assert manifest["levels"]["primary"]["num_rows"] == 3
+
+    with open(path, "wb") as f:
+        f.write(b"12")
+    plenoirf.table.write_columnar(
+        path=cpath, table=_make_table(4, 2), source_path=path
+    )
+    assert os.stat(cpath).st_ino != inode
+    assert sorted(os.listdir(str(tmp_path))) == [
+        "event_table.columns",
+        "event_table.tar",
+    ]
+    # the memory-maps of the replaced columnar event-table can still be read
+    assert columns["primary"]["energy_GeV"].shape[0] == 3
+
+
+def _read_many_times(path, num_conversions_path, barrier):
+    def spt_read(path, structure):
+        with open(num_conversions_path, "at") as f:
+            f.write("1")
+        time.sleep(0.05)
+        return _make_table(num_primary=10, num_trigger=5)
+
+    plenoirf.table.spt.read = spt_read
+    barrier.wait()
+    for i in range(20):
+        table = plenoirf.table.read(
+            path=path, column_keys={"primary": ["energy_GeV"]}
+        )
+        assert table["primary"].shape[0] == 10
+
+
+def test_scripts_reading_a_stale_columnar_at_the_same_time(tmp_path):
+    path = str(tmp_path / "event_table.tar")
+    with open(path, "wb") as f:
+        f.write(b"1")
+    cpath = plenoirf.table.columnar_path(path)
+    plenoirf.table.write_columnar(
+        path=cpath, table=_make_table(3, 2), source_path=path
+    )
+    with open(path, "wb") as f:
+        f.write(b"12")
+
+    num_conversions_path = str(tmp_path / "num_conversions.txt")
+    ctx = multiprocessing.get_context("fork")
+    num_scripts = 6
+    barrier = ctx.Barrier(num_scripts)
+    procs = [
+        ctx.Process(
+            target=_read_many_times,
+            args=(path, num_conversions_path, barrier),
+        )
+        for i in range(num_scripts)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    assert [proc.exitcode for proc in procs] == [0] * num_scripts
+    with open(num_conversions_path, "rt") as f:
+        assert f.read() == "1"
+
+
+def test_event_table_without_num_reuses_is_summarised(tmp_path):
+    path = str(tmp_path / "event_table.tar")
+    with open(path, "wb") as f:
+        f.write(b"1")
+    table = _make_table(num_primary=5, num_trigger=2)
+    # grid-level of an event_table.tar written before num_reuses was added
+    table["grid"] = np.rec.fromarrays(
+        [np.arange(5, dtype="<u8"), np.ones(5)],
+        names=[spt.IDX, "area_thrown_m2"],
+    )
+    plenoirf.table.write_columnar(
+        path=plenoirf.table.columnar_path(path), table=table, source_path=path
+    )
+
+    part = plenoirf.table.read(
+        path=path,
+        column_keys={"primary": [], "grid": ["num_reuses"], "trigger": []},
+    )
+    np.testing.assert_array_equal(part["grid"]["num_reuses"], np.ones(5))
+
+    mask_detected = plenoirf.analysis.effective_quantity.make_mask_detected_for_reused_showers(
+        shower_indices=part["grid"][spt.IDX],
+        num_reuses=part["grid"]["num_reuses"],
+        detected_indices=part["trigger"][spt.IDX],
+    )
+    np.testing.assert_array_equal(
+        mask_detected, np.isin(part["grid"][spt.IDX], part["trigger"][spt.IDX])
+    )
@@ -0,0 +1,99 @@
+import plenoirf
+import sparse_numeric_table as spt
+import numpy as np
+import pytest
+
+STRUCTURE = {
+    "primary": {
+        "particle_id": {"dtype": "<i8", "comment": ""},
+        "energy_GeV": {"dtype": "<f8", "comment": ""},
+    },
+    "pasttrigger": {},
+}
+
+
+def test_rows_and_dicts_grow_beyond_capacity():
+    tabrec = plenoirf.table_records.init(structure=STRUCTURE, capacity=2)
+
+    for i in range(10):
+        if i % 2:
+            prim = tabrec["primary"].new_row(idx=100 + i)
+            prim["particle_id"] = i
+            prim["energy_GeV"] = 0.5 * i
+            assert prim["energy_GeV"] == 0.5 * i
+        else:
+            tabrec["primary"].append(
+                {
+                    spt.IDX: 100 + i,
+                    "particle_id": i,
+                    "energy_GeV": 0.5 * i,
+                    "not_in_structure": "ignored",
+                }
+            )
+        tabrec["pasttrigger"].append({spt.IDX: 100 + i})
+
+    assert len(tabrec["primary"]) == 10
+    table = plenoirf.table_records.to_sparse_numeric_table(tabrec)
+
+    prim = table["primary"]
+    assert prim.dtype.names == (spt.IDX, "particle_id", "energy_GeV")
+    assert prim[spt.IDX].dtype == np.dtype(spt.IDX_DTYPE)
+    np.testing.assert_array_equal(prim[spt.IDX], 100 + np.arange(10))
+    np.testing.assert_array_equal(prim["particle_id"], np.arange(10))
+    np.testing.assert_array_equal(prim["energy_GeV"], 0.5 * np.arange(10))
+    np.testing.assert_array_equal(
+        table["pasttrigger"][spt.IDX], 100 + np.arange(10)
+    )
+
+    rows = [row[spt.IDX] for row in tabrec["primary"]]
+    assert rows == list(100 + np.arange(10))
+    assert tabrec["primary"][-1]["particle_id"] == 9
+
+
+def test_missing_and_unknown_columns_raise():
+    tabrec = plenoirf.table_records.init(structure=STRUCTURE)
+    with pytest.raises(KeyError):
+        tabrec["primary"].append({spt.IDX: 1, "particle_id": 1})
+    prim = tabrec["primary"].new_row(idx=1)
+    with pytest.raises(KeyError):
+        prim["energy_gev"] = 1.0
+
+
+def test_empty_level_and_columns_round_trip():
+    tabrec = plenoirf.table_records.init(structure=STRUCTURE)
+    table = plenoirf.table_records.to_sparse_numeric_table(tabrec)
+    assert table["primary"].shape[0] == 0
+    names = table["primary"].dtype.names
+    assert names == (spt.IDX, "particle_id", "energy_GeV")
+
+    prim = tabrec["primary"].new_row(idx=7)
+    prim["particle_id"] = 3
+    prim["energy_GeV"] = 2.0
+    columns = tabrec["primary"].to_columns()
+
+    back = plenoirf.table_records.init(structure=STRUCTURE)
+    back["primary"].extend_columns(columns)
+    back["primary"].extend_columns(columns)
+    assert len(back["primary"]) == 2
+    assert back["primary"][1]["energy_GeV"] == 2.0
+
+
+def test_columns_not_written_raise_on_export():
+    tabrec = plenoirf.table_records.init(structure=STRUCTURE, capacity=1)
+    prim = tabrec["primary"].new_row(idx=1)
+    prim["particle_id"] = 1
+    prim["energy_GeV"] = 1.0
+    prim = tabrec["primary"].new_row(idx=2)
+    prim["particle_id"] = 2
+    with pytest.raises(AssertionError):
+        tabrec["primary"].to_recarray()
+    with pytest.raises(AssertionError):
+        tabrec["primary"].to_columns()
+
+    prim["energy_GeV"] = 2.0
+    assert tabrec["primary"].to_recarray().shape[0] == 2
+
+    tabrec["primary"].clear()
+    tabrec["primary"].new_row(idx=3)
+    with pytest.raises(AssertionError):
+        tabrec["primary"].to_recarray()
@@ -0,0 +1,46 @@
+import plenoirf
+import numpy as np
+
+irf = plenoirf.instrument_response
+
+
+def _fake_estimate(
+    uid,
+    loph_record,
+    light_field_geometry,
+    shower_maximum_object_distance,
+    trajectory_config,
+):
+    if uid % 3 == 0:
+        return None
+    return {
+        "idx": uid,
+        "cx_rad": np.sum(loph_record) * light_field_geometry["scale"],
+        "x_m": shower_maximum_object_distance,
+    }
+
+
+def test_pool_is_deterministic_and_sorted_by_uid(monkeypatch):
+    monkeypatch.setattr(
+        irf, "_estimate_primary_trajectory_of_event", _fake_estimate
+    )
+    prng = np.random.Generator(np.random.PCG64(4))
+    uids = prng.permutation(np.arange(1000, 1200))
+    tasks = []
+    for uid in uids:
+        tasks.append((int(uid), prng.uniform(size=10), prng.uniform()))
+
+    results = {}
+    for num_workers in [1, 3]:
+        results[num_workers] = irf._estimate_primary_trajectories(
+            tasks=tasks,
+            light_field_geometry={"scale": 2.0},
+            trajectory_config={},
+            num_workers=num_workers,
+            chunk_size=8,
+        )
+
+    assert results[1] == results[3]
+    out_uids = [rec["idx"] for rec in results[3]]
+    assert out_uids == sorted(out_uids)
+    assert len(out_uids) == np.sum(uids % 3 != 0)
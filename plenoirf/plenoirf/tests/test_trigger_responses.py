@@ -0,0 +1,53 @@
+import plenoirf
+import numpy as np
+import pytest
+
+NUM_FOCI = 3
+NUM_TIME_SLICES = 7
+
+
+def _make_trigger_response(prng):
+    return [
+        {
+            "response_pe": int(prng.integers(0, 1000)),
+            "time_slice": int(prng.integers(0, NUM_TIME_SLICES)),
+            "patch_pixel": int(prng.integers(0, 5000)),
+        }
+        for o in range(NUM_FOCI)
+    ]
+
+
+def test_write_and_read_by_uid(tmp_path):
+    prng = np.random.Generator(np.random.PCG64(9))
+    rtr = plenoirf.trigger_responses.RunTriggerResponses(capacity=2)
+
+    uids = [1000001, 1000010, 1000002, 1000005, 1000003]
+    expected = {}
+    for uid in uids:
+        trigger_response = _make_trigger_response(prng)
+        max_response = prng.integers(
+            0, 100, size=(NUM_FOCI, NUM_TIME_SLICES)
+        ).astype(np.uint32)
+        rtr.append(
+            uid=uid,
+            trigger_response=trigger_response,
+            max_response_in_focus_vs_timeslices=max_response,
+        )
+        expected[uid] = (trigger_response, max_response)
+    assert len(rtr) == len(uids)
+    assert rtr.response_pe().shape == (len(uids), NUM_FOCI)
+
+    path = str(tmp_path / "trigger_responses")
+    plenoirf.trigger_responses.write(path=path, run_trigger_responses=rtr)
+
+    reader = plenoirf.trigger_responses.Reader(path=path)
+    assert len(reader) == len(uids)
+    for uid in uids:
+        trigger_response, max_response = expected[uid]
+        assert reader.trigger_response(uid) == trigger_response
+        np.testing.assert_array_equal(
+            reader.max_response_in_focus_vs_timeslices(uid), max_response
+        )
+
+    with pytest.raises(KeyError):
+        reader.trigger_response(1000004)
@@ -0,0 +1,168 @@
+"""
+The responses of the loose sum-trigger of all events in a run, in columns.
+
+The trigger-response of an event is a list with one dict for each focus,
+as returned by pl.trigger.estimate.first_stage. Instead of one json-file
+for each event, the responses of all events in a run are written into a
+directory with:
+
+    idx.npy             The uids of the events, sorted.
+    responses.npy       A structured array, one row for each event and one
+                        column for each focus. The fields are the keys of
+                        the focus' dict.
+    max_response_in_focus_vs_timeslices.npy
+                        The max. response for each event, focus and
+                        time-slice.
+
+The arrays are read with np.load(mmap_mode="r"), and the response of an
+event is found by its uid.
+"""
+import os
+from os import path as op
+import shutil
+import numpy as np
+
+INITIAL_CAPACITY = 64
+IDX_DTYPE = "<u8"
+MAX_RESPONSE_DTYPE = "<u4"
+
+
+class RunTriggerResponses:
+    """
+    Collects the trigger-responses of the events in a run. The buffers are
+    allocated on the first event and grow geometrically.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        assert capacity > 0
+        self._capacity = capacity
+        self._size = 0
+        self.idx = None
+        self.responses = None
+        self.max_response = None
+
+    def _init_buffers(self, trigger_response, max_response):
+        dtype = []
+        for key in trigger_response[0]:
+            value = np.asarray(trigger_response[0][key])
+            assert value.ndim == 0
+            dtype.append((key, value.dtype.str))
+        num_foci = len(trigger_response)
+        self.idx = np.zeros(self._capacity, dtype=IDX_DTYPE)
+        self.responses = np.zeros((self._capacity, num_foci), dtype=dtype)
+        self.max_response = np.zeros(
+            (self._capacity,) + max_response.shape, dtype=MAX_RESPONSE_DTYPE
+        )
+
+    def _reserve(self, size):
+        if size <= self._capacity:
+            return
+        while self._capacity < size:
+            self._capacity *= 2
+        for key in ["idx", "responses", "max_response"]:
+            old = getattr(self, key)
+            new = np.zeros((self._capacity,) + old.shape[1:], dtype=old.dtype)
+            new[0 : self._size] = old[0 : self._size]
+            setattr(self, key, new)
+
+    def append(
+        self, uid, trigger_response, max_response_in_focus_vs_timeslices
+    ):
+        if self.idx is None:
+            self._init_buffers(
+                trigger_response=trigger_response,
+                max_response=max_response_in_focus_vs_timeslices,
+            )
+        self._reserve(self._size + 1)
+        i = self._size
+        self.idx[i] = uid
+        row = self.responses[i]
+        assert len(trigger_response) == row.shape[0]
+        for o in range(row.shape[0]):
+            for key in row.dtype.names:
+                row[key][o] = trigger_response[o][key]
+        self.max_response[i] = max_response_in_focus_vs_timeslices
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    def response_pe(self):
+        """
+        Returns the response_pe of each event (rows) in each focus (cols).
+        """
+        return self.responses["response_pe"][0 : self._size]
+
+
+def to_trigger_response(responses_row):
+    """
+    Returns the list of dicts, one for each focus, of a row in responses.
+    """
+    keys = responses_row.dtype.names
+    return [
+        {key: responses_row[key][o].item() for key in keys}
+        for o in range(responses_row.shape[0])
+    ]
+
+
+def write(path, run_trigger_responses):
+    """
+    Writes run_trigger_responses into the directory path.
+    """
+    rtr = run_trigger_responses
+    assert len(rtr) > 0
+    tmp_path = path + ".tmp"
+    if op.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+    order = np.argsort(rtr.idx[0 : len(rtr)])
+    idx = rtr.idx[order]
+    assert np.all(np.diff(idx) > 0), "uids must be unique."
+    np.save(op.join(tmp_path, "idx.npy"), idx)
+    np.save(op.join(tmp_path, "responses.npy"), rtr.responses[order])
+    np.save(
+        op.join(tmp_path, "max_response_in_focus_vs_timeslices.npy"),
+        rtr.max_response[order],
+    )
+    if op.exists(path):
+        shutil.rmtree(path)
+    shutil.move(tmp_path, path)
+
+
+class Reader:
+    """
+    Reads the trigger-responses of a run by the uids of its events.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.idx = np.load(op.join(path, "idx.npy"))
+        self.responses = np.load(
+            op.join(path, "responses.npy"), mmap_mode="r"
+        )
+        self.max_response = np.load(
+            op.join(path, "max_response_in_focus_vs_timeslices.npy"),
+            mmap_mode="r",
+        )
+
+    def _index(self, uid):
+        i = np.searchsorted(self.idx, uid)
+        if i >= self.idx.shape[0] or self.idx[i] != uid:
+            raise KeyError("No trigger-response for uid {:d}".format(uid))
+        return i
+
+    def trigger_response(self, uid):
+        """
+        Returns the trigger-response of the event, a list with one dict
+        for each focus, like pl.trigger.io.read_trigger_response_from_path.
+        """
+        return to_trigger_response(self.responses[self._index(uid)])
+
+    def max_response_in_focus_vs_timeslices(self, uid):
+        return np.array(self.max_response[self._index(uid)])
+
+    def __len__(self):
+        return self.idx.shape[0]
+
+    def __repr__(self):
+        return "{:s}(size={:d})".format(self.__class__.__name__, len(self))
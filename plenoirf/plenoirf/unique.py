@@ -39,3 +39,49 @@ def make_uid_str(run_id, event_id):
 def split_uid_str(s):
     uid = int(s)
     return split_uid(uid)
+
+
+"""
+Reuse of Cherenkov-pools
+------------------------
+The Cherenkov-pool of one airshower can be reused multiple times by placing
+the instrument in different bins of the grid. Each reuse gets its own UID.
+The reuse-ID occupies the leading digits of the EVENT_ID, so the reuse with
+reuse-ID = 0 has the same UID as its airshower.
+"""
+REUSE_ID_NUM_DIGITS = 2
+SHOWER_ID_NUM_DIGITS = EVENT_ID_NUM_DIGITS - REUSE_ID_NUM_DIGITS
+
+REUSE_ID_UPPER = 10 ** REUSE_ID_NUM_DIGITS
+SHOWER_ID_UPPER = 10 ** SHOWER_ID_NUM_DIGITS
+
+
+def make_reuse_event_id(event_id, reuse_id):
+    assert 0 <= reuse_id < REUSE_ID_UPPER
+    if reuse_id > 0:
+        assert 0 <= event_id < SHOWER_ID_UPPER
+    return SHOWER_ID_UPPER * reuse_id + event_id
+
+
+def make_reuse_uid(run_id, event_id, reuse_id):
+    return make_uid(
+        run_id=run_id,
+        event_id=make_reuse_event_id(event_id=event_id, reuse_id=reuse_id),
+    )
+
+
+def split_reuse_uid(uid):
+    run_id, reuse_event_id = split_uid(uid)
+    reuse_id = reuse_event_id // SHOWER_ID_UPPER
+    event_id = reuse_event_id % SHOWER_ID_UPPER
+    return run_id, event_id, reuse_id
+
+
+def shower_uid(uid):
+    """
+    Returns the UID of the airshower which was reused to create uid.
+    Works on arrays of UIDs, too.
+    """
+    run_id, reuse_event_id = split_uid(uid)
+    event_id = reuse_event_id % SHOWER_ID_UPPER
+    return RUN_ID_UPPER * run_id + event_id
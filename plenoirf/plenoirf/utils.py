@@ -203,15 +203,51 @@ def copy_square_selection_from_2D_array(img, ix, iy, r, fill=np.nan):
     """
     assert r >= 0
     out = fill * np.ones(shape=(2 * r + 1, 2 * r + 1), dtype=img.dtype)
-    x_start = ix - r
-    x_stop = ix + r + 1
-    y_start = iy - r
-    y_stop = iy + r + 1
-    for ox, ix in enumerate(np.arange(x_start, x_stop)):
-        for oy, iy in enumerate(np.arange(y_start, y_stop)):
-            if ix >= 0 and ix < img.shape[0]:
-                if iy >= 0 and iy < img.shape[1]:
-                    out[ox, oy] = img[ix, iy]
+    x_offset = ix - r
+    y_offset = iy - r
+    x_start = max(x_offset, 0)
+    x_stop = min(ix + r + 1, img.shape[0])
+    y_start = max(y_offset, 0)
+    y_stop = min(iy + r + 1, img.shape[1])
+    if x_start < x_stop and y_start < y_stop:
+        out[
+            x_start - x_offset : x_stop - x_offset,
+            y_start - y_offset : y_stop - y_offset,
+        ] = img[x_start:x_stop, y_start:y_stop]
+    return out
+
+
+def copy_square_selections_from_2D_array(img, ixs, iys, r, fill=np.nan):
+    """
+    Returns the square selections around many central bins (ixs, iys) of
+    the input-image. Same as copy_square_selection_from_2D_array for each
+    central bin, but with one vectorized gather for all central bins.
+
+    Returns
+    -------
+    out : np.array 3D
+        Shape is (len(ixs), 2*r + 1, 2*r + 1).
+    """
+    assert r >= 0
+    ixs = np.asarray(ixs, dtype=np.int64)
+    iys = np.asarray(iys, dtype=np.int64)
+    assert ixs.shape == iys.shape
+    assert ixs.ndim == 1
+
+    offsets = np.arange(-r, r + 1)
+    rows = ixs[:, None] + offsets
+    cols = iys[:, None] + offsets
+    row_valid = np.logical_and(rows >= 0, rows < img.shape[0])
+    col_valid = np.logical_and(cols >= 0, cols < img.shape[1])
+    rows = np.clip(rows, 0, img.shape[0] - 1)
+    cols = np.clip(cols, 0, img.shape[1] - 1)
+
+    out = fill * np.ones(
+        shape=(ixs.shape[0], 2 * r + 1, 2 * r + 1), dtype=img.dtype
+    )
+    valid = np.logical_and(row_valid[:, :, None], col_valid[:, None, :])
+    selection = img[rows[:, :, None], cols[:, None, :]]
+    out[valid] = selection[valid]
     return out
 
 